@@ -122,12 +122,30 @@ XMLStyle_saxdom.  However, since the pyxb.xmlschema.structures classes require
 a DOM model, XMLStyle_saxdom will be used for pyxb.utils.domutils.StringToDOM
 if this style is selected."""
 
+XMLStyle_expat = 3
+"""As with XMLStyle_saxer, but the SAX content handlers are invoked directly
+from pyexpat callbacks by L{pyxb.utils.saxutils.DirectExpatParser}, rather
+than through the xml.sax.expatreader driver.  Element and attribute names
+are converted to SAX form once per distinct name, attributes use a
+lightweight mapping, and text is buffered by expat.  This is the fastest
+style that produces binding instances directly.  Parser modules set with
+L{pyxb.utils.saxutils.SetCreateParserModules} are not used."""
+
+XMLStyle_lxml = 4
+"""As with XMLStyle_saxer, but documents are tokenized by C{lxml} through
+its parser target interface, with events delivered to the SAX content
+handlers by L{pyxb.utils.saxutils.LxmlParser}.  The lxml target interface
+does not report positions, so location information is not available.  If
+C{lxml} cannot be imported, this style behaves as XMLStyle_saxer."""
+
 _XMLStyle = XMLStyle_saxer
 """The current XML processing style."""
 
 _XMLStyleMap = { 'minidom' : XMLStyle_minidom,
                  'saxdom' : XMLStyle_saxdom,
-                 'saxer' : XMLStyle_saxer }
+                 'saxer' : XMLStyle_saxer,
+                 'expat' : XMLStyle_expat,
+                 'lxml' : XMLStyle_lxml }
 _XMLStyleMapReverse = dict([ (_v, _k) for (_k, _v) in six.iteritems(_XMLStyleMap) ])
 
 _XMLStyle_envvar = 'PYXB_XML_STYLE'
@@ -137,10 +155,12 @@ def _SetXMLStyle (style=None):
 
     This can be invoked within code.  The system default of L{XMLStyle_saxer}
     can also be overridden at runtime by setting the environment variable
-    C{PYXB_XML_STYLE} to one of C{minidom}, C{saxdom}, or C{saxer}.
+    C{PYXB_XML_STYLE} to one of C{minidom}, C{saxdom}, C{saxer}, C{expat},
+    or C{lxml}.
 
     @param style: One of L{XMLStyle_minidom}, L{XMLStyle_saxdom},
-    L{XMLStyle_saxer}.  If not provided, the system default is used.
+    L{XMLStyle_saxer}, L{XMLStyle_expat}, L{XMLStyle_lxml}.  If not
+    provided, the system default is used.
     """
     global _XMLStyle
     if style is None:
@@ -157,6 +177,59 @@ def _SetXMLStyle (style=None):
 
 _SetXMLStyle()
 
+LocationCapture_none = 0
+"""Do not record where content appears in documents processed with a SAX
+parser.  The locations of bindings, DOM nodes, and validation errors will be
+C{None}.  This is the fastest option, and uses the least memory."""
+
+LocationCapture_compact = 1
+"""Record where content appears in documents processed with a SAX parser as
+a line and column pair, which is converted to a
+L{pyxb.utils.utility.Location} instance only when requested."""
+
+LocationCapture_full = 2
+"""Record a L{pyxb.utils.utility.Location} instance for every element and
+text event in documents processed with a SAX parser."""
+
+_LocationCapture = LocationCapture_full
+"""The default location capture policy for SAX parsers."""
+
+_LocationCaptureMap = { 'none' : LocationCapture_none,
+                        'compact' : LocationCapture_compact,
+                        'full' : LocationCapture_full }
+_LocationCaptureMapReverse = dict([ (_v, _k) for (_k, _v) in six.iteritems(_LocationCaptureMap) ])
+
+_LocationCapture_envvar = 'PYXB_LOCATION_CAPTURE'
+
+def _SetLocationCapture (capture=None):
+    """Set the default policy for recording the location of parsed content.
+
+    This applies to SAX parsers created after the call; the policy for an
+    individual parser can be overridden using the C{location_capture}
+    keyword to L{pyxb.utils.saxutils.make_parser}.  The system default of
+    L{LocationCapture_full} can also be overridden at runtime by setting the
+    environment variable C{PYXB_LOCATION_CAPTURE} to one of C{none},
+    C{compact}, or C{full}.
+
+    @param capture: One of L{LocationCapture_none},
+    L{LocationCapture_compact}, L{LocationCapture_full}.  If not provided,
+    the system default is used.
+    """
+    global _LocationCapture
+    if capture is None:
+        import os
+        capture_name = os.environ.get(_LocationCapture_envvar)
+        if capture_name is None:
+            capture_name = 'full'
+        capture = _LocationCaptureMap.get(capture_name)
+        if capture is None:
+            raise PyXBException('Bad value "%s" for %s' % (capture_name, _LocationCapture_envvar))
+    if _LocationCaptureMapReverse.get(capture) is None:
+        raise PyXBException('Bad value %s for _SetLocationCapture' % (capture,))
+    _LocationCapture = capture
+
+_SetLocationCapture()
+
 # Global flag that we can use to determine whether optimization is active in
 # this session.  There may be cases where we can bypass methods that just
 # check for things we don't care about in an optimized context
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright 2009-2013, Peter A. Bigot
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain a
+# copy of the License at:
+#
+#            http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""This module contains coroutines for creating bindings from, and writing
+bindings to, C{asyncio} streams.
+
+Documents are read from an C{asyncio.StreamReader} in chunks that are passed
+to a L{pyxb.binding.saxer.BindingPushParser} as they arrive, so parsing
+proceeds while the remainder of the document is in transit and no thread
+hand-off is required.
+
+This module uses C{async def} and requires Python 3.5 or later.  It is not
+imported by any other PyXB module; generated binding modules and
+L{pyxb.binding.basis._TypeBinding_mixin.toxml_async} import it on demand.
+"""
+
+import logging
+import pyxb
+import pyxb.binding.saxer
+
+_log = logging.getLogger(__name__)
+
+DefaultChunkSize = 65536
+"""The default maximum number of bytes read or written in one operation."""
+
+async def CreateFromStreamAsync (reader, module=None, chunk_size=DefaultChunkSize, **kw):
+    """Read a document from a stream and return its binding instance.
+
+    @param reader: An C{asyncio.StreamReader}, or any object with a
+    coroutine C{read(n)} method that returns an empty value at end of
+    stream.
+
+    @param module: Optional generated binding module; see
+    L{pyxb.binding.saxer.BindingPushParser}.
+
+    @keyword chunk_size: The maximum number of bytes requested from
+    C{reader} for each read.
+
+    Remaining keywords are passed to
+    L{pyxb.binding.saxer.BindingPushParser}.
+
+    @return: The binding instance for the document element.
+    """
+    parser = pyxb.binding.saxer.BindingPushParser(module, **kw)
+    while True:
+        data = await reader.read(chunk_size)
+        if not data:
+            break
+        parser.feed(data)
+    return parser.close()
+
+async def WriteAsync (instance, writer, encoding='utf-8', chunk_size=DefaultChunkSize, **kw):
+    """Serialize a binding instance to a stream.
+
+    The document is generated in pieces by
+    L{pyxb.binding.basis._TypeBinding_mixin.iterxml}, and each is written as
+    soon as it is available, waiting on the writer's flow control after each
+    so that a slow peer does not cause the whole document to be buffered in
+    the transport.
+
+    @param instance: A L{pyxb.binding.basis._TypeBinding_mixin} instance.
+
+    @param writer: An C{asyncio.StreamWriter}, or any object with a
+    C{write(data)} method and a coroutine C{drain()} method.
+
+    @param encoding: The encoding of the document; see
+    L{pyxb.binding.basis._TypeBinding_mixin.toxml}.
+
+    @keyword chunk_size: The number of characters collected before a piece
+    is written.
+
+    Remaining keywords are passed to
+    L{pyxb.binding.basis._TypeBinding_mixin.iterxml}.
+    """
+    for chunk in instance.iterxml(encoding, chunk_size, **kw):
+        writer.write(chunk)
+        await writer.drain()
+
+## Local Variables:
+## fill-column:78
+## End:
@@ -18,6 +18,7 @@ inherit, and that describe the content models of those schema."""
 
 import logging
 import collections
+import operator
 import xml.dom
 import pyxb
 from pyxb.utils import domutils, utility, six
@@ -90,7 +91,7 @@ class _TypeBinding_mixin (utility.Locatable_mixin):
     _XSDLocation = None
     """Where the definition can be found in the originating schema."""
 
-    _ReservedSymbols = set([ 'validateBinding', 'toDOM', 'toxml', 'Factory', 'property' ])
+    _ReservedSymbols = set([ 'validateBinding', 'toDOM', 'toxml', 'toxml_async', 'toxml_stream', 'iterxml', 'writeTo', 'toc14n', 'Factory', 'property' ])
 
     if pyxb._CorruptionDetectionEnabled:
         def __setattr__ (self, name, value):
@@ -526,14 +527,14 @@ class _TypeBinding_mixin (utility.Locatable_mixin):
             need_xsi_type = need_xsi_type or element_binding.typeDefinition()._RequireXSIType(type(self))
         if element_name is None:
             raise pyxb.UnboundElementError(self)
-        element = bds.createChildElement(element_name, parent)
+        element = bds.createChildElement(element_name, parent, component_name=True)
         if need_xsi_type:
-            bds.addAttribute(element, XSI.type, self._ExpandedName)
+            bds.addAttribute(element, XSI.type, self._ExpandedName, component_name=True)
         self._toDOM_csc(bds, element)
         bds.finalize()
         return bds.document()
 
-    def toxml (self, encoding=None, bds=None, root_only=False, element_name=None):
+    def toxml (self, encoding=None, bds=None, root_only=False, element_name=None, parallel=None):
         """Shorthand to get the object as an XML document.
 
         If you want to set the default namespace, pass in a pre-configured
@@ -556,16 +557,126 @@ class _TypeBinding_mixin (utility.Locatable_mixin):
         @param element_name: This value is passed through to L{toDOM}, and is
         useful when the value has no bound element but you want to convert it
         to XML anyway.
+
+        @param parallel: If provided and greater than one, the number of
+        processes used to write the children of the document element.  The
+        document is written without creating a DOM instance.  See
+        L{pyxb.binding.writer.ParallelDocument}.
         """
+        if (parallel is not None) and (1 < parallel):
+            import pyxb.binding.writer
+            return pyxb.binding.writer.ParallelDocument(self, parallel, encoding, bds=bds, root_only=root_only, element_name=element_name)
         dom = self.toDOM(bds, element_name=element_name)
         if root_only:
             dom = dom.documentElement
         return dom.toxml(encoding)
 
+    def toxml_stream (self, fileobj, encoding='utf-8', bds=None, root_only=False, element_name=None):
+        """Write the object as an XML document to a file without creating a
+        DOM instance.
+
+        The document is written in pieces as the binding is traversed, and is
+        the same as the one that would be returned by L{toxml}.  See
+        L{pyxb.binding.writer}.
+
+        @param fileobj: An object with a C{write} method.  This receives
+        C{bytes} unless C{encoding} is C{None}, in which case it receives
+        text.
+
+        @param encoding: The encoding to be used.  Unlike L{toxml} this
+        defaults to C{'utf-8'}.
+
+        Remaining parameters are as with L{toxml}.
+        """
+        import pyxb.binding.writer
+        return pyxb.binding.writer.WriteStream(self, fileobj, encoding, bds=bds, root_only=root_only, element_name=element_name)
+
+    def iterxml (self, encoding='utf-8', chunk_size=65536, bds=None, root_only=False, element_name=None):
+        """Generate the object as an XML document in pieces, without creating
+        a DOM instance.
+
+        Each piece is produced as soon as it is available, so a server can
+        begin sending the document before the binding has been completely
+        traversed.  The concatenated pieces are the same as the document
+        returned by L{toxml}.  See L{pyxb.binding.writer.Chunks}.
+
+        @param encoding: The encoding to be used.  The pieces are C{bytes}
+        unless this is C{None}, in which case they are text.  Unlike
+        L{toxml} this defaults to C{'utf-8'}.
+
+        @param chunk_size: The number of characters collected before a piece
+        is produced.
+
+        Remaining parameters are as with L{toxml}.
+        """
+        import pyxb.binding.writer
+        return pyxb.binding.writer.Chunks(self, encoding, chunk_size, bds=bds, root_only=root_only, element_name=element_name)
+
+    def writeTo (self, handler, bds=None, element_name=None):
+        """Emit the object as a sequence of SAX events without creating a DOM
+        instance.
+
+        Element and attribute names are provided as qualified names, with the
+        namespace declarations required to resolve them as attributes of the
+        document element, so the events are suitable for a handler that is
+        not namespace-aware such as C{xml.sax.saxutils.XMLGenerator}.  See
+        L{pyxb.binding.writer}.
+
+        @param handler: An C{xml.sax.handler.ContentHandler} instance
+
+        Remaining parameters are as with L{toxml}.
+        """
+        import pyxb.binding.writer
+        return pyxb.binding.writer.WriteEvents(self, handler, bds=bds, element_name=element_name)
+
+    def toc14n (self, exclusive=True, inclusive_prefixes=None, with_comments=False, bds=None, element_name=None):
+        """Return the canonical form of the object as an XML document.
+
+        The canonical form is produced directly from the binding, without
+        creating a DOM instance or parsing a document, and is suitable for
+        computing or verifying an XML Signature digest.  See
+        L{pyxb.binding.writer.Canonicalize}.
+
+        @param exclusive: If C{True} (default), produce U{Exclusive XML
+        Canonicalization<http://www.w3.org/TR/xml-exc-c14n/>}; otherwise
+        produce U{Canonical XML<http://www.w3.org/TR/xml-c14n>}.
+
+        @param inclusive_prefixes: For exclusive canonicalization, the
+        prefixes of namespaces that are treated as in the inclusive form, as
+        a sequence or a whitespace-separated string.
+
+        @param with_comments: If C{True}, retain comments within wildcard
+        DOM content.
+
+        Remaining parameters are as with L{toxml}.
+
+        @return: C{bytes} in UTF-8 encoding
+        """
+        import pyxb.binding.writer
+        return pyxb.binding.writer.Canonicalize(self, exclusive, inclusive_prefixes, with_comments, bds=bds, element_name=element_name)
+
+    def toxml_async (self, writer, encoding='utf-8', bds=None, root_only=False, element_name=None):
+        """Write the object as an XML document to an C{asyncio} stream.
+
+        This returns a coroutine, to be awaited from an event loop.  The
+        document is written in pieces, waiting on the writer's flow control
+        between them.  Requires Python 3.5 or later; see
+        L{pyxb.binding.aio.WriteAsync}.
+
+        @param writer: An C{asyncio.StreamWriter}
+
+        @param encoding: The encoding to be used.  Unlike L{toxml} this
+        defaults to C{'utf-8'}, since the stream accepts only data.
+
+        Remaining parameters are as with L{toxml}.
+        """
+        import pyxb.binding.aio
+        return pyxb.binding.aio.WriteAsync(self, writer, encoding, bds=bds, root_only=root_only, element_name=element_name)
+
     def _toDOM_csc (self, dom_support, parent):
         assert parent is not None
         if self.__xsiNil:
-            dom_support.addAttribute(parent, XSI.nil, 'true')
+            dom_support.addAttribute(parent, XSI.nil, 'true', component_name=True)
         return getattr(super(_TypeBinding_mixin, self), '_toDOM_csc', lambda *_args,**_kw: dom_support)(dom_support, parent)
 
     def _validateBinding_vx (self):
@@ -741,6 +852,25 @@ class simpleTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixin
     currently are no public symbols in generated SimpleTypeDefinion
     bindings."""
 
+    _CacheLexicalForm = False
+    """Set to C{True} to have instances remember the text produced by
+    L{xsdLiteral} so it is not recomputed each time the value is written to
+    a document.  This may be set on this class to affect all simple types, or
+    on a specific binding class.
+
+    When enabled, an instance created from XML text is given that text as
+    its lexical form if L{_IsCanonicalLexical} confirms it is the text
+    L{xsdLiteral} would produce.  The lexical form of an L{STD_list} instance
+    is discarded when the list is modified."""
+
+    _CanonicalLexicalPattern = None
+    """C{None}, or a compiled regular expression that matches only text that
+    L{XsdLiteral} produces from the value it represents.  See
+    L{_IsCanonicalLexical}."""
+
+    # The cached lexical form of this instance, or None
+    __lexicalForm = None
+
 
     # Determine the name of the class-private facet map.  For the base class
     # this should produce the same attribute name as Python's privatization
@@ -940,6 +1070,12 @@ class simpleTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixin
         require_value = kw.pop('_require_value', False)
         # Save DOM node so we can pull attributes off it
         dom_node = kw.get('_dom_node')
+        lexical = None
+        if self._CacheLexicalForm:
+            if dom_node is not None:
+                lexical = domutils.ExtractTextContent(dom_node)
+            elif (1 == len(args)) and kw.get('_from_xml') and isinstance(args[0], six.string_types):
+                lexical = args[0]
         location = kw.get('_location')
         if (location is None) and isinstance(dom_node, utility.Locatable_mixin):
             location = dom_node._location()
@@ -959,6 +1095,8 @@ class simpleTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixin
             raise pyxb.SimpleContentAbsentError(self, location)
         if validate_constraints and not kw.pop('_nil', False):
             self.xsdConstraintsOK(location)
+        if (lexical is not None) and self._IsCanonicalLexical(lexical):
+            self.__lexicalForm = lexical
 
     # The class attribute name used to store the reference to the STD
     # component instance must be unique to the class, not to this base class.
@@ -1004,10 +1142,42 @@ class simpleTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixin
         instance in an XML document.
 
         The base class implementation delegates to the object class's
-        XsdLiteral method."""
+        XsdLiteral method.  The result is remembered if
+        L{_CacheLexicalForm} is enabled."""
         if self._isNil():
             return ''
-        return self.XsdLiteral(self)
+        lexical = self.__lexicalForm
+        if lexical is None:
+            lexical = self.XsdLiteral(self)
+            if self._CacheLexicalForm:
+                self.__lexicalForm = lexical
+        return lexical
+
+    @classmethod
+    def _IsCanonicalLexical (cls, text):
+        """Return C{True} iff C{text} is known to be the lexical form that
+        L{XsdLiteral} produces from the value it represents.
+
+        The base class implementation uses L{_CanonicalLexicalPattern}.  A
+        C{False} result means only that the text cannot cheaply be shown to
+        be canonical."""
+        pattern = cls._CanonicalLexicalPattern
+        return (pattern is not None) and (pattern.match(text) is not None)
+
+    def _lexicalForm (self):
+        """Return the cached lexical form of this instance, or C{None}."""
+        return self.__lexicalForm
+
+    def _setLexicalForm (self, lexical):
+        """Record the lexical form of this instance, if
+        L{_CacheLexicalForm} is enabled."""
+        if self._CacheLexicalForm:
+            self.__lexicalForm = lexical
+
+    def _resetLexicalForm (self):
+        """Discard the cached lexical form of this instance."""
+        if self.__lexicalForm is not None:
+            self.__lexicalForm = None
 
     @classmethod
     def XsdSuperType (cls):
@@ -1378,6 +1548,16 @@ class STD_list (simpleTypeDefinition, six.list_type):
         """Convert from a binding value to a string usable in an XML document."""
         return ' '.join([ cls._ItemType.XsdLiteral(_v) for _v in value ])
 
+    @classmethod
+    def _IsCanonicalLexical (cls, text):
+        """A list is canonical if its items are separated by single spaces
+        and each is canonical for the item type."""
+        item_check = cls._ItemType._IsCanonicalLexical
+        for item in text.split(' '):
+            if not item_check(item):
+                return False
+        return True
+
     @classmethod
     def _description (cls, name_only=False, user_documentation=True):
         name = cls._Name()
@@ -1396,24 +1576,44 @@ class STD_list (simpleTypeDefinition, six.list_type):
         return [ self._ValidatedItem(_v) for _v in values ]
 
     def __setitem__ (self, key, value):
+        self._resetLexicalForm()
         if isinstance(key, slice):
             super(STD_list, self).__setitem__(key, self.__convertMany(value))
         else:
             super(STD_list, self).__setitem__(key, self._ValidatedItem(value))
 
+    def __delitem__ (self, key):
+        self._resetLexicalForm()
+        super(STD_list, self).__delitem__(key)
+
+    def __iadd__ (self, values):
+        self._resetLexicalForm()
+        return super(STD_list, self).__iadd__(self.__convertMany(values))
+
+    def __imul__ (self, count):
+        self._resetLexicalForm()
+        return super(STD_list, self).__imul__(count)
+
     if six.PY2:
         def __setslice__ (self, start, end, values):
+            self._resetLexicalForm()
             super(STD_list, self).__setslice__(start, end, self.__convertMany(values))
 
+        def __delslice__ (self, start, end):
+            self._resetLexicalForm()
+            super(STD_list, self).__delslice__(start, end)
+
     def __contains__ (self, item):
         return super(STD_list, self).__contains__(self._ValidatedItem(item))
 
     # Standard mutable sequence methods, per Python Library Reference "Mutable Sequence Types"
 
     def append (self, x):
+        self._resetLexicalForm()
         super(STD_list, self).append(self._ValidatedItem(x))
 
     def extend (self, x, _from_xml=False):
+        self._resetLexicalForm()
         super(STD_list, self).extend(self.__convertMany(x))
 
     def count (self, x):
@@ -1423,11 +1623,30 @@ class STD_list (simpleTypeDefinition, six.list_type):
         return super(STD_list, self).index(self._ValidatedItem(x), *args)
 
     def insert (self, i, x):
+        self._resetLexicalForm()
         super(STD_list, self).insert(i, self._ValidatedItem(x))
 
     def remove (self, x):
+        self._resetLexicalForm()
         super(STD_list, self).remove(self._ValidatedItem(x))
 
+    def pop (self, *args):
+        self._resetLexicalForm()
+        return super(STD_list, self).pop(*args)
+
+    def reverse (self):
+        self._resetLexicalForm()
+        super(STD_list, self).reverse()
+
+    def sort (self, *args, **kw):
+        self._resetLexicalForm()
+        super(STD_list, self).sort(*args, **kw)
+
+    if not six.PY2:
+        def clear (self):
+            self._resetLexicalForm()
+            super(STD_list, self).clear()
+
 class element (utility._DeconflictSymbols_mixin, _DynamicCreate_mixin):
     """Class that represents a schema element within a binding.
 
@@ -2138,12 +2357,17 @@ class complexTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixi
 
     # Specify the symbols to be reserved for all CTDs.
     _ReservedSymbols = _TypeBinding_mixin._ReservedSymbols.union(set([ 'wildcardElements', 'wildcardAttributeMap',
-                             'xsdConstraintsOK', 'content', 'orderedContent', 'append', 'extend', 'value', 'reset' ]))
+                             'xsdConstraintsOK', 'content', 'orderedContent', 'append', 'extend', 'appendRun', 'value', 'reset' ]))
 
     # None, or a reference to a pyxb.utils.fac.Automaton instance that defines
     # the content model for the type.
     _Automaton = None
 
+    # True if the generator determined that content associated with an
+    # element declaration never has more than one candidate transition in
+    # _Automaton.  See pyxb.binding.generate.AutomatonIsDeterministic.
+    _AutomatonIsDeterministic = False
+
     @classmethod
     def _AddElement (cls, element):
         """Method used by generated code to associate the element binding with a use in this type.
@@ -2186,6 +2410,16 @@ class complexTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixi
             order.append(ElementContent(value, ed))
         return order
 
+    def _childrenForSerialization (self):
+        """Return the element and non-element content in the order in which
+        it should be written to a document.
+
+        This is L{_validatedChildren} unless validation has been disabled
+        when generating documents."""
+        if pyxb.GlobalValidationConfig.forDocument:
+            return self._validatedChildren()
+        return self.__childrenForDOM()
+
     def _validatedChildren (self):
         """Provide the child elements and non-element content in an order
         consistent with the content model.
@@ -2203,8 +2437,54 @@ class complexTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixi
         """
         if self._ContentTypeTag in (self._CT_EMPTY, self._CT_SIMPLE):
             return []
+        # Re-use the previous result if the content has not changed
+        (signature, referents) = self.__contentSignature()
+        cached = self.__validatedChildrenCache
+        if (cached is not None) and (cached[0] == signature) and (len(cached[1]) == len(referents)) and all(map(operator.is_, cached[1], referents)):
+            return cached[2][:]
         self._resetAutomaton()
-        return self.__automatonConfiguration.sequencedChildren()
+        order = self.__automatonConfiguration.sequencedChildren()
+        self.__validatedChildrenCache = (signature, referents, order[:])
+        return order
+
+    # None, or a triple comprising a signature of the content of the
+    # instance, the objects that must be identical for the signature to
+    # match, and the result of _validatedChildren for that content.  This
+    # is discarded by _contentModified.
+    __validatedChildrenCache = None
+
+    def _contentModified (self):
+        """Record that the element content of the instance has changed.
+
+        This discards any cached result of L{_validatedChildren}.  It is
+        invoked when elements are set, appended, or reset."""
+        self.__validatedChildrenCache = None
+
+    def __contentSignature (self):
+        # Changes made through the instance discard the cached validated
+        # children.  The signature identifies changes made to mutable
+        # structures that are exposed by the instance: plural element values,
+        # the wildcard element list, and the ordered content when it
+        # influences generation, along with the validation configuration
+        # that affects the order.  It is a pair comprising a tuple of
+        # comparable values, and a list of objects that must be the same
+        # objects.
+        vc = self._validationConfig
+        signature = [ vc.contentInfluencesGeneration, vc.orphanElementInContent, vc.invalidElementInContent ]
+        referents = [ vc ]
+        for eu in six.itervalues(self._ElementMap):
+            if eu.isPlural():
+                value = eu.value(self)
+                signature.append(value._epoch())
+                referents.append(value)
+        wce = self.__wildcardElements
+        if wce:
+            signature.append(len(wce))
+            referents.extend(wce)
+        if (vc.ALWAYS == vc.contentInfluencesGeneration) or (self._CT_MIXED == self._ContentTypeTag and vc.MIXED_ONLY == vc.contentInfluencesGeneration):
+            signature.append(len(self.__content))
+            referents.extend(self.__content)
+        return (tuple(signature), referents)
 
     def _symbolSet (self):
         """Return a map from L{content.ElementDeclaration} instances to a list of
@@ -2612,7 +2892,41 @@ class complexTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixi
         [ self.append(_v, **kw) for _v in value_list ]
         return self
 
+    def appendRun (self, element_decl, values, _location=None):
+        """Add a run of values for the same element to the instance.
+
+        This is equivalent to invoking L{append} for each value with the
+        element declaration, but where the content model permits it the
+        automaton is advanced and the values are stored for the whole run
+        at once.  This is much faster for long sequences of sibling
+        elements.
+
+        @param element_decl: The L{pyxb.binding.content.ElementDeclaration}
+        of this type for the values.
+
+        @param values: An iterable of values for the element.
+
+        @raise pyxb.ContentValidationError: a value is not permitted at
+        the corresponding state of the content model.
+        """
+        values = list(values)
+        kw = { '_element_decl': element_decl,
+               '_location': _location }
+        if self._isNil():
+            if values:
+                raise pyxb.ContentInNilInstanceError(self, values[0], _location)
+            return self
+        start = 0
+        if (self.__automatonConfiguration is not None) and element_decl.isPlural():
+            if not self._validationConfig.forBinding:
+                element_decl.extend(self, values)
+                return self
+            start = self.__automatonConfiguration.stepRun(values, element_decl)
+        [ self.append(_v, **kw) for _v in values[start:] ]
+        return self
+
     def __setContent (self, value):
+        self._contentModified()
         self.__content = value
         return self.__content
 
@@ -2622,6 +2936,7 @@ class complexTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixi
         #assert self._IsMixed() or (not self._performValidation()) or isinstance(child, _TypeBinding_mixin) or isinstance(child, six.string_types), 'Unrecognized child %s type %s' % (child, type(child))
         assert not (self._ContentTypeTag in (self._CT_EMPTY, self._CT_SIMPLE))
         assert isinstance(wrapped_value, _Content)
+        self._contentModified()
         self.__content.append(wrapped_value)
         if isinstance(wrapped_value, ElementContent):
             value = wrapped_value.value
@@ -2630,6 +2945,19 @@ class complexTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixi
                 assert isinstance(ed.elementBinding(), element)
                 value._setElement(ed.elementBinding())
 
+    def _extendContent (self, wrapped_values):
+        """Add a sequence of L{ElementContent} values, as by L{_addContent}
+        on each of them."""
+        assert not (self._ContentTypeTag in (self._CT_EMPTY, self._CT_SIMPLE))
+        self._contentModified()
+        self.__content.extend(wrapped_values)
+        for wv in wrapped_values:
+            value = wv.value
+            ed = wv.elementDeclaration
+            if isinstance(value, _TypeBinding_mixin) and (ed is not None) and (value._element() is None):
+                assert isinstance(ed.elementBinding(), element)
+                value._setElement(ed.elementBinding())
+
     @classmethod
     def _IsMixed (cls):
         return (cls._CT_MIXED == cls._ContentTypeTag)
@@ -2676,10 +3004,7 @@ class complexTypeDefinition (_TypeBinding_mixin, utility._DeconflictSymbols_mixi
                 raise pyxb.SimpleContentAbsentError(self, self._location())
             dom_support.appendTextChild(self.value(), element)
         else:
-            if pyxb.GlobalValidationConfig.forDocument:
-                order = self._validatedChildren()
-            else:
-                order = self.__childrenForDOM()
+            order = self._childrenForSerialization()
             for content in order:
                 assert id(content.value) != id(self)
                 if isinstance(content, NonElementContent):
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright 2009-2013, Peter A. Bigot
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain a
+# copy of the License at:
+#
+#            http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""This module contains support for parsing many independent documents
+using a pool of worker processes.
+
+Conversion of XML to bindings is pure Python and CPU bound, so threads do
+not provide any parallelism.  L{ParseMany} distributes documents among
+processes, each of which imports the binding module once and then parses
+every document it is given with the module's C{CreateFromDocument}.
+
+Binding instances are returned to the calling process by pickling.  Where
+only some information derived from each document is needed, supply a
+C{reducer} so that the (usually much smaller) reduced value is returned
+instead.  A reducer is required for schemas with an absent target
+namespace, since instances in absent namespaces cannot be reconstructed
+outside the process that created them.
+
+This module requires C{concurrent.futures} with support for worker
+initializers (Python 3.7 or later).
+"""
+
+import logging
+import importlib
+from pyxb.utils import six
+
+_log = logging.getLogger(__name__)
+
+# The binding module imported in a worker process
+_WorkerModule = None
+
+# The reduction applied to each binding instance in a worker process, or None
+_WorkerReducer = None
+
+# Keywords passed to CreateFromDocument in a worker process
+_WorkerKeywords = None
+
+def _InitializeWorker (module_name, reducer, kw):
+    """Prepare a worker process by importing the binding module.
+
+    This is invoked once in each worker process."""
+    global _WorkerModule, _WorkerReducer, _WorkerKeywords
+    _WorkerModule = importlib.import_module(module_name)
+    _WorkerReducer = reducer
+    _WorkerKeywords = kw
+
+def _ParseInWorker (source):
+    """Parse one document in a worker process."""
+    instance = _WorkerModule.CreateFromDocument(source, **_WorkerKeywords)
+    if _WorkerReducer is not None:
+        return _WorkerReducer(instance)
+    return instance
+
+def ParseMany (module, sources, workers=None, reducer=None, chunksize=1, **kw):
+    """Convert many documents to bindings using a pool of processes.
+
+    @param module: The generated binding module used to parse the
+    documents, or its fully qualified name.  The module must be importable
+    by name in the worker processes.
+
+    @param sources: An iterable of documents.  Each must be something that
+    can be pickled and is accepted by the module's C{CreateFromDocument},
+    such as text, data, or a path object.  Open file objects cannot be
+    passed between processes.
+
+    @keyword workers: The number of worker processes.  Defaults to the
+    number of processors.
+
+    @keyword reducer: Optional callable invoked in the worker process with
+    each binding instance.  Its result is returned in place of the instance.
+    It must be picklable, e.g. a module-level function.
+
+    @keyword chunksize: The number of documents sent to a worker at a time.
+    Values greater than one reduce communication overhead for many small
+    documents.
+
+    Remaining keywords are passed to C{CreateFromDocument}.
+
+    @return: A list holding, for each document in the order given by
+    C{sources}, the binding instance or the result of C{reducer}.
+
+    @raise pyxb.PyXBException: any exception raised while processing a
+    document is re-raised in the calling process.
+    """
+    import concurrent.futures
+    if not isinstance(module, six.string_types):
+        module = module.__name__
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                initializer=_InitializeWorker,
+                                                initargs=(module, reducer, kw)) as executor:
+        return list(executor.map(_ParseInWorker, sources, chunksize=chunksize))
+
+## Local Variables:
+## fill-column:78
+## End:
@@ -26,6 +26,7 @@ L{Wildcard} holds content-related information used in the content model.
 """
 
 import logging
+import threading
 import xml.dom
 
 import pyxb
@@ -219,7 +220,7 @@ class AttributeUse (pyxb.cscRoot):
         """If this attribute as been set, add the corresponding attribute to the DOM element."""
         ( provided, value ) = self.__getValue(ctd_instance)
         if provided:
-            dom_support.addAttribute(element, self.__name, value)
+            dom_support.addAttribute(element, self.__name, value, component_name=True)
         return self
 
     def validate (self, ctd_instance):
@@ -301,6 +302,146 @@ class AttributeUse (pyxb.cscRoot):
             desc.extend(['=', self.__unicodeDefault ])
         return ''.join(desc)
 
+# Serializes the construction of automata by LazyAutomaton instances.
+_LazyAutomatonLock = threading.Lock()
+
+class LazyAutomaton (object):
+    """A descriptor that builds the content model automaton of a complex
+    type when it is first referenced.
+
+    Generated binding modules assign an instance of this class to the
+    C{_Automaton} attribute of each complex type, so the cost of building
+    automata is paid only for types that are used.  On first access the
+    automaton is built and replaces the descriptor in the class that holds
+    it, so subsequent references are ordinary attribute lookups."""
+
+    # The callable that builds the automaton, or None once it has been
+    # invoked
+    __builder = None
+
+    # The automaton, once built
+    __automaton = None
+
+    def __init__ (self, builder):
+        """@param builder: A callable with no arguments that returns a
+        L{pyxb.utils.fac.Automaton}.  It is invoked at most once."""
+        self.__builder = builder
+
+    def automaton (self):
+        """Return the automaton, building it if necessary."""
+        with _LazyAutomatonLock:
+            if self.__builder is not None:
+                self.__automaton = self.__builder()
+                self.__builder = None
+        return self.__automaton
+
+    def __get__ (self, instance, owner):
+        automaton = self.automaton()
+        for cls in owner.__mro__:
+            if cls.__dict__.get('_Automaton') is self:
+                setattr(cls, '_Automaton', automaton)
+                break
+        return automaton
+
+class Stats (object):
+    """Counters describing the work done by content model automata for the
+    instances of one complex type binding class.
+
+    Collection is disabled by default, since it adds a small cost to every
+    step of an automaton.  Invoke L{Enable} to start collecting and
+    L{Snapshot} to retrieve the counters for each binding class.  Counters
+    may be slightly low if instances of the same class are processed by
+    multiple threads at the same time."""
+
+    # True iff counters are being collected.  This is tested on every step
+    # of an automaton.
+    _Active = False
+
+    # Map from binding classes to their Stats instances
+    __Records = { }
+
+    __Lock = threading.Lock()
+
+    steps = 0
+    """The number of values presented to the automaton."""
+
+    fastSteps = 0
+    """The number of values accepted without considering alternative
+    configurations, using the compiled transitions of the automaton or the
+    determinism recorded by the generator."""
+
+    rejections = 0
+    """The number of values for which there was no transition."""
+
+    nondeterministicSteps = 0
+    """The number of values that left more than one configuration
+    pending."""
+
+    peakWidth = 0
+    """The largest number of configurations pending after a value."""
+
+    permittedNondeterminism = None
+    """The value of L{AutomatonConfiguration.PermittedNondeterminism} when
+    L{peakWidth} was reached."""
+
+    clones = 0
+    """The number of configurations cloned to follow alternative
+    transitions."""
+
+    resolutions = 0
+    """The number of times pending configurations were resolved to one."""
+
+    ambiguousResolutions = 0
+    """The number of resolutions that found more than one accepting
+    configuration."""
+
+    __Counters = ( 'steps', 'fastSteps', 'rejections', 'nondeterministicSteps', 'peakWidth',
+                   'permittedNondeterminism', 'clones', 'resolutions', 'ambiguousResolutions' )
+
+    @classmethod
+    def _Record (cls, binding_class):
+        """Return the instance holding counters for the binding class,
+        creating it if necessary."""
+        record = cls.__Records.get(binding_class)
+        if record is None:
+            with cls.__Lock:
+                record = cls.__Records.setdefault(binding_class, cls())
+        return record
+
+    def _noteWidth (self, width, permitted):
+        if width > self.peakWidth:
+            self.peakWidth = width
+            self.permittedNondeterminism = permitted
+
+    @classmethod
+    def Enable (cls, enable=True):
+        """Start or stop collecting counters.
+
+        Counters that have been collected are retained; see L{Reset}."""
+        cls._Active = not not enable
+
+    @classmethod
+    def IsEnabled (cls):
+        """C{True} iff counters are being collected."""
+        return cls._Active
+
+    @classmethod
+    def Reset (cls):
+        """Discard all collected counters."""
+        with cls.__Lock:
+            cls.__Records = { }
+
+    @classmethod
+    def Snapshot (cls):
+        """Return the counters collected so far.
+
+        @return: A map from each complex type binding class for which a value
+        has been presented to its automaton, to a map from the names of the
+        counters (e.g. C{'steps'}, C{'peakWidth'}) to their values."""
+        with cls.__Lock:
+            records = list(six.iteritems(cls.__Records))
+        return dict([ (_bc, dict([ (_n, getattr(_r, _n)) for _n in cls.__Counters ])) for (_bc, _r) in records ])
+
 class AutomatonConfiguration (object):
     """State for a L{pyxb.utils.fac.Automaton} monitoring content for an
     incrementally constructed complex type binding instance.
@@ -320,13 +461,38 @@ class AutomatonConfiguration (object):
     __cfg = None
 
     # A list of pairs when the state is non-deterministic.  The first member
-    # of the pair is the configuration; the second is a tuple of closures that
-    # must be applied to the instance in order to store the content that was
+    # of the pair is the configuration; the second is the closures that must
+    # be applied to the instance in order to store the content that was
     # accepted along the path to that configuration.  This is in order of
     # preference based on the location of path candidate declarations in the
-    # defining schema.
+    # defining schema.  The closures are held in a chain of pairs (see
+    # __ApplyActions) so paths that diverge share the actions taken before
+    # they diverged.
     __multi = None
 
+    @classmethod
+    def __ApplyActions (cls, actions, instance):
+        """Apply a chain of closures to an instance.
+
+        @param actions: C{None}, or a pair consisting of the last closure on
+        the path and the chain of closures that precede it."""
+        fns = []
+        while actions is not None:
+            (fn, actions) = actions
+            fns.append(fn)
+        for fn in reversed(fns):
+            fn(instance)
+
+    # The compiled transition table of the automaton, if it has one.  See
+    # pyxb.utils.fac.Automaton.compiledTransitions.
+    __transitionTable = None
+
+    # True if the binding class records that its automaton never has more
+    # than one candidate transition for content associated with an element
+    # declaration.  See
+    # pyxb.binding.basis.complexTypeDefinition._AutomatonIsDeterministic.
+    __deterministic = False
+
     PermittedNondeterminism = 20
     """The maximum amount of unresolved non-determinism that is acceptable.
     If the value is exceeded, a L{pyxb.ContentNondeterminismExceededError}
@@ -340,8 +506,11 @@ class AutomatonConfiguration (object):
 
         Subsequent transitions are expected based on candidate content to be
         supplied through the L{step} method."""
-        self.__cfg = self.__instance._Automaton.newConfiguration()
+        automaton = self.__instance._Automaton
+        self.__cfg = automaton.newConfiguration()
         self.__multi = None
+        self.__transitionTable = automaton.compiledTransitions()
+        self.__deterministic = self.__instance._AutomatonIsDeterministic
 
     def nondeterminismCount (self):
         """Return the number of pending configurations.
@@ -368,41 +537,169 @@ class AutomatonConfiguration (object):
         current configuration based on the parameters."""
 
         sym = (value, element_decl)
+        stats = Stats._Active and Stats._Record(type(self.__instance))
+        if stats:
+            stats.steps += 1
+
+        # When the automaton is deterministic at this point and the content
+        # is known to belong to an element declaration, the transition
+        # table identifies the candidates without matching each symbol.
+        # A unique candidate is applied in place.
+        if (self.__transitionTable is not None) and (element_decl is not None) and (self.__multi is None):
+            by_key = self.__transitionTable.get(self.__cfg.state)
+            if by_key is not None:
+                cand = by_key.get(element_decl, ())
+                if (1 < len(cand)) or (cand and cand[0].updateInstructions):
+                    cand = [ _xit for _xit in cand if _xit.satisfiedBy(self.__cfg) ]
+                if 0 == len(cand):
+                    if stats:
+                        stats.rejections += 1
+                    return 0
+                if 1 == len(cand):
+                    xit = cand[0]
+                    # Store the content first, so a value that cannot be
+                    # converted leaves the configuration unchanged.
+                    xit.destination.symbol.consume(sym, self.__instance)
+                    self.__cfg = xit.apply(self.__cfg)
+                    if stats:
+                        stats.fastSteps += 1
+                    return 1
+
+        # When the generator determined that content for an element
+        # declaration has at most one candidate from any state, there are no
+        # alternatives to track: the candidate is applied in place and its
+        # content stored immediately.
+        if self.__deterministic and (element_decl is not None) and (self.__multi is None):
+            cand = self.__cfg.candidateTransitions(sym)
+            if 0 == len(cand):
+                if stats:
+                    stats.rejections += 1
+                return 0
+            assert 1 == len(cand)
+            xit = cand[0]
+            xit.consumedSymbol().consume(sym, self.__instance)
+            self.__cfg = xit.apply(self.__cfg)
+            if stats:
+                stats.fastSteps += 1
+            return 1
 
         # Start with the current configuration(s), assuming we might see
         # non-determinism.
         new_multi = []
         if self.__multi is None:
-            multi = [ (self.__cfg, ()) ]
+            multi = [ (self.__cfg, None) ]
         else:
             multi = self.__multi[:]
-        # Collect the complete set of reachable configurations along with the
-        # closures that will update the instance content based on the path.
-        for (cfg, pending) in multi:
-            cand = cfg.candidateTransitions(sym)
-            for transition in cand:
-                clone_map = {}
-                ccfg = cfg.clone(clone_map)
-                new_multi.append( (transition.apply(ccfg, clone_map), pending+(transition.consumedSymbol().consumingClosure(sym),)) )
-        rv = len(new_multi)
+        candidates = [ (_cfg, _pending, _cfg.candidateTransitions(sym)) for (_cfg, _pending) in multi ]
+        rv = sum([ len(_c[2]) for _c in candidates ])
+        if stats:
+            if 0 == rv:
+                stats.rejections += 1
+            elif 1 < rv:
+                stats.nondeterministicSteps += 1
+            stats._noteWidth(rv, self.PermittedNondeterminism)
         if 0 == rv:
             # No candidate transitions.  Do not change the state.
             return 0
+        if rv > self.PermittedNondeterminism:
+            raise pyxb.ContentNondeterminismExceededError(self.__instance)
+        # Collect the complete set of reachable configurations along with the
+        # closures that will update the instance content based on the path.
+        # The configurations being replaced are no longer needed, so the last
+        # candidate transition from each is applied to it directly; the others
+        # are applied to clones.
+        for (cfg, pending, cand) in candidates:
+            last = len(cand) - 1
+            for (ci, transition) in enumerate(cand):
+                clone_map = None
+                ccfg = cfg
+                if ci < last:
+                    clone_map = {}
+                    ccfg = cfg.clone(clone_map)
+                    if stats:
+                        stats.clones += 1
+                new_multi.append( (transition.apply(ccfg, clone_map), (transition.consumedSymbol().consumingClosure(sym), pending)) )
         if 1 == rv:
             # Deterministic transition.  Save the configuration and apply the
             # corresponding updates.
             self.__multi = None
             (self.__cfg, actions) = new_multi[0]
-            for fn in actions:
-                fn(self.__instance)
+            self.__ApplyActions(actions, self.__instance)
         else:
             # Non-deterministic.  Save everything for subsequent resolution.
-            if rv > self.PermittedNondeterminism:
-                raise pyxb.ContentNondeterminismExceededError(self.__instance)
             self.__cfg = None
             self.__multi = new_multi
         return rv
 
+    def stepRun (self, values, element_decl):
+        """Attempt transitions for a run of values associated with the same
+        element declaration.
+
+        This succeeds only in the common case where the run can be placed
+        without matching each value: the automaton is deterministic at this
+        point, the first value has a unique transition into a state, and
+        subsequent values have a unique transition that returns to that
+        state and only increments counters.  The counters are then advanced
+        once for as many values as they permit, and the accepted values are
+        stored in the instance together.
+
+        @param values: a sequence of values for the element
+
+        @param element_decl: the L{ElementDeclaration} for the values
+
+        @return: the number of leading values that were accepted.  This is
+        zero if the run could not be placed without matching each value.
+        Values that were not accepted should be supplied through L{step},
+        which handles the general case and diagnoses invalid content."""
+        if (self.__transitionTable is None) or (self.__multi is not None) or (0 == len(values)):
+            return 0
+        # Only values that can be stored are placed, so a value that cannot
+        # be converted leaves the automaton consistent with the content.
+        # Such a value is diagnosed when it is supplied through step.
+        converted = self.__instance._validationConfig.forBinding
+        if converted:
+            element_binding = element_decl.elementBinding()
+            compatible = []
+            for v in values:
+                try:
+                    compatible.append(element_binding.compatibleValue(v))
+                except (pyxb.PyXBException, ValueError, TypeError):
+                    break
+            values = compatible
+            if 0 == len(values):
+                return 0
+        by_key = self.__transitionTable.get(self.__cfg.state)
+        if by_key is None:
+            return 0
+        cand = [ _xit for _xit in by_key.get(element_decl, ()) if _xit.satisfiedBy(self.__cfg) ]
+        if 1 != len(cand):
+            return 0
+        (xit,) = cand
+        repeat = None
+        if (1 < len(values)) and element_decl.isPlural():
+            by_key = self.__transitionTable.get(xit.destination)
+            if by_key is not None:
+                repeat = by_key.get(element_decl, ())
+                if (1 == len(repeat)) and (repeat[0].destination == xit.destination) and all([ _ui.doIncrement for _ui in repeat[0].updateInstructions ]):
+                    repeat = repeat[0]
+                else:
+                    repeat = None
+        self.__cfg = xit.apply(self.__cfg)
+        count = 1
+        if repeat is not None:
+            count += repeat.applyRepeatedly(self.__cfg, len(values) - 1)
+        if not element_decl.isPlural():
+            element_decl.set(self.__instance, values[0])
+        elif converted:
+            element_decl._extendCompatible(self.__instance, values[:count])
+        else:
+            element_decl.extend(self.__instance, values[:count])
+        if Stats._Active:
+            stats = Stats._Record(type(self.__instance))
+            stats.steps += count
+            stats.fastSteps += count
+        return count
+
     def resolveNondeterminism (self, prefer_accepting=True):
         """Resolve any non-determinism in the automaton state.
 
@@ -432,6 +729,11 @@ class AutomatonConfiguration (object):
         # no configurations available unless nobody even reset the
         # configuration, which would be a usage error.
         assert 0 < len(multi)
+        if Stats._Active:
+            stats = Stats._Record(type(self.__instance))
+            stats.resolutions += 1
+            if 1 < len(multi):
+                stats.ambiguousResolutions += 1
         if 1 < len(multi):
             desc = self.__instance._ExpandedName
             if desc is None:
@@ -446,8 +748,7 @@ class AutomatonConfiguration (object):
             '''
         (self.__cfg, actions) = multi[0]
         self.__multi = None
-        for fn in actions:
-            fn(self.__instance)
+        self.__ApplyActions(actions, self.__instance)
 
     def acceptableContent (self):
         """Return the sequence of acceptable symbols at this state.
@@ -686,6 +987,13 @@ class _FACSymbol (pyxb.utils.fac.SymbolMatch_mixin):
         appropriate slot."""
         raise NotImplementedError('%s._consumingClosure' % (type(self).__name__,))
 
+    def consume (self, sym, instance):
+        """Store the value from C{sym} into C{instance}.
+
+        This is equivalent to invoking the result of L{consumingClosure}, and
+        is used when the transition is known to be taken."""
+        raise NotImplementedError('%s.consume' % (type(self).__name__,))
+
     def __init__ (self, xsd_location):
         """@param xsd_location: the L{location<pyxb.utils.utility.Location>} of the element use or wildcard declaration."""
         self.__xsdLocation = xsd_location
@@ -734,6 +1042,17 @@ class ElementUse (_FACSymbol):
         # the closure is applied.
         return lambda _inst,_eu=self,_sy=sym: _eu.__elementDeclaration.setOrAppend(_inst, _eu.matchValue(_sy))
 
+    def consume (self, sym, instance):
+        self.__elementDeclaration.setOrAppend(instance, self.matchValue(sym))
+
+    def transitionKey (self):
+        """Satisfy L{pyxb.utils.fac.SymbolMatch_mixin}.
+
+        Content that is known to be associated with an element declaration
+        matches only the use of that declaration, so the declaration is the
+        key."""
+        return self.__elementDeclaration
+
     def match (self, symbol):
         """Satisfy L{pyxb.utils.fac.SymbolMatch_mixin}.
 
@@ -775,6 +1094,9 @@ class WildcardUse (_FACSymbol):
         """Create a closure that will apply the value accepted by L{match} to a to-be-supplied instance."""
         return lambda _inst,_av=self.matchValue(sym): _inst._appendWildcardElement(_av)
 
+    def consume (self, sym, instance):
+        instance._appendWildcardElement(self.matchValue(sym))
+
     def match (self, symbol):
         """Satisfy L{pyxb.utils.fac.SymbolMatch_mixin}.
 
@@ -825,6 +1147,16 @@ class _PluralBinding (MutableSequence):
         self.__list = []
         self.extend(args)
 
+    # Incremented on each change to the list
+    __epoch = 0
+
+    def _epoch (self):
+        """Return a value that changes whenever the list is modified.
+
+        This allows the binding instance that holds the list to detect
+        changes made directly to the list."""
+        return self.__epoch
+
     def __convert (self, v):
         return self.__elementBinding.compatibleValue(v)
 
@@ -835,12 +1167,14 @@ class _PluralBinding (MutableSequence):
         return self.__list.__getitem__(key)
 
     def __setitem__ (self, key, value):
+        self.__epoch += 1
         if isinstance(key, slice):
             self.__list.__setitem__(key, [ self.__convert(_v) for _v in value])
         else:
             self.__list.__setitem__(key, self.__convert(value))
 
     def __delitem__ (self, key):
+        self.__epoch += 1
         self.__list.__delitem__(key)
 
     def __iter__ (self):
@@ -854,11 +1188,19 @@ class _PluralBinding (MutableSequence):
 
     # The mutable sequence type methods
     def append (self, x):
+        self.__epoch += 1
         self.__list.append(self.__convert(x))
 
     def extend (self, x):
+        self.__epoch += 1
         self.__list.extend(map(self.__convert, x))
 
+    def _extendCompatible (self, x):
+        """Extend with values that are known to be compatible with the
+        element binding, so need not be converted."""
+        self.__epoch += 1
+        self.__list.extend(x)
+
     def count (self, x):
         return self.__list.count(x)
 
@@ -866,18 +1208,23 @@ class _PluralBinding (MutableSequence):
         return self.__list.index(x, i, j)
 
     def insert (self, i, x):
+        self.__epoch += 1
         self.__list.insert(i, self.__convert(x))
 
     def pop (self, i=-1):
+        self.__epoch += 1
         return self.__list.pop(i)
 
     def remove (self, x):
+        self.__epoch += 1
         self.__list.remove(x)
 
     def reverse (self):
+        self.__epoch += 1
         self.__list.reverse()
 
     def sort (self, key=None, reverse=False):
+        self.__epoch += 1
         self.__list.sort(key=key, reverse=reverse)
 
     def __str__ (self):
@@ -1033,6 +1380,7 @@ class ElementDeclaration (object):
     def reset (self, ctd_instance):
         """Set the value for this use in the given element to its default."""
         setattr(ctd_instance, self.__key, self.resetValue())
+        ctd_instance._contentModified()
         return self
 
     def set (self, ctd_instance, value):
@@ -1055,6 +1403,46 @@ class ElementDeclaration (object):
             return self.append(ctd_instance, value)
         return self.set(ctd_instance, value)
 
+    def extend (self, ctd_instance, values):
+        """Add the given values as further instances of this element within
+        the binding instance.
+
+        This is equivalent to invoking L{append} for each value, but updates
+        the element value and instance content once.
+
+        @raise pyxb.StructuralBadDocumentError: invoked on an element use that is not plural
+        """
+        values = list(values)
+        if ctd_instance._isNil():
+            raise pyxb.ContentInNilInstanceError(ctd_instance, values)
+        if not self.isPlural():
+            raise pyxb.NonPluralAppendError(ctd_instance, self, values)
+        plural = self.value(ctd_instance)
+        start = len(plural)
+        # As with append for each value, values preceding one that cannot be
+        # converted are retained.
+        try:
+            if ctd_instance._validationConfig.forBinding:
+                compatible = []
+                try:
+                    for v in values:
+                        compatible.append(self.__elementBinding.compatibleValue(v))
+                finally:
+                    plural._extendCompatible(compatible)
+            else:
+                plural.extend(values)
+        finally:
+            ctd_instance._extendContent([ basis.ElementContent(_v, self) for _v in plural[start:] ])
+        return plural
+
+    def _extendCompatible (self, ctd_instance, values):
+        """As with L{extend}, but the values are known to be compatible with
+        the element binding, so need not be converted."""
+        plural = self.value(ctd_instance)
+        plural._extendCompatible(values)
+        ctd_instance._extendContent([ basis.ElementContent(_v, self) for _v in values ])
+        return plural
+
     def append (self, ctd_instance, value):
         """Add the given value as another instance of this element within the binding instance.
         @raise pyxb.StructuralBadDocumentError: invoked on an element use that is not plural
@@ -1090,7 +1478,7 @@ class ElementDeclaration (object):
             assert element_binding is not None
             if element_binding.abstract():
                 raise pyxb.AbstractElementError(self, value)
-            element = dom_support.createChildElement(element_binding.name(), parent)
+            element = dom_support.createChildElement(element_binding.name(), parent, component_name=True)
             elt_type = element_binding.typeDefinition()
             val_type = type(value)
             if isinstance(value, basis.complexTypeDefinition):
@@ -1100,10 +1488,10 @@ class ElementDeclaration (object):
                 if isinstance(value, basis.STD_union) and isinstance(value, elt_type._MemberTypes):
                     val_type = elt_type
             if dom_support.requireXSIType() or elt_type._RequireXSIType(val_type):
-                dom_support.addAttribute(element, pyxb.namespace.XMLSchema_instance.createExpandedName('type'), value._ExpandedName)
+                dom_support.addAttribute(element, pyxb.namespace.XMLSchema_instance.createExpandedName('type'), value._ExpandedName, component_name=True)
             value._toDOM_csc(dom_support, element)
         elif isinstance(value, six.string_types):
-            element = dom_support.createChildElement(self.name(), parent)
+            element = dom_support.createChildElement(self.name(), parent, component_name=True)
             element.appendChild(dom_support.document().createTextNode(value))
         elif isinstance(value, _PluralBinding):
             for v in value:
@@ -155,6 +155,11 @@ class decimal (basis.simpleTypeDefinition, python_decimal.Decimal, basis._Repres
             raise SimpleTypeValueError(cls, value)
         return super(decimal, cls)._CheckValidValue(value)
 
+    # Text with no redundant zeros, a fractional part, and at most 28 digits
+    # (not counting sign and point) so normalization under the default
+    # context does not round.
+    _CanonicalLexicalPattern = re.compile(r'(?=-?(\d\.?){1,28}\Z)-?(0|[1-9]\d*)\.(0|\d*[1-9])\Z')
+
     @classmethod
     def XsdLiteral (cls, value):
         (sign, digits, exponent) = value.normalize().as_tuple()
@@ -524,6 +529,10 @@ class dateTime (_PyXBDateTime_base, datetime.datetime):
     _Lexical_fmt = '%Y-%m-%dT%H:%M:%S'
     __CtorFields = ( 'year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond', 'tzinfo' )
 
+    # Text in UTC or with no time zone, and with no trailing zeros in
+    # fractional seconds.
+    _CanonicalLexicalPattern = re.compile(r'\d{4}-\d\d-\d\dT([01]\d|2[0-3]):[0-5]\d:[0-5]\d(\.\d{0,5}[1-9])?Z?\Z')
+
     def __new__ (cls, *args, **kw):
         args = cls._ConvertArguments(args, kw)
 
@@ -834,6 +843,8 @@ class hexBinary (basis.simpleTypeDefinition, six.binary_type):
     _XsdBaseType = anySimpleType
     _ExpandedName = pyxb.namespace.XMLSchema.createExpandedName('hexBinary')
 
+    _CanonicalLexicalPattern = re.compile(r'([0-9A-F]{2})*\Z')
+
     @classmethod
     def _ConvertArguments_vx (cls, args, kw):
         if (1 <= len(args)) and kw.get('_from_xml', False):
@@ -882,6 +893,9 @@ class base64Binary (basis.simpleTypeDefinition, six.binary_type):
     __Pattern = '^((' + _B64S + '{4})*((' + _B64S + '{3}' + _B64 + ')|(' + _B64S + '{2}' + _B16S + '=)|(' + _B64S + _B04S + '= ?=)))?$'
     __Lexical_re = re.compile(__Pattern)
 
+    # The same production, without the optional spaces
+    _CanonicalLexicalPattern = re.compile('(' + _B64 + '{4})*(' + _B64 + '{2}' + _B16 + '=|' + _B64 + _B04 + '==)?\\Z')
+
     __ValidateLength = None
 
     @classmethod
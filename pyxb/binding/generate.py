@@ -317,7 +317,7 @@ def %{name} ():
         if st.subAutomata is not None:
             au_src.append('    sub_automata = []')
             for sa in st.subAutomata:
-                au_src.append('    sub_automata.append(%s)' % (_GenerateAutomaton(sa, template_map, st_id, lines, **kw),))
+                au_src.append('    sub_automata.append(%s())' % (_GenerateAutomaton(sa, template_map, st_id, lines, **kw),))
         if st.finalUpdate is None:
             au_src.append('    final_update = None')
         else:
@@ -346,7 +346,50 @@ def %{name} ():
         au_src.append('    %s._set_transitionSet(transitions)' % (state_map[st],))
     au_src.append('    return fac.Automaton(states, counters, %r, containing_state=%s)' % (automaton.nullable, containing_state))
     lines.extend(au_src)
-    return '%s()' % (name,)
+    return name
+
+def AutomatonIsDeterministic (automaton):
+    """Determine whether content for an automaton can be validated without
+    tracking alternative configurations.
+
+    This holds when the automaton has no sub-automata (from C{xs:all}
+    groups), and no configuration has two transitions that can accept
+    content for the same element: each element name appears at most once
+    in the transitions from any state, and a wildcard is the only
+    transition from any state in which it appears.  The latter is
+    conservative, since members of substitution groups declared in other
+    schemas may fall within the namespace constraint of the wildcard.
+
+    Counter conditions do not affect the result: their update instructions
+    determine whether the unique candidate transition may be taken, but
+    cannot introduce an alternative.
+
+    @param automaton: a L{pyxb.utils.fac.Automaton} built from the term tree
+    of a complex type
+
+    @return: C{True} iff the automaton is deterministic for content
+    associated with an element declaration"""
+    transition_sets = [ automaton.initialTransitions ]
+    for st in automaton.states:
+        if st.subAutomata is not None:
+            return False
+        transition_sets.append(st.transitionSet)
+    for transitions in transition_sets:
+        names = set()
+        for xit in transitions:
+            st = xit.consumingState()
+            if (st is None) or isinstance(st.symbol, xs.structures.ModelGroup):
+                return False
+            (particle, symbol) = st.symbol
+            if isinstance(symbol, xs.structures.Wildcard):
+                if 1 < len(transitions):
+                    return False
+                continue
+            name = symbol.expandedName()
+            if name in names:
+                return False
+            names.add(name)
+    return True
 
 def GenerateAutomaton (ctd, **kw):
     aux = _CTDAuxData.Get(ctd)
@@ -988,11 +1031,15 @@ class %{ctd} (%{superclass}):
 
         auto_defn = GenerateAutomaton(ctd, binding_module=binding_module, **kw)
         if auto_defn is not None:
-            (automaton_ctor, lines) = auto_defn
+            (automaton_builder, lines) = auto_defn
             if lines:
                 outf.postscript().append("\n".join(lines))
                 outf.postscript().append("\n")
-            outf.postscript().append(templates.replaceInText('%{ctd}._Automaton = %{automaton_ctor}\n', ctd=template_map['ctd'], automaton_ctor=automaton_ctor))
+            # The automaton is built when the type is first used
+            outf.postscript().append(templates.replaceInText('%{ctd}._Automaton = pyxb.binding.content.LazyAutomaton(%{automaton_builder})\n', ctd=template_map['ctd'], automaton_builder=automaton_builder))
+            # Always emitted, since a derived type may not share the
+            # property with its base
+            outf.postscript().append(templates.replaceInText('%{ctd}._AutomatonIsDeterministic = %{is_deterministic}\n', ctd=template_map['ctd'], is_deterministic=repr2to3(AutomatonIsDeterministic(aux.automaton))))
             outf.postscript().append("\n")
 
     # Create definitions for all attributes.
@@ -1602,7 +1649,7 @@ class NamespaceModule (_ModuleNaming_mixin):
     __namespaceGroupModule = None
 
     _UniqueInModule = _ModuleNaming_mixin._UniqueInModule.copy()
-    _UniqueInModule.update([ 'CreateFromDOM', 'CreateFromDocument' ])
+    _UniqueInModule.update([ 'CreateFromDOM', 'CreateFromDocument', 'CreateIterFromDocument', 'CreateFromStreamAsync' ])
 
     def namespaceGroupHead (self):
         return self.__namespaceGroupHead
@@ -1681,7 +1728,10 @@ def CreateFromDocument (xml_text, fallback_namespace=None, location_base=None, d
 
     @param xml_text An XML document.  This should be data (Python 2
     str or Python 3 bytes), or a text (Python 2 unicode or Python 3
-    str) in the L{pyxb._InputEncoding} encoding.
+    str) in the L{pyxb._InputEncoding} encoding.  It may also be a
+    path object (e.g. C{pathlib.Path}), a binary file-like object, or
+    a buffer such as C{mmap.mmap}, which is passed to the parser
+    without being copied; see L{pyxb.utils.saxutils.ParseSource}.
 
     @keyword fallback_namespace An absent L{pyxb.Namespace} instance
     to use for unqualified names when there is no default namespace in
@@ -1699,21 +1749,56 @@ def CreateFromDocument (xml_text, fallback_namespace=None, location_base=None, d
     only for absent namespaces.
     """
 
-    if pyxb.XMLStyle_saxer != pyxb._XMLStyle:
+    if pyxb._XMLStyle not in (pyxb.XMLStyle_saxer, pyxb.XMLStyle_expat, pyxb.XMLStyle_lxml):
         dom = pyxb.utils.domutils.StringToDOM(xml_text)
         return CreateFromDOM(dom.documentElement)
     if fallback_namespace is None:
         fallback_namespace = default_namespace
     if fallback_namespace is None:
         fallback_namespace = Namespace.fallbackNamespace()
-    saxer = pyxb.binding.saxer.make_parser(fallback_namespace=fallback_namespace, location_base=location_base)
-    handler = saxer.getContentHandler()
-    xmld = xml_text
-    if isinstance(xmld, %{_TextType}):
-        xmld = xmld.encode(pyxb._InputEncoding)
-    saxer.parse(io.BytesIO(xmld))
-    instance = handler.rootObject()
-    return instance
+    return pyxb.binding.saxer.ParseDocument(xml_text, fallback_namespace=fallback_namespace, location_base=location_base)
+
+def CreateIterFromDocument (xml_source, element, fallback_namespace=None, location_base=None):
+    """Parse the given XML incrementally, generating a Python instance
+    for each occurrence of the given element as it completes.
+
+    Each generated instance has been validated, and is discarded from its
+    parent so the document need not be held in memory.  The document
+    element and other ancestors of the generated instances are not
+    available.
+
+    @param xml_source A file-like object supporting C{read}, or an XML
+    document as accepted by L{CreateFromDocument}.
+
+    @param element The element binding, or a sequence of element
+    bindings, for which instances are generated.
+
+    @keyword fallback_namespace As with L{CreateFromDocument}.
+
+    @keyword location_base As with L{CreateFromDocument}.
+    """
+
+    if fallback_namespace is None:
+        fallback_namespace = Namespace.fallbackNamespace()
+    return pyxb.binding.saxer.IterParse(xml_source, element, fallback_namespace=fallback_namespace, location_base=location_base)
+
+def CreateFromStreamAsync (reader, fallback_namespace=None, location_base=None):
+    """Read an XML document from an C{asyncio.StreamReader} and use the
+    document element to create a Python instance.
+
+    This returns a coroutine, to be awaited from an event loop.  The
+    document is parsed incrementally as it is read.  Requires Python 3.5
+    or later; see L{pyxb.binding.aio.CreateFromStreamAsync}.
+
+    @keyword fallback_namespace As with L{CreateFromDocument}.
+
+    @keyword location_base As with L{CreateFromDocument}.
+    """
+
+    import pyxb.binding.aio
+    if fallback_namespace is None:
+        fallback_namespace = Namespace.fallbackNamespace()
+    return pyxb.binding.aio.CreateFromStreamAsync(reader, fallback_namespace=fallback_namespace, location_base=location_base)
 
 def CreateFromDOM (node, fallback_namespace=None, default_namespace=None):
     """Create a Python instance from the given DOM node.
@@ -17,11 +17,14 @@
 using a SAX parser."""
 
 import logging
+import collections
+import io
 import xml.dom
 import pyxb.namespace
 import pyxb.utils.saxutils
 import pyxb.utils.saxdom
 import pyxb.utils.utility
+from pyxb.utils import six
 from pyxb.binding import basis
 from pyxb.namespace.builtin import XMLSchema_instance as XSI
 
@@ -83,6 +86,15 @@ class _SAXElementState (pyxb.utils.saxutils.SAXElementState):
 
     __domDepth = None
 
+    # True iff the binding instance for this element is to be handed to the
+    # content handler upon completion rather than being stored as content of
+    # the parent element.
+    __isStreamed = False
+
+    # True iff at least one descendant element was streamed, so the content
+    # of this element is known to be incomplete and cannot be validated.
+    __isIncomplete = False
+
     def __init__ (self, **kw):
         super(_SAXElementState, self).__init__(**kw)
         self.__bindingInstance = None
@@ -102,6 +114,26 @@ class _SAXElementState (pyxb.utils.saxutils.SAXElementState):
         """
         self.__enclosingCTD = enclosing_ctd
 
+    def setStreamed (self):
+        """Mark this element as one that is released upon completion.
+
+        The binding instance for a streamed element is validated when the
+        element ends, but is not added to the content of its parent.  The
+        parent, and all its ancestors, are thereafter considered incomplete
+        and are not validated.
+
+        @return: C{self}
+        """
+        self.__isStreamed = True
+        return self
+
+    def isStreamed (self):
+        """C{True} iff L{setStreamed} has been invoked on this state."""
+        return self.__isStreamed
+
+    def _noteIncomplete (self):
+        self.__isIncomplete = True
+
     # Create the binding instance for this element.
     def __constructElement (self, new_object_factory, attrs, content=None):
         kw = { '_from_xml' : True,
@@ -231,17 +263,29 @@ class _SAXElementState (pyxb.utils.saxutils.SAXElementState):
             finally:
                 pyxb.namespace.NamespaceContext.PopContext()
         else:
+            kw = { }
+            if self.__isIncomplete:
+                # Streamed descendants have been removed, so the content
+                # model cannot be satisfied.  Store what remains without
+                # stepping the automaton.
+                kw['_require_validation'] = False
             for info in self.content():
                 self.__bindingInstance.append(info.item,
                                               _element_decl=info.element_decl,
                                               _maybe_element=info.maybe_element,
-                                              _location=info.location)
+                                              _location=info.location,
+                                              **kw)
         parent_state = self.parentState()
         if parent_state is not None:
-            parent_state.addElementContent(self.location(), self.__bindingInstance, self.__elementDecl)
+            if self.__isStreamed or self.__isIncomplete:
+                parent_state._noteIncomplete()
+            if not self.__isStreamed:
+                parent_state.addElementContent(self.location(), self.__bindingInstance, self.__elementDecl)
         # As CreateFromDOM does, validate the resulting element
         if self.__bindingInstance._element() is None:
             self.__bindingInstance._setElement(self.__elementBinding)
+        if self.__isIncomplete:
+            return self.__bindingInstance
         return self.__bindingInstance._postDOMValidate()
 
 class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
@@ -259,6 +303,16 @@ class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
       saxer.parse(io.StringIO(xmlt))
       instance = handler.rootObject()
 
+    The handler may also be configured with a set of I{stream elements}.
+    Instances of these elements are validated when the element ends, then
+    queued for retrieval through L{completedObjects} instead of being stored
+    in their parent.  This allows a document that is processed
+    incrementally (using the C{feed} method of the parser) to be consumed
+    without holding the entire binding tree in memory; see L{IterParse}.
+
+    The handler may also be configured with a I{projection} that selects the
+    parts of the document for which bindings are created; see
+    L{setProjection}.
     """
 
     # Whether invocation of handler methods should be traced
@@ -278,11 +332,20 @@ class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
         L{basis.complexTypeDefinition}.
 
         @raise pyxb.[UnrecognizedDOMRootNodeError: No binding could be found to
-        match the top-level element in the document."""
+        match the top-level element in the document.
+
+        @raise pyxb.UsageError: The projection excluded the top-level element
+        in the document."""
+        if self.__ignoredRootName is not None:
+            raise pyxb.UsageError('Projection %r excludes document element %s' % (self.__projectionArgument, self.__ignoredRootName))
         if not isinstance(self.__rootObject, basis._TypeBinding_mixin):
             # Happens if the top-level element got processed as a DOM instance.
             assert isinstance(self.__rootObject, xml.dom.Node)
             raise pyxb.UnrecognizedDOMRootNodeError(self.__rootObject)
+        if self.__contentOmitted:
+            # Projection or streaming removed content, so the instance
+            # cannot be expected to validate.
+            return self.__rootObject
         return self.__rootObject._postDOMValidate()
     __rootObject = None
 
@@ -294,6 +357,12 @@ class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
         """
         super(PyXBSAXHandler, self).reset()
         self.__rootObject = None
+        self.__completedObjects = collections.deque()
+        self.__contentOmitted = False
+        self.__ignoredRootName = None
+        self.__projectionStack = None
+        if isinstance(self.__projection, dict):
+            self.__projectionStack = [ self.__projection ]
         return self
 
     def __init__ (self, **kw):
@@ -302,14 +371,168 @@ class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
         @keyword element_state_constructor: Overridden with the value
         L{_SAXElementState} before invoking the L{superclass
         constructor<pyxb.utils.saxutils.BaseSAXHandler.__init__>}.
+
+        @keyword stream_elements: Optional value passed to
+        L{setStreamElements}.
         """
 
         kw.setdefault('element_state_constructor', _SAXElementState)
+        stream_elements = kw.pop('stream_elements', None)
+        projection = kw.pop('projection', None)
         super(PyXBSAXHandler, self).__init__(**kw)
+        self.setStreamElements(stream_elements)
+        self.setProjection(projection)
         self.reset()
 
+    # None, a callable that accepts an ExpandedName, or a dictionary
+    # representing a tree of element paths.  In the tree, keys are SAX name
+    # tuples and values are either a dictionary for the next level of the
+    # path, or None if the entire subtree is retained.
+    __projection = None
+
+    # For a projection tree, the tree nodes corresponding to the currently
+    # open elements, with the root of the tree at the bottom.
+    __projectionStack = None
+
+    # The projection as provided to setProjection, for diagnostics.
+    __projectionArgument = None
+
+    # True iff elements were omitted from the document by projection or
+    # streaming, leaving their ancestors incomplete.
+    __contentOmitted = False
+
+    # The ExpandedName of the document element if it was excluded by the
+    # projection, otherwise None.
+    __ignoredRootName = None
+
+    def setProjection (self, projection):
+        """Restrict processing to selected parts of the document.
+
+        Elements outside the projection are ignored along with all their
+        content: no state, binding lookup, binding instance, content model
+        step, or DOM node is created for them.  The content of the elements
+        that enclose ignored elements is incomplete, so they are not
+        validated, and neither is the object returned by L{rootObject}.
+
+        @param projection: C{None} to process the whole document.
+        Otherwise, either:
+         - a callable which is asked about each element, being passed its
+           L{pyxb.namespace.ExpandedName}.  An element for which it returns
+           C{False} is skipped along with everything inside it; the
+           callable is not asked about elements within a skipped element; or
+         - an iterable of element paths.  Each path is a sequence of names
+           starting with the document element, where each name is a
+           L{pyxb.namespace.ExpandedName}, a L{basis.element} instance, or a
+           string for a name with no namespace.  An element is processed if
+           its path is a prefix of some projection path (it encloses a
+           selected element), or some projection path is a prefix of its path
+           (it is within a selected element).
+        @return: C{self}
+        """
+        if (projection is None) or six.callable(projection):
+            self.__projectionArgument = self.__projection = projection
+            return self
+        projection = self.__projectionArgument = list(projection)
+        tree = { }
+        for path in projection:
+            node = tree
+            keys = []
+            for name in path:
+                if isinstance(name, basis.element):
+                    name = name.name()
+                keys.append(pyxb.namespace.ExpandedName(name).uriTuple())
+            if 0 == len(keys):
+                raise pyxb.UsageError('Empty element path in projection')
+            for key in keys[:-1]:
+                if (key in node) and (node[key] is None):
+                    # An enclosing element is already completely retained
+                    node = None
+                    break
+                node = node.setdefault(key, { })
+            if node is not None:
+                node[keys[-1]] = None
+        self.__projection = tree
+        return self
+
+    def _ignoreElement (self, name):
+        projection = self.__projection
+        if projection is None:
+            return False
+        if isinstance(projection, dict):
+            node = self.__projectionStack[-1]
+            if node is not None:
+                if name not in node:
+                    ignore = True
+                else:
+                    ignore = False
+                    node = node[name]
+            else:
+                ignore = False
+            if not ignore:
+                self.__projectionStack.append(node)
+        else:
+            ignore = not projection(pyxb.namespace.ExpandedName(name, fallback_namespace=self.fallbackNamespace()))
+        if ignore:
+            self.__contentOmitted = True
+            if self.elementState().parentState() is None:
+                self.__ignoredRootName = pyxb.namespace.ExpandedName(name, fallback_namespace=self.fallbackNamespace())
+            self.elementState()._noteIncomplete()
+        return ignore
+
+    # A set of ExpandedName instances identifying elements that are released
+    # upon completion, or None if all elements are retained in the tree.
+    __streamElementNames = None
+
+    # The binding instances for stream elements that have completed but have
+    # not yet been retrieved through completedObjects.
+    __completedObjects = None
+
+    def setStreamElements (self, elements):
+        """Identify the elements that are released as they complete.
+
+        @param elements: C{None} to disable streaming, or an element or
+        expanded name, or an iterable of these.  An element is a
+        L{basis.element} instance, such as a top-level element in a binding
+        module; it is identified by its name, so local elements with the same
+        name also match.
+        @return: C{self}
+        """
+        if elements is None:
+            self.__streamElementNames = None
+            return self
+        if isinstance(elements, (basis.element, pyxb.namespace.ExpandedName)):
+            elements = [ elements ]
+        names = set()
+        for elt in elements:
+            if isinstance(elt, basis.element):
+                elt = elt.name()
+            names.add(pyxb.namespace.ExpandedName(elt))
+        self.__streamElementNames = frozenset(names)
+        return self
+
+    def streamElementNames (self):
+        """The set of L{pyxb.namespace.ExpandedName}s of stream elements, or
+        C{None} if all elements are retained in the tree."""
+        return self.__streamElementNames
+
+    def completedObjects (self):
+        """Return the stream element instances completed since the last call.
+
+        Each instance is returned exactly once, in document order of element
+        completion.
+
+        @return: A list of L{basis._TypeBinding_mixin} instances
+        """
+        rv = list(self.__completedObjects)
+        self.__completedObjects.clear()
+        return rv
+
     def startElementNS (self, name, qname, attrs):
-        (this_state, parent_state, ns_ctx, name_en) = super(PyXBSAXHandler, self).startElementNS(name, qname, attrs)
+        rv = super(PyXBSAXHandler, self).startElementNS(name, qname, attrs)
+        if rv is None:
+            # Element is outside the projection
+            return
+        (this_state, parent_state, ns_ctx, name_en) = rv
 
         # Delegate processing if in DOM mode
         if this_state.inDOMMode():
@@ -367,6 +590,8 @@ class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
 
         # Process the element start.  This may or may not return a
         # binding object.
+        if (self.__streamElementNames is not None) and (name_en in self.__streamElementNames):
+            this_state.setStreamed()
         binding_object = this_state.startBindingElement(type_class, new_object_factory, element_decl, attrs)
 
         # If the top-level element has complex content, this sets the
@@ -376,6 +601,11 @@ class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
 
     def endElementNS (self, name, qname):
         this_state = super(PyXBSAXHandler, self).endElementNS(name, qname)
+        if this_state is None:
+            # Element is outside the projection
+            return
+        if self.__projectionStack is not None:
+            self.__projectionStack.pop()
         if this_state.inDOMMode():
             # Delegate processing if in DOM mode.  Note that completing this
             # element may take us out of DOM mode.  In any case, the returned
@@ -386,6 +616,9 @@ class PyXBSAXHandler (pyxb.utils.saxutils.BaseSAXHandler):
             # either the one created at the start or the one created at
             # the end.
             binding_object = this_state.endBindingElement()
+            if this_state.isStreamed():
+                self.__contentOmitted = True
+                self.__completedObjects.append(binding_object)
         assert binding_object is not None
 
         # If we don't have a root object, save it.  No, there is not a
@@ -408,6 +641,192 @@ def make_parser (*args, **kw):
     kw.setdefault('content_handler_constructor', PyXBSAXHandler)
     return pyxb.utils.saxutils.make_parser(*args, **kw)
 
+ParserPoolLimit = 4
+"""The maximum number of idle parsers that L{ParseDocument} retains for
+each parser configuration."""
+
+# Map from parser configuration keys to lists of idle parsers.
+__ParserPool = { }
+
+def _ParserPoolKey (fallback_namespace):
+    """The key identifying the configuration of parsers in the pool used by
+    L{ParseDocument}."""
+    create_parser_modules = pyxb.utils.saxutils._CreateParserModules
+    if create_parser_modules is not None:
+        create_parser_modules = tuple(create_parser_modules)
+    return (pyxb._XMLStyle, pyxb._LocationCapture, fallback_namespace, create_parser_modules)
+
+def ParseDocument (source, fallback_namespace=None, location_base=None):
+    """Create the binding instance for a document using a pooled parser.
+
+    Creating a SAX parser and L{PyXBSAXHandler} is costly relative to
+    processing a small document.  This function takes an idle parser
+    configured for the current XML style, location capture policy, and
+    C{fallback_namespace} from a pool, creating one if none is available.
+    When the document has been processed the handler is
+    L{reset<PyXBSAXHandler.reset>} so it does not retain the bindings, and
+    the parser is returned to the pool.  A parser is never shared by two
+    documents at once, so this may be invoked concurrently from multiple
+    threads, and re-entrantly.  A parser is discarded rather than returned
+    to the pool if processing of its document fails.
+
+    This is used by the C{CreateFromDocument} function of generated
+    binding modules.
+
+    @param source: The document, in any form accepted by
+    L{pyxb.utils.saxutils.ParseSource}.
+
+    @keyword fallback_namespace: Passed to L{make_parser}.
+
+    @keyword location_base: The base for locations recorded for the
+    document; see L{pyxb.utils.saxutils.BaseSAXHandler.setLocationBase}.
+
+    @return: The binding instance for the document element; see
+    L{PyXBSAXHandler.rootObject}.
+    """
+    idle = __ParserPool.setdefault(_ParserPoolKey(fallback_namespace), [])
+    try:
+        saxer = idle.pop()
+    except IndexError:
+        saxer = make_parser(fallback_namespace=fallback_namespace)
+    handler = saxer.getContentHandler()
+    handler.setLocationBase(location_base)
+    pyxb.utils.saxutils.ParseSource(saxer, source)
+    instance = handler.rootObject()
+    handler.reset()
+    if len(idle) < ParserPoolLimit:
+        idle.append(saxer)
+    return instance
+
+class BindingPushParser (object):
+    """A push-style parser that creates bindings from a document delivered
+    in pieces.
+
+    The document content is provided through successive calls to L{feed}, as
+    it becomes available from a socket, message queue, or other source.
+    Each piece is passed immediately to the incremental SAX parser, so the
+    document as a whole is never buffered.  An example::
+
+      import pyxb.binding.saxer
+      import mybindings
+
+      parser = pyxb.binding.saxer.BindingPushParser(mybindings)
+      for chunk in chunks:
+          parser.feed(chunk)
+      instance = parser.close()
+
+    If stream elements are provided, their instances are made available
+    through L{completedObjects} as each one ends; see
+    L{PyXBSAXHandler.setStreamElements}.
+
+    After L{close} the parser may be used for another document.
+    """
+
+    # The xml.sax parser that processes the document
+    __saxer = None
+
+    # The PyXBSAXHandler instance that receives events from __saxer
+    __handler = None
+
+    def __init__ (self, module=None, stream_elements=None, **kw):
+        """Create a push parser.
+
+        @param module: Optional generated binding module.  If provided, and
+        no C{fallback_namespace} keyword is given, the fallback namespace is
+        taken from the module as in its C{CreateFromDocument} function.
+
+        @keyword stream_elements: Optional value passed to
+        L{PyXBSAXHandler.setStreamElements}.
+
+        Remaining keywords are passed to L{make_parser}.
+        """
+        if (module is not None) and (kw.get('fallback_namespace') is None):
+            kw['fallback_namespace'] = module.Namespace.fallbackNamespace()
+        kw['stream_elements'] = stream_elements
+        self.__saxer = make_parser(**kw)
+        self.__handler = self.__saxer.getContentHandler()
+
+    def contentHandler (self):
+        """The L{PyXBSAXHandler} instance used by this parser."""
+        return self.__handler
+
+    def feed (self, data):
+        """Provide the next piece of the document.
+
+        @param data: Document content as data (Python 2 str or Python 3
+        bytes), or as text which is encoded using L{pyxb._InputEncoding}.
+        @return: C{self}
+        """
+        if isinstance(data, six.text_type):
+            data = data.encode(pyxb._InputEncoding)
+        self.__saxer.feed(data)
+        return self
+
+    def completedObjects (self):
+        """Return the stream element instances completed since the last call.
+
+        @return: A list of L{basis._TypeBinding_mixin} instances, which is
+        empty if no stream elements were provided.
+        """
+        return self.__handler.completedObjects()
+
+    def close (self):
+        """Mark the end of the document.
+
+        @return: The binding instance for the document element, or C{None}
+        if stream elements were provided (the document element is then
+        incomplete).  Stream element instances not yet retrieved remain
+        available through L{completedObjects}.
+        @raise pyxb.UnrecognizedDOMRootNodeError: No binding could be found to
+        match the top-level element in the document.
+        """
+        self.__saxer.close()
+        if self.__handler.streamElementNames() is not None:
+            return None
+        return self.__handler.rootObject()
+
+def IterParse (source, elements, chunk_size=65536, **kw):
+    """Generate binding instances for selected elements as they complete.
+
+    The document is fed to a L{BindingPushParser} incrementally.  Each time
+    an instance of one of the C{elements} ends, the corresponding binding
+    instance is validated and yielded, and is not retained in its parent.
+    Memory use is therefore bounded by the size of the largest yielded
+    instance rather than the size of the document.
+
+    Ancestors of the yielded instances are necessarily incomplete, and are
+    neither validated nor returned.
+
+    @param source: The document.  This may be a file-like object supporting
+    C{read}, or the document content as data (Python 2 str or Python 3
+    bytes) or text.  Text is encoded using L{pyxb._InputEncoding}.
+
+    @param elements: The element or elements to be yielded; see
+    L{PyXBSAXHandler.setStreamElements}.
+
+    @keyword chunk_size: The number of bytes or characters read from
+    C{source} for each call to the parser C{feed} method.
+
+    Remaining keywords are passed to L{make_parser}.
+
+    @return: A generator of L{basis._TypeBinding_mixin} instances
+    """
+    parser = BindingPushParser(stream_elements=elements, **kw)
+    if isinstance(source, six.text_type):
+        source = source.encode(pyxb._InputEncoding)
+    if isinstance(source, six.binary_type):
+        source = io.BytesIO(source)
+    while True:
+        data = source.read(chunk_size)
+        if not data:
+            break
+        parser.feed(data)
+        for instance in parser.completedObjects():
+            yield instance
+    parser.close()
+    for instance in parser.completedObjects():
+        yield instance
+
 ## Local Variables:
 ## fill-column:78
 ## End:
@@ -0,0 +1,649 @@
+# -*- coding: utf-8 -*-
+# Copyright 2009-2013, Peter A. Bigot
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain a
+# copy of the License at:
+#
+#            http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""This module contains support for writing binding instances as XML without
+creating a DOM instance.
+
+The binding is traversed in the same way as
+L{pyxb.binding.basis._TypeBinding_mixin.toDOM}, producing a sequence of
+events that are written directly to their destination.  Element and attribute
+names are produced by a L{pyxb.utils.domutils.BindingDOMSupport} instance, so
+the document is the same as the one L{toxml
+<pyxb.binding.basis._TypeBinding_mixin.toxml>} would create.
+
+XML Namespace declarations are placed on the document element, as they are
+in documents created through the DOM.  Since that element is written before
+its content, the binding is traversed once without formatting values to
+determine which namespaces are referenced, then again to write the document.
+
+The same events can be written in the canonical form used in XML Signature
+(see L{Canonicalize}), without formatting the document and parsing it again.
+"""
+
+import logging
+import os
+import xml.dom
+import xml.sax.xmlreader
+import pyxb
+import pyxb.namespace
+from pyxb.namespace.builtin import XMLSchema_instance as XSI
+from pyxb.binding import basis, content
+from pyxb.utils import domutils, six
+
+_log = logging.getLogger(__name__)
+
+DefaultChunkSize = 65536
+"""The default number of characters collected before data is passed to its
+destination."""
+
+DefaultBlockSize = 256
+"""The default minimum number of children of the document element that
+L{ParallelDocument} passes to a worker process as a unit."""
+
+# Event types.  A start-element event is followed by the qualified name of
+# the element and a list of (qualified name, text) pairs for its attributes;
+# an end-element event by the qualified name of the element; text and
+# comment events by the text.
+StartElement = 1
+EndElement = 2
+Text = 3
+Comment = 4
+
+class _AttributeList (object):
+    """Stand-in for a DOM element that records the attributes that
+    L{pyxb.utils.domutils.BindingDOMSupport.addAttribute} would add to it."""
+
+    def __init__ (self):
+        self.attributes = []
+
+    def setAttributeNS (self, ns_uri, name, value):
+        for (ai, (an, av)) in enumerate(self.attributes):
+            if an == name:
+                self.attributes[ai] = (name, value)
+                return
+        self.attributes.append((name, value))
+
+class _Walker (object):
+    """Generate the events for a binding instance.
+
+    The methods of this class follow the structure of the C{toDOM} and
+    C{_toDOM_csc} methods of the binding classes and
+    L{pyxb.binding.content.ElementDeclaration}, so that names are requested
+    from the L{pyxb.utils.domutils.BindingDOMSupport} instance in the same
+    order, and are assigned the same prefixes."""
+
+    def __init__ (self, bds, names_only=False):
+        self.__bds = bds
+        self.__namesOnly = names_only
+
+    def __text (self, value):
+        # When only the names are of interest the lexical representation is
+        # required only for values that might reference a namespace.
+        if self.__namesOnly and not isinstance(value, (pyxb.namespace.ExpandedName, basis.STD_list)):
+            return ''
+        return self.__bds.valueAsText(value)
+
+    def __elementName (self, expanded_name):
+        if expanded_name.namespace() is None:
+            return expanded_name.localName()
+        return self.__bds.qnameAsText(expanded_name, component_name=True)
+
+    def document (self, instance, element_name=None, order=None):
+        """Generate the events for the instance as the document element, or
+        as a wildcard element with its own element binding.
+
+        If C{order} is provided it replaces the sequence of children of an
+        instance with element or mixed content."""
+        bds = self.__bds
+        need_xsi_type = bds.requireXSIType()
+        if isinstance(element_name, six.string_types):
+            element_name = pyxb.namespace.ExpandedName(bds.defaultNamespace(), element_name)
+        if (element_name is None) and (instance._element() is not None):
+            element_binding = instance._element()
+            element_name = element_binding.name()
+            need_xsi_type = need_xsi_type or element_binding.typeDefinition()._RequireXSIType(type(instance))
+        if element_name is None:
+            raise pyxb.UnboundElementError(instance)
+        return self.__binding(element_name, instance, need_xsi_type, order)
+
+    def __binding (self, element_name, value, need_xsi_type, order=None):
+        bds = self.__bds
+        name = self.__elementName(element_name)
+        attributes = _AttributeList()
+        if need_xsi_type:
+            bds.addAttribute(attributes, XSI.type, value._ExpandedName, component_name=True)
+        text = None
+        children = ()
+        if isinstance(value, basis.complexTypeDefinition):
+            value._setDOMFromAttributes(bds, attributes)
+            if value._isNil() or (value._CT_EMPTY == value._ContentTypeTag):
+                pass
+            elif value._CT_SIMPLE == value._ContentTypeTag:
+                if value.value() is None:
+                    raise pyxb.SimpleContentAbsentError(value, value._location())
+                text = self.__text(value.value())
+            elif order is None:
+                children = value._childrenForSerialization()
+            else:
+                children = order
+        else:
+            text = self.__text(value)
+        if value._isNil():
+            bds.addAttribute(attributes, XSI.nil, 'true', component_name=True)
+        yield (StartElement, name, attributes.attributes)
+        if text is not None:
+            yield (Text, text)
+        for content_ in children:
+            assert id(content_.value) != id(value)
+            for ev in self.content(content_):
+                yield ev
+        yield (EndElement, name)
+
+    def content (self, content_):
+        """Generate the events for a L{pyxb.binding.basis.ElementContent} or
+        L{pyxb.binding.basis.NonElementContent} instance."""
+        if isinstance(content_, basis.NonElementContent):
+            return iter([ (Text, self.__text(content_.value)) ])
+        if content_.elementDeclaration is None:
+            if isinstance(content_.value, xml.dom.Node):
+                return self.__domNode(content_.value)
+            return self.document(content_.value)
+        return self.__declaration(content_.elementDeclaration, content_.value)
+
+    def __declaration (self, element_decl, value):
+        if isinstance(value, basis._TypeBinding_mixin):
+            element_binding = element_decl.elementBinding()
+            if value._substitutesFor(element_binding):
+                element_binding = value._element()
+            assert element_binding is not None
+            if element_binding.abstract():
+                raise pyxb.AbstractElementError(element_decl, value)
+            elt_type = element_binding.typeDefinition()
+            val_type = type(value)
+            if isinstance(value, basis.complexTypeDefinition):
+                if not (isinstance(value, elt_type) or elt_type._RequireXSIType(val_type)):
+                    raise pyxb.LogicError('toDOM with implicit value type %s unrecoverable from %s' % (type(value), elt_type))
+            else:
+                if isinstance(value, basis.STD_union) and isinstance(value, elt_type._MemberTypes):
+                    val_type = elt_type
+            need_xsi_type = self.__bds.requireXSIType() or elt_type._RequireXSIType(val_type)
+            return self.__binding(element_binding.name(), value, need_xsi_type)
+        if isinstance(value, six.string_types):
+            name = self.__elementName(element_decl.name())
+            return iter([ (StartElement, name, []), (Text, value), (EndElement, name) ])
+        if isinstance(value, content._PluralBinding):
+            return self.__plural(element_decl, value)
+        raise pyxb.LogicError('toDOM with unrecognized value type %s: %s' % (type(value), value))
+
+    def __plural (self, element_decl, values):
+        for v in values:
+            for ev in self.__declaration(element_decl, v):
+                yield ev
+
+    def __domNode (self, node):
+        # Follows pyxb.utils.domutils.BindingDOMSupport._deepClone
+        bds = self.__bds
+        if node.ELEMENT_NODE == node.nodeType:
+            (ns_uri, name) = bds._makeURINodeNamePair(node)
+            attributes = _AttributeList()
+            attrs = node.attributes
+            for ai in six.moves.xrange(attrs.length):
+                attr = attrs.item(ai)
+                attributes.setAttributeNS(None, bds._makeURINodeNamePair(attr)[1], attr.value)
+            yield (StartElement, name, attributes.attributes)
+            for child in node.childNodes:
+                for ev in self.__domNode(child):
+                    yield ev
+            yield (EndElement, name)
+        elif node.TEXT_NODE == node.nodeType:
+            yield (Text, node.data)
+        elif node.COMMENT_NODE == node.nodeType:
+            yield (Comment, node.data)
+        elif node.CDATA_SECTION_NODE == node.nodeType:
+            if not isinstance(node.nodeValue, six.string_types):
+                raise ValueError('DOM node from non-text CDATA not supported in clone', node.nodeValue)
+            yield (Text, node.data)
+        else:
+            raise ValueError('DOM node not supported in clone', node)
+
+def _DocumentEvents (instance, bds, element_name):
+    # Traverse the binding once to determine the namespaces it references,
+    # then return the generator of its events.  On return
+    # bds.namespaceDeclarations() describes the namespaces used in the
+    # document.
+    for _ev in _Walker(bds, names_only=True).document(instance, element_name):
+        pass
+    return _Walker(bds).document(instance, element_name)
+
+def _DeclareNamespaces (bds, event):
+    # Add the XML Namespace declarations required by the document to the
+    # start event of its document element.
+    (kind, name, attributes) = event
+    assert StartElement == kind
+    for (ns, pfx) in bds.namespaceDeclarations():
+        if pfx:
+            an = 'xmlns:' + pfx
+        else:
+            an = 'xmlns'
+        attributes = [ _a for _a in attributes if _a[0] != an ]
+        attributes.append((an, ns.uri()))
+    return (kind, name, attributes)
+
+def Events (instance, bds=None, element_name=None):
+    """Generate the events describing a binding instance as an XML
+    document.
+
+    @param instance: A L{pyxb.binding.basis._TypeBinding_mixin} instance.
+
+    @keyword bds: Optional L{pyxb.utils.domutils.BindingDOMSupport} instance
+    that determines the namespace prefixes.  If not provided, a new generic
+    one is created.
+
+    @keyword element_name: As with L{pyxb.binding.basis._TypeBinding_mixin.toDOM}.
+
+    @return: A generator of tuples, each of which begins with one of
+    L{StartElement}, L{EndElement}, L{Text}, or L{Comment}.  The attributes
+    of the first event include the XML Namespace declarations required by the
+    document.
+    """
+    if bds is None:
+        bds = domutils.BindingDOMSupport()
+    events = _DocumentEvents(instance, bds, element_name)
+    yield _DeclareNamespaces(bds, next(events))
+    for ev in events:
+        yield ev
+
+def _Escape (text):
+    # The same characters that xml.dom.minidom replaces in both text and
+    # attribute values.
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;').replace('>', '&gt;')
+
+def TextPieces (events):
+    """Convert events to the text of the document they describe.
+
+    The text is formatted as C{xml.dom.minidom} formats a document.
+
+    @param events: A sequence of events as produced by L{Events}
+    @return: A generator of text strings.
+    """
+    open_tag = False
+    for ev in events:
+        kind = ev[0]
+        if open_tag and (EndElement != kind):
+            yield '>'
+        if StartElement == kind:
+            parts = [ '<', ev[1] ]
+            for (an, av) in ev[2]:
+                parts.extend((' ', an, '="', _Escape(av), '"'))
+            yield ''.join(parts)
+            open_tag = True
+            continue
+        if EndElement == kind:
+            if open_tag:
+                yield '/>'
+            else:
+                yield '</%s>' % (ev[1],)
+        elif Text == kind:
+            yield _Escape(ev[1])
+        elif Comment == kind:
+            yield '<!--%s-->' % (ev[1],)
+        open_tag = False
+
+def Chunks (instance, encoding='utf-8', chunk_size=DefaultChunkSize, bds=None, root_only=False, element_name=None):
+    """Generate an XML document for a binding instance in pieces.
+
+    Each piece is produced as soon as the traversal of the binding has
+    generated C{chunk_size} characters, so it may be slightly larger.  The
+    last piece may be smaller.
+
+    @param instance: A L{pyxb.binding.basis._TypeBinding_mixin} instance.
+
+    @param encoding: The encoding of the document.  The pieces are C{bytes}
+    unless this is C{None}, in which case they are text.
+
+    @keyword chunk_size: The number of characters collected before a piece
+    is produced.
+
+    Remaining keywords are as with
+    L{pyxb.binding.basis._TypeBinding_mixin.toxml}.
+    """
+    pieces = []
+    if not root_only:
+        if encoding:
+            pieces.append('<?xml version="1.0" encoding="%s"?>' % (encoding,))
+        else:
+            pieces.append('<?xml version="1.0" ?>')
+    length = 0
+    for piece in TextPieces(Events(instance, bds, element_name)):
+        pieces.append(piece)
+        length += len(piece)
+        if length >= chunk_size:
+            chunk = ''.join(pieces)
+            if encoding is not None:
+                chunk = chunk.encode(encoding, 'xmlcharrefreplace')
+            yield chunk
+            pieces = []
+            length = 0
+    if pieces:
+        chunk = ''.join(pieces)
+        if encoding is not None:
+            chunk = chunk.encode(encoding, 'xmlcharrefreplace')
+        yield chunk
+
+def WriteStream (instance, fileobj, encoding='utf-8', chunk_size=DefaultChunkSize, **kw):
+    """Write a binding instance to a file as an XML document.
+
+    @param instance: A L{pyxb.binding.basis._TypeBinding_mixin} instance.
+
+    @param fileobj: An object with a C{write} method.  This receives
+    C{bytes} unless C{encoding} is C{None}, in which case it receives text.
+
+    @param encoding: The encoding of the document.
+
+    @keyword chunk_size: As with L{Chunks}.
+
+    Remaining keywords are as with
+    L{pyxb.binding.basis._TypeBinding_mixin.toxml}.
+    """
+    for chunk in Chunks(instance, encoding, chunk_size, **kw):
+        fileobj.write(chunk)
+
+def WriteEvents (instance, handler, bds=None, element_name=None):
+    """Emit a binding instance as SAX events.
+
+    Element and attribute names are passed as qualified names to
+    C{startElement} and C{endElement}; XML Namespace declarations are
+    attributes of the document element.  Comments from wildcard DOM content
+    are not passed to the handler.
+
+    @param instance: A L{pyxb.binding.basis._TypeBinding_mixin} instance.
+
+    @param handler: An C{xml.sax.handler.ContentHandler} instance, such as
+    C{xml.sax.saxutils.XMLGenerator}.
+
+    Remaining keywords are as with L{Events}.
+    """
+    handler.startDocument()
+    for ev in Events(instance, bds, element_name):
+        kind = ev[0]
+        if StartElement == kind:
+            handler.startElement(ev[1], xml.sax.xmlreader.AttributesImpl(dict(ev[2])))
+        elif EndElement == kind:
+            handler.endElement(ev[1])
+        elif Text == kind:
+            if ev[1]:
+                handler.characters(ev[1])
+    handler.endDocument()
+
+# The state shared by the worker processes of ParallelDocument: the children
+# of the document element, and the configuration of the
+# BindingDOMSupport instances used to write them.
+_ParallelState = None
+
+def _ParallelInitialize (state):
+    global _ParallelState
+    _ParallelState = state
+
+def _ParallelBlock (bounds):
+    (order, default_namespace, require_xsi_type, namespace_prefix_map, encoding) = _ParallelState
+    # Every namespace used in the document is in the map, so the names are
+    # the same as those the document element was written with.
+    bds = domutils.BindingDOMSupport(default_namespace=default_namespace, require_xsi_type=require_xsi_type, namespace_prefix_map=namespace_prefix_map)
+    walker = _Walker(bds)
+    pieces = []
+    for content_ in order[bounds[0]:bounds[1]]:
+        pieces.extend(TextPieces(walker.content(content_)))
+    text = ''.join(pieces)
+    if encoding is not None:
+        text = text.encode(encoding, 'xmlcharrefreplace')
+    return text
+
+def _ForkContext ():
+    # The worker processes must inherit the binding instance, which is not
+    # generally picklable.
+    import multiprocessing
+    if not hasattr(multiprocessing, 'get_context'):
+        if 'posix' == os.name:
+            return multiprocessing
+        return None
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+def ParallelDocument (instance, processes, encoding=None, bds=None, root_only=False, element_name=None, block_size=DefaultBlockSize):
+    """Write a binding instance as an XML document using multiple processes.
+
+    The children of the document element are divided into blocks of
+    consecutive elements, which are written by a pool of worker processes
+    and concatenated in order.  The namespace prefixes are determined before
+    the pool is created, by a traversal of the entire binding that does not
+    format values, and all workers use the same prefixes.  The result is the
+    same as would be returned by L{toxml
+    <pyxb.binding.basis._TypeBinding_mixin.toxml>}.
+
+    This is useful only for documents with many children of the document
+    element, such as a long sequence of feature members.  If the document
+    element has fewer than twice C{block_size} children, or worker processes
+    cannot be created by forking the current process, the document is
+    written by the current process.
+
+    @param instance: A L{pyxb.binding.basis._TypeBinding_mixin} instance.
+
+    @param processes: The number of worker processes.
+
+    @param encoding: The encoding of the document.  The result is C{bytes}
+    unless this is C{None}, in which case it is text.
+
+    @keyword block_size: The minimum number of children in a block.
+
+    Remaining keywords are as with
+    L{pyxb.binding.basis._TypeBinding_mixin.toxml}.
+    """
+    if bds is None:
+        bds = domutils.BindingDOMSupport()
+    order = ()
+    if isinstance(instance, basis.complexTypeDefinition) and not instance._isNil() \
+            and (instance._ContentTypeTag in (instance._CT_ELEMENT_ONLY, instance._CT_MIXED)):
+        order = instance._childrenForSerialization()
+    num_blocks = min(4 * processes, len(order) // block_size)
+    context = None
+    if (1 < processes) and (1 < num_blocks):
+        context = _ForkContext()
+    if context is None:
+        if encoding is None:
+            return ''.join(Chunks(instance, encoding, bds=bds, root_only=root_only, element_name=element_name))
+        return six.b('').join(Chunks(instance, encoding, bds=bds, root_only=root_only, element_name=element_name))
+    for _ev in _Walker(bds, names_only=True).document(instance, element_name, order):
+        pass
+    (start, end) = _Walker(bds).document(instance, element_name, ())
+    pieces = []
+    if not root_only:
+        if encoding:
+            pieces.append('<?xml version="1.0" encoding="%s"?>' % (encoding,))
+        else:
+            pieces.append('<?xml version="1.0" ?>')
+    pieces.extend(TextPieces([_DeclareNamespaces(bds, start)]))
+    pieces.append('>')
+    head = ''.join(pieces)
+    tail = '</%s>' % (end[1],)
+    namespace_prefix_map = { }
+    for (ns, pfx) in bds.namespaceDeclarations():
+        if pfx and (pfx not in ('xml', 'xmlns')):
+            namespace_prefix_map[pfx] = ns
+    # Encodings that begin with a byte order mark cannot be concatenated
+    block_encoding = encoding
+    if (encoding is not None) and (0 < len(six.u('').encode(encoding))):
+        block_encoding = None
+    state = (order, bds.defaultNamespace(), bds.requireXSIType(), namespace_prefix_map, block_encoding)
+    bounds = [ ((_i * len(order)) // num_blocks, ((_i + 1) * len(order)) // num_blocks) for _i in six.moves.range(num_blocks) ]
+    pool = context.Pool(processes, _ParallelInitialize, (state,))
+    try:
+        blocks = pool.map(_ParallelBlock, bounds, 1)
+    finally:
+        pool.close()
+        pool.join()
+    if encoding is None:
+        return head + ''.join(blocks) + tail
+    if block_encoding is None:
+        return (head + ''.join(blocks) + tail).encode(encoding, 'xmlcharrefreplace')
+    blocks.insert(0, head.encode(encoding, 'xmlcharrefreplace'))
+    blocks.append(tail.encode(encoding, 'xmlcharrefreplace'))
+    return six.b('').join(blocks)
+
+def _C14NEscapeText (text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\r', '&#xD;')
+
+def _C14NEscapeAttribute (text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;').replace('\t', '&#x9;').replace('\n', '&#xA;').replace('\r', '&#xD;')
+
+def C14NPieces (events, declarations, exclusive=True, inclusive_prefixes=None, with_comments=False):
+    """Convert events to the text of the canonical form of the document they
+    describe.
+
+    The output follows U{Canonical XML Version 1.0<http://www.w3.org/TR/xml-c14n>}
+    or, if C{exclusive} is true, U{Exclusive XML Canonicalization Version
+    1.0<http://www.w3.org/TR/xml-exc-c14n/>}: there is no XML declaration,
+    empty elements have start and end tags, attributes are sorted by
+    namespace URI and local name, and characters in text and attribute values
+    are replaced as those specifications require.
+
+    Namespace declarations within the events are discarded.  Those described
+    by C{declarations} are taken to be in scope for the document element.  In
+    the inclusive form they are all placed on the document element; in the
+    exclusive form each is placed on the outermost elements that use its
+    prefix in their name or in the names of their attributes.
+
+    @param events: A sequence of events as produced by L{Events}
+
+    @param declarations: A sequence of (namespace, prefix) pairs, as from
+    L{pyxb.utils.domutils.BindingDOMSupport.namespaceDeclarations}.  A prefix
+    of C{None} or the empty string denotes the default namespace.
+
+    @keyword exclusive: If C{True} (default), produce the exclusive
+    canonical form.
+
+    @keyword inclusive_prefixes: For the exclusive form, a sequence of
+    prefixes, or a string holding a whitespace-separated list of prefixes,
+    that are to be treated as in the inclusive form.  This corresponds to
+    the C{PrefixList} of an C{InclusiveNamespaces} element in XML Signature;
+    C{#default} denotes the default namespace.  Prefixes that are not
+    declared are ignored.
+
+    @keyword with_comments: If C{True}, comments within wildcard DOM content
+    are retained.  By default they are removed.
+
+    @return: A generator of text strings.
+    """
+    in_scope = { }
+    for (ns, pfx) in declarations:
+        # The reserved prefixes are never declared
+        if pfx not in ('xml', 'xmlns'):
+            in_scope[pfx or ''] = ns.uri()
+    if exclusive:
+        if isinstance(inclusive_prefixes, six.string_types):
+            inclusive_prefixes = inclusive_prefixes.split()
+        inclusive = set()
+        for pfx in (inclusive_prefixes or ()):
+            if '#default' == pfx:
+                pfx = ''
+            if pfx in in_scope:
+                inclusive.add(pfx)
+    else:
+        inclusive = set(in_scope)
+    xml_uri = pyxb.namespace.XML.uri()
+    # Map from prefix to URI for the namespaces rendered by the enclosing
+    # elements of the output
+    rendered = { '': '' }
+    stack = []
+    for ev in events:
+        kind = ev[0]
+        if StartElement == kind:
+            name = ev[1]
+            utilized = set(inclusive)
+            utilized.add(name.rpartition(':')[0])
+            attributes = []
+            for (an, av) in ev[2]:
+                if ('xmlns' == an) or an.startswith('xmlns:'):
+                    continue
+                (pfx, _, local_name) = an.rpartition(':')
+                if not pfx:
+                    uri = ''
+                elif 'xml' == pfx:
+                    uri = xml_uri
+                else:
+                    utilized.add(pfx)
+                    uri = in_scope.get(pfx, '')
+                attributes.append(((uri, local_name), an, av))
+            attributes.sort(key=lambda _a: _a[0])
+            stack.append(rendered)
+            parts = [ '<', name ]
+            for pfx in sorted(utilized):
+                if pfx in ('xml', 'xmlns'):
+                    continue
+                uri = in_scope.get(pfx)
+                if uri is None:
+                    if pfx:
+                        raise pyxb.LogicError('C14N with undeclared namespace prefix %s' % (pfx,))
+                    uri = ''
+                if rendered.get(pfx) == uri:
+                    continue
+                if rendered is stack[-1]:
+                    rendered = rendered.copy()
+                rendered[pfx] = uri
+                if pfx:
+                    parts.extend((' xmlns:', pfx, '="', _C14NEscapeAttribute(uri), '"'))
+                else:
+                    parts.extend((' xmlns="', _C14NEscapeAttribute(uri), '"'))
+            for (_, an, av) in attributes:
+                parts.extend((' ', an, '="', _C14NEscapeAttribute(av), '"'))
+            parts.append('>')
+            yield ''.join(parts)
+        elif EndElement == kind:
+            rendered = stack.pop()
+            yield '</%s>' % (ev[1],)
+        elif Text == kind:
+            yield _C14NEscapeText(ev[1])
+        elif (Comment == kind) and with_comments:
+            yield '<!--%s-->' % (ev[1],)
+
+def Canonicalize (instance, exclusive=True, inclusive_prefixes=None, with_comments=False, bds=None, element_name=None):
+    """Produce the canonical form of a binding instance as an XML document.
+
+    The namespace prefixes are those assigned by C{bds}, so to reproduce the
+    canonical form of a document that was signed elsewhere the prefixes
+    used in that document should be provided through a
+    L{pyxb.utils.domutils.BindingDOMSupport} instance.
+
+    @param instance: A L{pyxb.binding.basis._TypeBinding_mixin} instance.
+
+    @keyword bds: Optional L{pyxb.utils.domutils.BindingDOMSupport} instance
+    that determines the namespace prefixes.  If not provided, a new generic
+    one is created.
+
+    @keyword element_name: As with L{pyxb.binding.basis._TypeBinding_mixin.toDOM}.
+
+    Remaining keywords are as with L{C14NPieces}.
+
+    @return: The canonical form, as UTF-8 encoded C{bytes}.
+    """
+    if bds is None:
+        bds = domutils.BindingDOMSupport()
+    events = _DocumentEvents(instance, bds, element_name)
+    pieces = C14NPieces(events, bds.namespaceDeclarations(), exclusive, inclusive_prefixes, with_comments)
+    return ''.join(pieces).encode('utf-8')
+
+## Local Variables:
+## fill-column:78
+## End:
@@ -201,10 +201,17 @@ class ValidationError (PyXBException):
 
     More refined validation error exception classes add more attributes."""
 
-    location = None
-    """Where the error occurred in the document being parsed, if
+    def __getLocation (self):
+        location = self.__location
+        if isinstance(location, tuple):
+            location = self.__location = pyxb.utils.utility.ExpandLocation(location)
+        return location
+    def __setLocation (self, location):
+        self.__location = location
+    __location = None
+    location = property(__getLocation, __setLocation, doc="""Where the error occurred in the document being parsed, if
     available.  This will be C{None}, or an instance of
-    L{pyxb.utils.utility.Location}."""
+    L{pyxb.utils.utility.Location}.""")
 
     def details (self):
         """Provide information describing why validation failed.
@@ -57,9 +57,21 @@ def SetDOMImplementation (dom_implementation):
 def StringToDOM (xml_text, **kw):
     """Convert string to a DOM instance.
 
+    The value may also be any of the non-text document sources accepted by
+    L{pyxb.utils.saxutils.ParseSource}.  As the DOM holds the entire
+    document, such sources are read into memory first.
+
     @see: L{pyxb._SetXMLStyle}."""
 
     xmlt = xml_text
+    if not isinstance(xmlt, (six.text_type, six.binary_type)):
+        if pyxb.utils.saxutils.IsPathLike(xmlt):
+            with open(xmlt.__fspath__(), 'rb') as f:
+                xmlt = f.read()
+        elif hasattr(xmlt, 'read'):
+            xmlt = xmlt.read()
+        else:
+            xmlt = six.binary_type(xmlt)
     if pyxb.XMLStyle_minidom == pyxb._XMLStyle:
         parser = pyxb.utils.saxutils.make_parser()
         # minidom.parseString is broken.  In Python 2, this means don't
@@ -69,7 +81,7 @@ def StringToDOM (xml_text, **kw):
         elif (six.PY3 and isinstance(xmlt, six.binary_type)):
             xmlt = xmlt.decode(pyxb._InputEncoding)
         return xml.dom.minidom.parseString(xmlt, parser)
-    return pyxb.utils.saxdom.parseString(xml_text, **kw)
+    return pyxb.utils.saxdom.parseString(xmlt, **kw)
 
 def NodeAttribute (node, attribute_ncname, attribute_ns=None):
     """Namespace-aware search for an optional attribute in a node.
@@ -275,11 +287,17 @@ class BindingDOMSupport (object):
         # 'xsi' is not a bound prefix.
         self.__namespaceContext.declareNamespace(pyxb.namespace.XMLSchema_instance, 'xsi')
         self.__referencedNamespacePrefixes = set()
+        self.__declaredNamespaces = set()
+        if self.__prefixPlan is None:
+            self.__qualifiedNames = ({}, {})
+        else:
+            self.__qualifiedNames = (self.__prefixPlan[0].copy(), self.__prefixPlan[1].copy())
 
     @classmethod
     def Reset (cls):
         """Reset the global defaults for default/prefix/namespace information."""
         cls.__NamespaceContext.reset()
+        cls.__PrefixPlans = { }
 
     def __init__ (self, implementation=None, default_namespace=None, require_xsi_type=False, namespace_prefix_map=None):
         """Create a new instance used for building a single document.
@@ -314,6 +332,10 @@ class BindingDOMSupport (object):
                                                                   in_scope_namespaces=namespace_prefix_map)
         if default_namespace is not None:
             self.__namespaceContext.setDefaultNamespace(default_namespace)
+        plan_key = (default_namespace, frozenset(six.iteritems(namespace_prefix_map or {})))
+        self.__prefixPlan = self.__PrefixPlans.get(plan_key)
+        if self.__prefixPlan is None:
+            self.__prefixPlan = self.__PrefixPlans.setdefault(plan_key, ({}, {}))
         self.reset()
 
     # Default namespace-prefix map support
@@ -328,6 +350,33 @@ class BindingDOMSupport (object):
     # through L{namespacePrefix()} since the last reset().
     __referencedNamespacePrefixes = None
 
+    # Set of namespaces for which namespacePrefix() generated a prefix since
+    # the last reset().  Names in these namespaces depend on the order in
+    # which namespaces are encountered in the document.
+    __declaredNamespaces = None
+
+    # Map from a configuration of the constructor and the global defaults to
+    # its prefix plan.  A prefix plan is a pair of maps, used when default
+    # namespaces are disabled and enabled respectively, from ExpandedName
+    # instances to pairs of the qualified name and the (namespace, prefix)
+    # declaration it requires (or None).  The plan holds only names that do
+    # not depend on the document content, so it is shared among all instances
+    # with the same configuration.
+    __PrefixPlans = { }
+
+    # The prefix plan shared by this instance, or None if this instance has
+    # been modified after construction so that its names may differ from
+    # others with the same configuration.
+    __prefixPlan = None
+
+    # Pair of maps with the same structure as a prefix plan, holding all
+    # names generated by qnameAsText() since the last reset().
+    __qualifiedNames = None
+
+    def __abandonPrefixPlan (self):
+        self.__prefixPlan = None
+        self.__qualifiedNames = ({}, {})
+
     def defaultNamespace (self):
         """The default namespace for this instance"""
         return self.__namespaceContext.defaultNamespace()
@@ -337,17 +386,21 @@ class BindingDOMSupport (object):
         return cls.__NamespaceContext.defaultNamespace()
 
     def setDefaultNamespace (self, default_namespace):
+        self.__abandonPrefixPlan()
         return self.__namespaceContext.setDefaultNamespace(default_namespace)
     @classmethod
     def SetDefaultNamespace (cls, default_namespace):
+        cls.__PrefixPlans = { }
         return cls.__NamespaceContext.setDefaultNamespace(default_namespace)
 
     def declareNamespace (self, namespace, prefix=None):
         """Declare a namespace within this instance only."""
+        self.__abandonPrefixPlan()
         return self.__namespaceContext.declareNamespace(namespace, prefix)
     @classmethod
     def DeclareNamespace (cls, namespace, prefix=None):
         """Declare a namespace that will made available to each created instance."""
+        cls.__PrefixPlans = { }
         return cls.__NamespaceContext.declareNamespace(namespace, prefix)
 
     def namespacePrefix (self, namespace, enable_default_namespace=True):
@@ -375,15 +428,45 @@ class BindingDOMSupport (object):
         pfx = self.__namespaceContext.prefixForNamespace(namespace)
         if pfx is None:
             pfx = self.__namespaceContext.declareNamespace(namespace)
+            self.__declaredNamespaces.add(namespace)
         self.__referencedNamespacePrefixes.add((namespace, pfx))
         return pfx
 
-    def qnameAsText (self, qname, enable_default_namespace=True):
-        assert isinstance(qname, pyxb.namespace.ExpandedName)
-        name = qname.localName()
-        prefix = self.namespacePrefix(qname.namespace(), enable_default_namespace=enable_default_namespace)
-        if prefix is not None:
-            name = '%s:%s' % (prefix, name)
+    def qnameAsText (self, qname, enable_default_namespace=True, component_name=False):
+        """Return the qualified name to be used for the given expanded name.
+
+        Qualified names are remembered until the next L{reset}.  Those that
+        name schema components and do not depend on the namespaces
+        encountered in the document are also recorded in a prefix plan that
+        is reused by other instances created with the same configuration, so
+        the name is formatted only once.
+
+        @keyword enable_default_namespace: As with L{namespacePrefix}.
+
+        @keyword component_name: C{True} if the name is that of an element or
+        attribute declaration.  Other names, such as those in QName values or
+        wildcard content, are not recorded in the prefix plan, since there is
+        no bound on how many distinct ones a process may encounter.
+        """
+        names = self.__qualifiedNames[not not enable_default_namespace]
+        entry = names.get(qname)
+        if entry is None:
+            assert isinstance(qname, pyxb.namespace.ExpandedName)
+            name = qname.localName()
+            namespace = qname.namespace()
+            prefix = self.namespacePrefix(namespace, enable_default_namespace=enable_default_namespace)
+            decl = None
+            if prefix is not None:
+                name = '%s:%s' % (prefix, name)
+                decl = (namespace, prefix)
+            entry = (name, decl)
+            names[qname] = entry
+            if component_name and (self.__prefixPlan is not None) and ((decl is None) or not (namespace in self.__declaredNamespaces)):
+                self.__prefixPlan[not not enable_default_namespace][qname] = entry
+            return name
+        (name, decl) = entry
+        if decl is not None:
+            self.__referencedNamespacePrefixes.add(decl)
         return name
 
     def valueAsText (self, value, enable_default_namespace=True):
@@ -397,13 +480,19 @@ class BindingDOMSupport (object):
         if isinstance(value, pyxb.namespace.ExpandedName):
             return self.qnameAsText(value, enable_default_namespace=enable_default_namespace)
         if isinstance(value, STD_list):
-            return ' '.join([ self.valueAsText(_v, enable_default_namespace=enable_default_namespace) for _v in value ])
+            text = value._lexicalForm()
+            if text is None:
+                text = ' '.join([ self.valueAsText(_v, enable_default_namespace=enable_default_namespace) for _v in value ])
+                # The text of QName items depends on this instance
+                if value._CacheLexicalForm and not [ _v for _v in value if isinstance(_v, pyxb.namespace.ExpandedName) ]:
+                    value._setLexicalForm(text)
+            return text
         if isinstance(value, simpleTypeDefinition):
             return value.xsdLiteral()
         assert value is not None
         return six.text_type(value)
 
-    def addAttribute (self, element, expanded_name, value):
+    def addAttribute (self, element, expanded_name, value, component_name=False):
         """Add an attribute to the given element.
 
         @param element: The element to which the attribute should be added
@@ -413,13 +502,14 @@ class BindingDOMSupport (object):
         @type expanded_name: L{pyxb.namespace.Namespace} or C{str} or C{unicode}
         @param value: The value of the attribute
         @type value: C{str} or C{unicode}
+        @keyword component_name: As with L{qnameAsText}.
         """
         name = expanded_name
         ns_uri = xml.dom.EMPTY_NAMESPACE
         if isinstance(name, pyxb.namespace.ExpandedName):
             ns_uri = expanded_name.namespaceURI()
             # Attribute names do not use default namespace
-            name = self.qnameAsText(expanded_name, enable_default_namespace=False)
+            name = self.qnameAsText(expanded_name, enable_default_namespace=False, component_name=component_name)
         element.setAttributeNS(ns_uri, name, self.valueAsText(value))
 
     def addXMLNSDeclaration (self, element, namespace, prefix=None):
@@ -447,6 +537,21 @@ class BindingDOMSupport (object):
         element.setAttributeNS(pyxb.namespace.XMLNamespaces.uri(), an, namespace.uri())
         return prefix
 
+    def namespaceDeclarations (self):
+        """Return the XML Namespace declarations required by the names that
+        have been generated since the last L{reset}.
+
+        @return: A list of pairs C{(namespace, prefix)}, in the order they
+        are added by L{finalize}.  The default namespace, if any, is first,
+        with prefix C{''}.
+        """
+        decls = []
+        ns = self.defaultNamespace()
+        if ns is not None:
+            decls.append( (ns, '') )
+        decls.extend(self.__referencedNamespacePrefixes)
+        return decls
+
     def finalize (self):
         """Do the final cleanup after generating the tree.  This makes sure
         that the document element includes XML Namespace declarations for all
@@ -454,14 +559,11 @@ class BindingDOMSupport (object):
 
         @return: The document that has been created.
         @rtype: C{xml.dom.Document}"""
-        ns = self.defaultNamespace()
-        if ns is not None:
-            self.addXMLNSDeclaration(self.document().documentElement, ns, '')
-        for (ns, pfx) in self.__referencedNamespacePrefixes:
+        for (ns, pfx) in self.namespaceDeclarations():
             self.addXMLNSDeclaration(self.document().documentElement, ns, pfx)
         return self.document()
 
-    def createChildElement (self, expanded_name, parent=None):
+    def createChildElement (self, expanded_name, parent=None, component_name=False):
         """Create a new element node in the tree.
 
         @param expanded_name: The name of the element.  A plain string
@@ -472,6 +574,8 @@ class BindingDOMSupport (object):
         parent.  If C{None}, the document element is used.  (If there is no
         document element, then this call creates it as a side-effect.)
 
+        @keyword component_name: As with L{qnameAsText}.
+
         @return: A newly created DOM element
         @rtype: C{xml.dom.Element}
         """
@@ -489,7 +593,7 @@ class BindingDOMSupport (object):
         name = expanded_name.localName()
         if ns is not None:
             ns_uri = ns.uri()
-            name = self.qnameAsText(expanded_name)
+            name = self.qnameAsText(expanded_name, component_name=component_name)
         element = self.__document.createElementNS(ns_uri, name)
         return parent.appendChild(element)
 
@@ -92,7 +92,7 @@ class UpdateApplicationError (FACError):
     """The L{UpdateInstruction} with an unsatisfied L{CounterCondition}"""
 
     values = None
-    """The unsatisfying value map from L{CounterCondition} instances to integers"""
+    """The unsatisfying counter values (see L{UpdateInstruction.satisfiedBy})"""
 
     def __init__ (self, *args):
         (self.update_instruction, self.values) = args
@@ -140,6 +140,18 @@ class SymbolMatch_mixin (object):
     def match (self, symbol):
         raise NotImplementedError('%s.match' % (type(self).__name__,))
 
+    def transitionKey (self):
+        """Return a key identifying the candidate symbols this symbol matches.
+
+        If this returns a value other than C{None}, the symbol must match a
+        candidate symbol if and only if the application associates the
+        candidate with an equal key.  This allows
+        L{Automaton.compiledTransitions} to select transitions by key rather
+        than invoking L{match}.  The
+        default implementation returns C{None}, indicating that matching
+        requires examination of the candidate."""
+        return None
+
 class State (object):
     """A thin wrapper around an object reference.
 
@@ -283,6 +295,95 @@ class State (object):
             transitions.extend(sa.initialTransitions)
         return (is_nullable, transitions)
 
+    # Map from tuples of sub-automata to the result of
+    # _enterSubAutomataTransitions for them
+    __enterSubAutomataCache = None
+
+    def _enterSubAutomataTransitions (self, sub_automata):
+        """Return the transitions that enter a sub-automaton of this state.
+
+        This is L{subAutomataInitialTransitions} with each transition
+        replaced by its L{enter automaton
+        transition<Transition.makeEnterAutomatonTransition>}.  The result
+        depends only on the sub-automata, so is computed once for each
+        sequence of sub-automata that remains to be processed.
+
+        @param sub_automata: A sequence of sub-automata of this state.
+
+        @return: A pair C{(nullable, transitions)} where C{transitions} is
+        a tuple."""
+        key = tuple(sub_automata)
+        cache = self.__enterSubAutomataCache
+        if cache is None:
+            cache = self.__enterSubAutomataCache = { }
+        rv = cache.get(key)
+        if rv is None:
+            (is_nullable, sub_initial) = self.subAutomataInitialTransitions(key)
+            rv = cache[key] = (is_nullable, tuple([ _xit.makeEnterAutomatonTransition() for _xit in sub_initial ]))
+        return rv
+
+    # A tuple of triples (index, min, max) for the counters updated by
+    # transitions from this state, with an unbounded max represented by
+    # infinity.  See _candidateTransitions.
+    __counterBuckets = None
+
+    # Map from counter signatures to the result of _candidateTransitions
+    __candidateCache = None
+
+    def _candidateTransitions (self, counter_values):
+        """Return the transitions from this state that are permitted by
+        the counter values of a configuration in the state.
+
+        Transitions into states that have sub-automata are replaced by
+        chains that continue into the initial transitions of those
+        sub-automata, so every transition in the result consumes a symbol.
+
+        Whether an update instruction is satisfied depends only on whether
+        the value of its counter is below the minimum, between the minimum
+        and maximum, or at or above the maximum.  The result is memoized
+        for each combination of these buckets over the counters that are
+        updated by transitions from the state.
+
+        @param counter_values: The counter values of a L{Configuration} of
+        the automaton containing this state.
+
+        @return: A tuple of L{Transition} instances in order of
+        preference."""
+        buckets = self.__counterBuckets
+        if buckets is None:
+            buckets = self.__counterBuckets = self.__prepareCounterBuckets()
+            self.__candidateCache = { }
+        signature = tuple([ (counter_values[_i] >= _min) + (counter_values[_i] >= _max) for (_i, _min, _max) in buckets ])
+        rv = self.__candidateCache.get(signature)
+        if rv is None:
+            transitions = []
+            for xit in self.__transitionSet:
+                if not UpdateInstruction.Satisfies(counter_values, xit.updateInstructions):
+                    continue
+                if xit.consumingState() is not None:
+                    transitions.append(xit)
+                else:
+                    # The transition did not consume a symbol, so we have to find
+                    # one that does, from among the subautomata of the destination.
+                    # We do not care if the destination is nullable; alternatives
+                    # to it are already being handled with different transitions.
+                    (_, sub_initial) = xit.destination._enterSubAutomataTransitions(xit.destination.subAutomata)
+                    transitions.extend([ xit.chainTo(_xit) for _xit in sub_initial ])
+            assert len(frozenset(transitions)) == len(transitions)
+            rv = self.__candidateCache[signature] = tuple(transitions)
+        return rv
+
+    def __prepareCounterBuckets (self):
+        buckets = { }
+        for xit in self.__transitionSet:
+            for ui in xit.updateInstructions:
+                cc = ui.counterCondition
+                max_value = cc.max
+                if max_value is None:
+                    max_value = float('inf')
+                buckets[cc.index] = (cc.index, cc.min, max_value)
+        return tuple(buckets.values())
+
     def isAccepting (self, counter_values):
         """C{True} iff this state is an accepting state for the automaton.
 
@@ -337,6 +438,8 @@ class State (object):
         transitions to the destination state."""
 
         self.__transitionSet = []
+        self.__counterBuckets = None
+        self.__candidateCache = None
         seen = set()
         for xit in transition_set:
             if not (xit in seen):
@@ -361,6 +464,20 @@ class State (object):
             return self.__symbol.match(symbol)
         return self.__symbol == symbol
 
+    def transitionKey (self):
+        """Return a key identifying the symbols that match this state.
+
+        For a L{SymbolMatch_mixin} symbol this is its
+        L{transitionKey<SymbolMatch_mixin.transitionKey>}; otherwise, since
+        matching is by equality, it is the symbol itself.  C{None} is
+        returned if the state cannot be matched by key, including when a
+        subclass overrides L{match}."""
+        if type(self).match is not State.match:
+            return None
+        if isinstance(self.__symbol, SymbolMatch_mixin):
+            return self.__symbol.transitionKey()
+        return self.__symbol
+
     def __str__ (self):
         return 'S.%x' % (id(self),)
 
@@ -377,9 +494,11 @@ class State (object):
 class CounterCondition (object):
     """A counter condition is a range limit on valid counter values.
 
-    Instances of this class serve as keys for the counters that
-    represent the configuration of a FAC.  The instance also maintains
-    a pointer to application-specific L{metadata}."""
+    Instances of this class identify the counters that represent the
+    configuration of a FAC.  When an L{Automaton} is created each of
+    its conditions is assigned an L{index} into the sequence of counter
+    values held by its configurations.  The instance also maintains a
+    pointer to application-specific L{metadata}."""
 
     __min = None
     def __get_min (self):
@@ -404,6 +523,19 @@ class CounterCondition (object):
         return self.__metadata
     metadata = property(__get_metadata)
 
+    __index = None
+    def __get_index (self):
+        """The position of the counter value within the counter values of
+        a L{Configuration}.
+
+        This is assigned when the L{Automaton} that uses the condition is
+        created.  It is C{None} if the condition is not part of an
+        automaton."""
+        return self.__index
+    def _set_index (self, index):
+        self.__index = index
+    index = property(__get_index)
+
     def __init__ (self, min, max, metadata=None):
         """Create a counter condition.
 
@@ -442,10 +574,7 @@ class UpdateInstruction:
     __counterCondition = None
     def __get_counterCondition (self):
         """A reference to the L{CounterCondition} identifying the
-        counter to be updated.
-
-        The counter condition instance is used as a key to the
-        dictionary maintaining current counter values."""
+        counter to be updated."""
         return self.__counterCondition
     counterCondition = property(__get_counterCondition)
 
@@ -459,6 +588,11 @@ class UpdateInstruction:
     __min = None
     __max = None
 
+    # The key of the counter within counter values: the index of the
+    # counter condition once its automaton has been created, and the
+    # counter condition itself before then.
+    __key = None
+
     def __init__ (self, counter_condition, do_increment):
         """Create an update instruction.
 
@@ -474,6 +608,16 @@ class UpdateInstruction:
         self.__doIncrement = not not do_increment
         self.__min = counter_condition.min
         self.__max = counter_condition.max
+        self.__key = counter_condition
+
+    def _resolveIndex (self):
+        """Use the L{index<CounterCondition.index>} of the counter
+        condition to locate the counter value.
+
+        This is invoked when the automaton that uses the instruction is
+        created."""
+        if self.__counterCondition.index is not None:
+            self.__key = self.__counterCondition.index
 
     def satisfiedBy (self, counter_values):
         """Implement a component of definition 5 from B{HOV09}.
@@ -482,12 +626,15 @@ class UpdateInstruction:
         its action may be legitimately applied to the value of its
         associated counter.
 
-        @param counter_values: A map from  L{CounterCondition}s to
-        non-negative integers
+        @param counter_values: The values of the counters of a
+        configuration: a list indexed by L{CounterCondition.index}.
+        Before the automaton that uses the instruction has been
+        created, a map from L{CounterCondition}s to non-negative
+        integers.
 
         @return:  C{True} or C{False}
         """
-        value = counter_values[self.__counterCondition]
+        value = counter_values[self.__key]
         if self.__doIncrement \
                 and (self.__max is not None) \
                 and (value >= self.__max):
@@ -502,8 +649,7 @@ class UpdateInstruction:
         """Return C{True} iff the counter values satisfy the update
         instructions.
 
-        @param counter_values: A map from L{CounterCondition} to
-        integer counter values
+        @param counter_values: The counter values (see L{satisfiedBy})
 
         @param update_instructions: A set of L{UpdateInstruction}
         instances
@@ -518,16 +664,14 @@ class UpdateInstruction:
     def apply (self, counter_values):
         """Apply the update instruction to the provided counter values.
 
-        @param counter_values: A map from L{CounterCondition} to
-        integer counter values.  This map is updated in-place."""
+        @param counter_values: The counter values (see
+        L{satisfiedBy}).  These are updated in-place."""
         if not self.satisfiedBy(counter_values):
             raise UpdateApplicationError(self, counter_values)
-        value = counter_values[self.__counterCondition]
         if self.__doIncrement:
-            value += 1
+            counter_values[self.__key] += 1
         else:
-            value = 1
-        counter_values[self.__counterCondition] = value
+            counter_values[self.__key] = 1
 
     @classmethod
     def Apply (cls, update_instructions, counter_values):
@@ -536,10 +680,9 @@ class UpdateInstruction:
         @param update_instructions: A set of L{UpdateInstruction}
         instances.
 
-        @param counter_values: A map from L{CounterCondition}
-        instances to non-negative integers.  This map is updated
-        in-place by applying each instruction in
-        C{update_instructions}."""
+        @param counter_values: The counter values (see
+        L{satisfiedBy}).  These are updated in-place by applying each
+        instruction in C{update_instructions}."""
         for psi in update_instructions:
             psi.apply(counter_values)
 
@@ -693,12 +836,48 @@ class Transition (object):
             configuration = layer_link.leaveAutomaton(configuration)
         elif isinstance(layer_link, Automaton):
             configuration = configuration.enterAutomaton(layer_link)
-        UpdateInstruction.Apply(self.updateInstructions, configuration._get_counterValues())
+        if self.__updateInstructions:
+            UpdateInstruction.Apply(self.__updateInstructions, configuration._mutableCounterValues())
         configuration._set_state(self.destination, layer_link is None)
         if self.__nextTransition is None:
             return configuration
         return self.__nextTransition.apply(configuration, clone_map)
 
+    def applyRepeatedly (self, configuration, count):
+        """Apply a transition that returns to the state of the
+        configuration as many times as its counters permit, up to a
+        limit.
+
+        The result is the same as applying the transition that many
+        times in succession, but counter values are checked and updated
+        once.  The transition must not change layers, and its update
+        instructions must all increment counters.
+
+        @param configuration: A L{Configuration} in the L{destination}
+        state of the transition.
+
+        @param count: The maximum number of times the transition should
+        be applied.
+
+        @return: The number of times the transition was applied, which
+        is less than C{count} if a counter would exceed its maximum."""
+        assert self.__layerLink is None
+        assert self.__nextTransition is None
+        assert configuration.state == self.__destination
+        counter_values = configuration._get_counterValues()
+        for ui in self.__updateInstructions:
+            assert ui.doIncrement
+            cc = ui.counterCondition
+            if cc.max is not None:
+                count = min(count, cc.max - counter_values[cc.index])
+        if 0 >= count:
+            return 0
+        if self.__updateInstructions:
+            counter_values = configuration._mutableCounterValues()
+            for ui in self.__updateInstructions:
+                counter_values[ui.counterCondition.index] += count
+        return count
+
     def chainTo (self, next_transition):
         """Duplicate the state and chain the duplicate to a successor
         transition.
@@ -720,15 +899,23 @@ class Transition (object):
         head.__nextTransition = next_transition
         return head
 
+    # The result of makeEnterAutomatonTransition
+    __enterAutomatonTransition = None
+
     def makeEnterAutomatonTransition (self):
         """Replicate the transition as a layer link into its automaton.
 
         This is used on initial transitions into sub-automata where a
-        sub-configuration must be created and recorded."""
+        sub-configuration must be created and recorded.  Transitions
+        hold no configuration-specific data, so the replica is created
+        once and returned on subsequent calls."""
         assert self.__layerLink is None
         assert self.__nextTransition is None
-        head = type(self)(self.__destination, self.__updateInstructions)
-        head.__layerLink = self.__destination.automaton
+        head = self.__enterAutomatonTransition
+        if head is None:
+            head = type(self)(self.__destination, self.__updateInstructions)
+            head.__layerLink = self.__destination.automaton
+            self.__enterAutomatonTransition = head
         return head
 
     def __hash__ (self):
@@ -847,16 +1034,32 @@ class Configuration (Configuration_ABC):
         if is_layer_change and (state.subAutomata is not None):
             assert self.__subAutomata is None
             self.__subAutomata = list(state.subAutomata)
+            self.__subAutomataShared = False
     state = property(__get_state)
 
     __counterValues = None
     """The values of the counters.
 
-    This is a map from the CounterCondition instances of the
-    underlying automaton to integer values."""
+    This is a list of integer values indexed by the
+    L{index<CounterCondition.index>} of the CounterCondition instances
+    of the underlying automaton."""
     def _get_counterValues (self):
         return self.__counterValues
 
+    # True iff __counterValues may be shared with a clone of this
+    # configuration, so must be copied before it is modified.
+    __counterValuesShared = False
+
+    def _mutableCounterValues (self):
+        """Return the counter values for modification.
+
+        Counter values are shared between a configuration and its clones
+        until one of them changes them."""
+        if self.__counterValuesShared:
+            self.__counterValues = self.__counterValues[:]
+            self.__counterValuesShared = False
+        return self.__counterValues
+
     __automaton = None
     def __get_automaton (self):
         return self.__automaton
@@ -906,6 +1109,11 @@ class Configuration (Configuration_ABC):
         return self.__subAutomata
     def _set_subAutomata (self, automata):
         self.__subAutomata = list(automata)
+        self.__subAutomataShared = False
+
+    # True iff __subAutomata may be shared with a clone of this
+    # configuration, so must be copied before it is modified.
+    __subAutomataShared = False
     subAutomata = property(__get_subAutomata)
 
     def makeLeaveAutomatonTransition (self):
@@ -941,6 +1149,9 @@ class Configuration (Configuration_ABC):
         a sub-configuration of C{self}."""
         assert self.__subConfiguration is None
         assert self.__subAutomata is not None
+        if self.__subAutomataShared:
+            self.__subAutomata = self.__subAutomata[:]
+            self.__subAutomataShared = False
         self.__subAutomata.remove(automaton)
         self.__subConfiguration = Configuration(automaton)
         self.__subConfiguration.__superConfiguration = self
@@ -952,9 +1163,11 @@ class Configuration (Configuration_ABC):
     def reset (self):
         fac = self.__automaton
         self.__state = None
-        self.__counterValues = dict(zip(fac.counterConditions, len(fac.counterConditions) * (1,)))
+        self.__counterValues = fac.counterCount() * [1]
+        self.__counterValuesShared = False
         self.__subConfiguration = None
         self.__subAutomata = None
+        self.__subAutomataShared = False
 
     def candidateTransitions (self, symbol=None):
         """Return list of viable transitions on C{symbol}
@@ -979,48 +1192,42 @@ class Configuration (Configuration_ABC):
 
         fac = self.__automaton
         transitions = []
-        if symbol is None:
-            match_filter = lambda _xit: True
-        else:
-            match_filter = lambda _xit: _xit.consumingState().match(symbol)
         update_filter = lambda _xit: _xit.satisfiedBy(self)
 
         if self.__state is None:
             # Special-case the initial entry to the topmost configuration
-            transitions.extend(fac.initialTransitions)
+            transitions.extend(filter(update_filter, fac.initialTransitions))
         elif (self.__subConfiguration is not None) and not self.__subConfiguration.isAccepting():
             # If there's an active subconfiguration that is not in an
             # accepting state, we can't do anything at this level.
             pass
         else:
             # Normally include transitions at this level, but in some
-            # cases they are not permitted.
+            # cases they are not permitted.  The transitions within this
+            # layer and into sub-automata are constructed by the state and
+            # retained for re-use; they already account for the counter
+            # values.
             include_local = True
             if self.__subAutomata:
                 # Disallow transitions in this level if there are
                 # subautomata that require symbols before a transition
                 # out of this node is allowed.
-                (include_local, sub_initial) = self.__state.subAutomataInitialTransitions(self.__subAutomata)
-                transitions.extend(map(lambda _xit: _xit.makeEnterAutomatonTransition(), sub_initial))
+                (include_local, sub_initial) = self.__state._enterSubAutomataTransitions(self.__subAutomata)
+                transitions.extend(sub_initial)
             if include_local:
                 # Transitions within this layer
-                for xit in filter(update_filter, self.__state.transitionSet):
-                    if xit.consumingState() is not None:
-                        transitions.append(xit)
-                    else:
-                        # The transition did not consume a symbol, so we have to find
-                        # one that does, from among the subautomata of the destination.
-                        # We do not care if the destination is nullable; alternatives
-                        # to it are already being handled with different transitions.
-                        (_, sub_initial) = xit.destination.subAutomataInitialTransitions()
-                        transitions.extend(map(lambda _xit: xit.chainTo(_xit.makeEnterAutomatonTransition()), sub_initial))
+                transitions.extend(self.__state._candidateTransitions(self.__counterValues))
                 if (self.__superConfiguration is not None) and self.isAccepting():
-                    # Transitions that leave this automaton
+                    # Transitions that leave this automaton.  The candidates
+                    # from the super-configuration already account for its
+                    # counter values.
                     lxit = self.makeLeaveAutomatonTransition()
                     supxit = self.__superConfiguration.candidateTransitions(symbol)
-                    transitions.extend(map(lambda _sx: lxit.chainTo(_sx), supxit))
-        assert len(frozenset(transitions)) == len(transitions)
-        return list(filter(update_filter, filter(match_filter, transitions)))
+                    transitions.extend([ lxit.chainTo(_sx) for _sx in supxit ])
+                    assert len(frozenset(transitions)) == len(transitions)
+        if symbol is None:
+            return transitions
+        return [ _xit for _xit in transitions if _xit.consumingState().match(symbol) ]
 
     def acceptableSymbols (self):
         return [ _xit.consumedSymbol() for _xit in self.candidateTransitions()]
@@ -1065,6 +1272,10 @@ class Configuration (Configuration_ABC):
         It clones the entire chain of configurations through
         multiple layers.
 
+        Cloning is cheap: the counter values and the set of pending
+        sub-automata are shared by the original and the clone, and
+        copied only when one of them is changed.
+
         @param clone_map: Optional map into which the translation from
         the original configuration object to the corresponding cloned
         configuration object can be reconstructed, e.g. when applying
@@ -1081,19 +1292,24 @@ class Configuration (Configuration_ABC):
 
     def _clone (self, clone_map, super_configuration):
         assert not self in clone_map
-        other = type(self)(self.__automaton)
+        # Bypass the constructor, which would create counter values that
+        # are immediately replaced.
+        other = type(self).__new__(type(self))
         clone_map[self] = other
+        other.__automaton = self.__automaton
         other.__state = self.__state
-        other.__counterValues = self.__counterValues.copy()
+        other.__counterValues = self.__counterValues
+        self.__counterValuesShared = other.__counterValuesShared = True
         other.__superConfiguration = super_configuration
         if self.__subAutomata is not None:
-            other.__subAutomata = self.__subAutomata[:]
+            other.__subAutomata = self.__subAutomata
+            self.__subAutomataShared = other.__subAutomataShared = True
             if self.__subConfiguration:
                 other.__subConfiguration = self.__subConfiguration._clone(clone_map, other)
         return other
 
     def __str__ (self):
-        return '%s: %s' % (self.__state, ' ; '.join([ '%s=%u' % (_c,_v) for (_c,_v) in six.iteritems(self.__counterValues)]))
+        return '%s: %s' % (self.__state, ' ; '.join([ '%s=%u' % (_c, self.__counterValues[_c.index]) for _c in self.__automaton.counterConditions ]))
 
 class MultiConfiguration (Configuration_ABC):
     """Support parallel execution of state machine.
@@ -1129,10 +1345,13 @@ class MultiConfiguration (Configuration_ABC):
             elif 1 == len(transitions):
                 next_configs.append(transitions[0].apply(cfg))
             else:
-                for transition in transitions:
+                # Clone for all but the last transition, which can be
+                # applied to the original configuration.
+                for transition in transitions[:-1]:
                     clone_map = {}
                     ccfg = cfg.clone(clone_map)
                     next_configs.append(transition.apply(ccfg, clone_map))
+                next_configs.append(transitions[-1].apply(cfg))
         if 0 == len(next_configs):
             raise UnrecognizedSymbolError(self, symbol)
         assert len(frozenset(next_configs)) == len(next_configs)
@@ -1221,10 +1440,55 @@ class Automaton (object):
         return self.__finalStates
     finalStates = property(__get_finalStates)
 
+    __compiledTransitions = None
+    def compiledTransitions (self):
+        """Return a table of the transitions of the automaton indexed by
+        state and symbol key, if the automaton supports one.
+
+        A table is available only for automata that neither have
+        sub-automata nor are sub-automata, so every transition consumes a
+        symbol and stays within the automaton.  The table is built on the
+        first call.
+
+        @return: C{None} if no table is available.  Otherwise a map from each
+        L{State} of the automaton, and C{None} for the initial configuration,
+        to the transitions from that state.  The transitions are represented
+        either by a map from L{SymbolMatch_mixin.transitionKey} values to a
+        tuple of the transitions whose destination has that
+        L{transitionKey<State.transitionKey>} (in order of preference), or by
+        C{None} if some transition from the state has a destination without a
+        key.  The transitions in a tuple must still be
+        checked for satisfaction of their update instructions when the
+        automaton has counters."""
+        if self.__compiledTransitions is None:
+            self.__compiledTransitions = self.__compileTransitions()
+        return self.__compiledTransitions or None
+
+    def __compileTransitions (self):
+        if self.__containingState is not None:
+            return False
+        for st in self.__states:
+            if st.subAutomata is not None:
+                return False
+        table = { }
+        sources = [ (None, self.__initialTransitions) ]
+        sources.extend([ (_s, _s.transitionSet) for _s in self.__states ])
+        for (st, transitions) in sources:
+            by_key = { }
+            for xit in transitions:
+                key = xit.destination.transitionKey()
+                if key is None:
+                    by_key = None
+                    break
+                by_key[key] = by_key.get(key, ()) + (xit,)
+            table[st] = by_key
+        return table
+
     def __init__ (self, states, counter_conditions, nullable, containing_state=None):
         self.__states = frozenset(states)
         for st in self.__states:
             st._set_automaton(self)
+        counter_conditions = list(counter_conditions)
         self.__counterConditions = frozenset(counter_conditions)
         self.__nullable = nullable
         self.__containingState = containing_state
@@ -1239,6 +1503,35 @@ class Automaton (object):
                 fnl.add(s)
         self.__initialTransitions = xit
         self.__finalStates = frozenset(fnl)
+        self.__numberCounters(counter_conditions)
+
+    def __numberCounters (self, counter_conditions):
+        # Assign each counter condition its index into the counter values
+        # of configurations, and have the update instructions refer to the
+        # counters by index.  Conditions are distinguished by identity:
+        # distinct conditions that compare equal have distinct counters.
+        numbered = { }
+        def number (cc):
+            if not (id(cc) in numbered):
+                numbered[id(cc)] = cc
+                cc._set_index(len(numbered) - 1)
+        for cc in counter_conditions:
+            number(cc)
+        update_instructions = []
+        for st in self.__states:
+            update_instructions.extend(st.finalUpdate or ())
+            for xit in (st.transitionSet or ()):
+                update_instructions.extend(xit.updateInstructions)
+        for ui in update_instructions:
+            number(ui.counterCondition)
+            ui._resolveIndex()
+        self.__counterCount = len(numbered)
+
+    __counterCount = 0
+    def counterCount (self):
+        """The number of counter values held by configurations of the
+        automaton."""
+        return self.__counterCount
 
     def newConfiguration (self):
         """Return a new L{Configuration} instance for this automaton."""
@@ -25,13 +25,22 @@ element in the stream.  These classes are extended for specific parsing needs
 from __future__ import print_function
 import xml.sax
 import xml.sax.handler
+import xml.sax.xmlreader
+import xml.parsers.expat
 import io
 import logging
+import mmap
 import pyxb.namespace
 from pyxb.utils import six
 
 _log = logging.getLogger(__name__)
 
+NameCacheLimit = 4096
+"""The number of distinct names remembered by the name conversion caches of
+handlers and parsers.  The caches are retained across documents, so when a
+cache reaches this size it is emptied, to bound the memory consumed by
+documents with many distinct names."""
+
 class TracingSAXHandler (xml.sax.handler.ContentHandler):
     """A SAX handler class which prints each method invocation.
     """
@@ -207,9 +216,41 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
     # construct the locations of events as they are received.
     __locationTemplate = None
 
+    # One of the pyxb.LocationCapture_* values, controlling what location()
+    # returns.
+    __locationCapture = None
+
     def location (self):
-        """Return the current location within the SAX-processed document."""
-        return self.__locationTemplate.newLocation(self.__locator)
+        """Return the current location within the SAX-processed document.
+
+        The value depends on the location capture policy of the handler.  It
+        is C{None} if location capture is disabled.  For compact capture, it
+        is a value recorded by
+        L{pyxb.utils.utility.Location.newCompactLocation}, which
+        L{pyxb.utils.utility.Locatable_mixin} and L{pyxb.ValidationError}
+        convert to a L{pyxb.utils.utility.Location} when it is retrieved.
+        Otherwise it is a L{pyxb.utils.utility.Location} instance.
+        """
+        if pyxb.LocationCapture_full == self.__locationCapture:
+            return self.__locationTemplate.newLocation(self.__locator)
+        if pyxb.LocationCapture_none == self.__locationCapture:
+            return None
+        return self.__locationTemplate.newCompactLocation(self.__locator)
+
+    def setLocationBase (self, location_base):
+        """Set the base recorded in the locations of subsequent events.
+
+        This allows a handler to be reused for documents from different
+        sources.
+
+        @return: C{self}"""
+        self.__locationTemplate = pyxb.utils.utility.Location(location_base)
+        return self
+
+    def locationCapture (self):
+        """The location capture policy used by this handler; one of the
+        C{pyxb.LocationCapture_*} values."""
+        return self.__locationCapture
 
     # The callable that creates an instance of (a subclass of)
     # L{SAXElementState} as required to hold element-specific information as
@@ -235,6 +276,10 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
     # inherited from the current context.
     __nextNamespaceContext = None
 
+    # Map from SAX name tuples to the corresponding ExpandedName instances.
+    # Bounded by NameCacheLimit.
+    __expandedNames = None
+
     # The namespace context that is in effect for this element.
     def namespaceContext (self):
         """Return the namespace context used for QName resolution within the
@@ -286,6 +331,7 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
                                                              namespace_context=self.__namespaceContext)
         self.__elementStateStack = []
         self.__rootObject = None
+        self.__ignoreDepth = 0
         # Note: setDocumentLocator is invoked before startDocument (which
         # calls this), so this method should not reset it.
         return self
@@ -309,12 +355,24 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
         @keyword location_base: An object to be recorded as the base of all
         L{pyxb.utils.utility.Location} instances associated with events and
         objects handled by the parser.
+
+        @keyword location_capture: One of L{pyxb.LocationCapture_none},
+        L{pyxb.LocationCapture_compact}, or L{pyxb.LocationCapture_full},
+        controlling how the location of events is recorded.  Defaults to the
+        policy set by L{pyxb._SetLocationCapture}.
         """
         self.__includingContext = kw.pop('including_context', None)
         self.__fallbackNamespace = kw.pop('fallback_namespace', None)
         self.__elementStateConstructor = kw.pop('element_state_constructor', SAXElementState)
         self.__targetNamespace = kw.pop('target_namespace', None)
         self.__locationTemplate = pyxb.utils.utility.Location(kw.pop('location_base', None))
+        self.__expandedNames = { }
+        location_capture = kw.pop('location_capture', None)
+        if location_capture is None:
+            location_capture = pyxb._LocationCapture
+        if pyxb._LocationCaptureMapReverse.get(location_capture) is None:
+            raise pyxb.UsageError('Bad value %s for location_capture' % (location_capture,))
+        self.__locationCapture = location_capture
 
     def setDocumentLocator (self, locator):
         """Save the locator object."""
@@ -341,6 +399,8 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
 
         @note: For this to be invoked, the C{feature_namespaces} feature must
         be enabled in the SAX parser."""
+        if self.__ignoreDepth:
+            return
         self.__getOrCreateNextNamespaceContext().processXMLNS(prefix, uri)
 
     # The NamespaceContext management does not require any action upon
@@ -348,12 +408,49 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
     #def endPrefixMapping (self, prefix):
     #    pass
 
+    # The number of open elements within a subtree that is being ignored.
+    # Zero if events are being processed normally.
+    __ignoreDepth = 0
+
+    def _ignoreElement (self, name):
+        """Determine whether an element and its content should be ignored.
+
+        This is invoked at the start of each element that is not already
+        within an ignored subtree.  If it returns C{True}, no element state is
+        created and all events up to and including the end of the element are
+        discarded; L{startElementNS} and L{endElementNS} return C{None} for
+        them.  The base implementation ignores nothing.
+
+        @param name: The element name as provided by SAX: a pair
+        C{(namespace_uri, local_name)}.
+        """
+        return False
+
     def startElementNS (self, name, qname, attrs):
-        """Process the start of an element."""
+        """Process the start of an element.
+
+        @return: C{None} if the element is being ignored (see
+        L{_ignoreElement}), otherwise a tuple C{(this_state, parent_state,
+        namespace_context, expanded_name)}."""
+        if self.__ignoreDepth:
+            self.__ignoreDepth += 1
+            return None
         self.__flushPendingText()
-
-        # Get the element name, which is already a tuple with the namespace assigned.
-        expanded_name = pyxb.namespace.ExpandedName(name, fallback_namespace=self.__fallbackNamespace)
+        if self._ignoreElement(name):
+            # Discard any namespace directives for the ignored element
+            self.__nextNamespaceContext = None
+            self.__ignoreDepth = 1
+            return None
+
+        # Get the element name, which is already a tuple with the namespace
+        # assigned.  The conversion depends only on the name and the
+        # fallback namespace, so is done once per distinct name.
+        expanded_name = self.__expandedNames.get(name)
+        if expanded_name is None:
+            expanded_name = pyxb.namespace.ExpandedName(name, fallback_namespace=self.__fallbackNamespace)
+            if len(self.__expandedNames) >= NameCacheLimit:
+                self.__expandedNames.clear()
+            self.__expandedNames[name] = expanded_name
 
         # See if this element supports a targetNamespace attribute.  xs:schema
         # and wsdl:definitions both do.
@@ -391,7 +488,13 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
         return (this_state, parent_state, ns_ctx, expanded_name)
 
     def endElementNS (self, name, qname):
-        """Process the completion of an element."""
+        """Process the completion of an element.
+
+        @return: C{None} if the element is being ignored, otherwise the state
+        of the element."""
+        if self.__ignoreDepth:
+            self.__ignoreDepth -= 1
+            return None
         self.__flushPendingText()
 
         # Save the state of this element, and restore the state for
@@ -422,12 +525,16 @@ class BaseSAXHandler (xml.sax.handler.ContentHandler, object):
 
     def characters (self, content):
         """Save the text as content"""
+        if self.__ignoreDepth:
+            return
         if self.__pendingTextLocation is None:
             self.__pendingTextLocation = self.location()
         self.__pendingText.append(content)
 
     def ignorableWhitespace (self, whitespace):
         """Save whitespace as content too."""
+        if self.__ignoreDepth:
+            return
         self.__pendingText.append(whitespace)
 
     def processingInstruction (self, target, data):
@@ -463,6 +570,357 @@ def SetCreateParserModules (create_parser_modules):
     else:
         _CreateParserModules = list(create_parser_modules)
 
+class _ExpatAttributes (dict):
+    """Attributes of an element, keyed by SAX name tuples.
+
+    This provides the subset of the C{xml.sax.xmlreader.AttributesNS}
+    interface used by PyXB content handlers."""
+
+    def getNames (self):
+        return list(self.keys())
+
+    def getValue (self, name):
+        return self[name]
+
+# Shared attributes instance for the (common) case of an element with no
+# attributes.  Content handlers do not modify attributes.
+_ExpatNoAttributes = _ExpatAttributes()
+
+class DirectExpatParser (xml.sax.xmlreader.IncrementalParser, xml.sax.xmlreader.Locator):
+    """A SAX driver that invokes content handler methods directly from
+    C{pyexpat} callbacks.
+
+    This is used in place of the C{xml.sax.expatreader} driver when the
+    L{pyxb.XMLStyle_expat} style is selected.  It supports only what PyXB
+    content handlers need: namespace processing is always enabled, element
+    and attribute names are converted to SAX name tuples once per distinct
+    name, attributes are provided in a lightweight mapping, and text is
+    buffered by expat so consecutive character data arrives in one event.
+    The parser is its own locator.
+    """
+
+    # The pyexpat parser for the document being processed, or None
+    __parser = None
+
+    # True between the first feed for a document and the call to close
+    __parsing = False
+
+    # Map from expat names (URI and local name separated by a space) to SAX
+    # name tuples.  Retained across documents, bounded by NameCacheLimit.
+    __names = None
+
+    # The system identifier of the document, if known
+    __systemId = None
+
+    def __init__ (self, bufsize=2**16):
+        xml.sax.xmlreader.IncrementalParser.__init__(self, bufsize)
+        self.__names = { }
+
+    def __name (self, name):
+        rv = self.__names.get(name)
+        if rv is None:
+            parts = name.split(' ', 1)
+            if 1 == len(parts):
+                rv = (None, name)
+            else:
+                rv = tuple(parts)
+            if len(self.__names) >= NameCacheLimit:
+                self.__names.clear()
+            self.__names[name] = rv
+        return rv
+
+    def __startElement (self, name, attrs):
+        if attrs:
+            sax_attrs = _ExpatAttributes()
+            for (an, av) in six.iteritems(attrs):
+                sax_attrs[self.__name(an)] = av
+        else:
+            sax_attrs = _ExpatNoAttributes
+        self._cont_handler.startElementNS(self.__name(name), None, sax_attrs)
+
+    def __endElement (self, name):
+        self._cont_handler.endElementNS(self.__name(name), None)
+
+    def reset (self):
+        parser = xml.parsers.expat.ParserCreate(None, ' ')
+        parser.buffer_text = True
+        parser.buffer_size = self._bufsize
+        handler = self._cont_handler
+        parser.StartElementHandler = self.__startElement
+        parser.EndElementHandler = self.__endElement
+        parser.StartNamespaceDeclHandler = handler.startPrefixMapping
+        parser.EndNamespaceDeclHandler = handler.endPrefixMapping
+        parser.CharacterDataHandler = handler.characters
+        parser.ProcessingInstructionHandler = handler.processingInstruction
+        self.__parser = parser
+        self.__parsing = False
+
+    def parse (self, source):
+        # Always start a new document, even if processing of a previous one
+        # was abandoned due to an exception.
+        self.__parsing = False
+        xml.sax.xmlreader.IncrementalParser.parse(self, source)
+
+    def prepareParser (self, source):
+        self.__systemId = source.getSystemId()
+
+    def feed (self, data, isFinal=False):
+        if not self.__parsing:
+            self.reset()
+            self.__parsing = True
+            self._cont_handler.setDocumentLocator(self)
+            self._cont_handler.startDocument()
+        try:
+            self.__parser.Parse(data, isFinal)
+        except xml.parsers.expat.ExpatError as e:
+            exc = xml.sax.SAXParseException(xml.parsers.expat.ErrorString(e.code), e, self)
+            self._err_handler.fatalError(exc)
+
+    def close (self):
+        if not self.__parsing:
+            return
+        try:
+            self.feed(six.b(''), isFinal=True)
+            self._cont_handler.endDocument()
+        finally:
+            self.__parsing = False
+            self.__systemId = None
+
+    def getColumnNumber (self):
+        if self.__parser is None:
+            return None
+        return self.__parser.CurrentColumnNumber
+
+    def getLineNumber (self):
+        if self.__parser is None:
+            return None
+        return self.__parser.CurrentLineNumber
+
+    def getPublicId (self):
+        return None
+
+    def getSystemId (self):
+        return self.__systemId
+
+# The lxml.etree module, False if it cannot be imported, or None if import
+# has not yet been attempted.
+__LxmlEtree = None
+
+def LxmlEtree ():
+    """Return the C{lxml.etree} module, or C{None} if lxml is not available.
+
+    The import is attempted only on the first call, so that lxml is not
+    loaded unless it is used."""
+    global __LxmlEtree
+    if __LxmlEtree is None:
+        try:
+            import lxml.etree
+            __LxmlEtree = lxml.etree
+        except ImportError:
+            __LxmlEtree = False
+    return __LxmlEtree or None
+
+class _TargetEvents (object):
+    """A parser target, in the sense of C{lxml.etree.XMLParser} and
+    C{xml.etree.ElementTree.XMLParser}, that delivers events to a SAX
+    content handler.
+
+    Names in the target interface are in Clark notation (C{{uri}local}),
+    and are converted to SAX name tuples once per distinct name."""
+
+    # Map from Clark notation names to SAX name tuples.  Retained across
+    # documents, bounded by NameCacheLimit.
+    __names = None
+
+    def __init__ (self, content_handler):
+        self.__names = { }
+        self.characters = content_handler.characters
+        self.processingInstruction = content_handler.processingInstruction
+        self.__startPrefixMapping = content_handler.startPrefixMapping
+        self.__endPrefixMapping = content_handler.endPrefixMapping
+        self.__startElementNS = content_handler.startElementNS
+        self.__endElementNS = content_handler.endElementNS
+
+    def __name (self, name):
+        rv = self.__names.get(name)
+        if rv is None:
+            if name.startswith('{'):
+                (uri, local) = name[1:].split('}', 1)
+                rv = (uri, local)
+            else:
+                rv = (None, name)
+            if len(self.__names) >= NameCacheLimit:
+                self.__names.clear()
+            self.__names[name] = rv
+        return rv
+
+    def start_ns (self, prefix, uri):
+        self.__startPrefixMapping(prefix or None, uri)
+
+    def end_ns (self, prefix):
+        self.__endPrefixMapping(prefix or None)
+
+    def start (self, tag, attrib):
+        if attrib:
+            sax_attrs = _ExpatAttributes()
+            for (an, av) in six.iteritems(attrib):
+                sax_attrs[self.__name(an)] = av
+        else:
+            sax_attrs = _ExpatNoAttributes
+        self.__startElementNS(self.__name(tag), None, sax_attrs)
+
+    def end (self, tag):
+        self.__endElementNS(self.__name(tag), None)
+
+    def data (self, content):
+        self.characters(content)
+
+    def pi (self, target, data):
+        self.processingInstruction(target, data)
+
+    def close (self):
+        pass
+
+def _CreateLxmlParser (target):
+    """Create an lxml parser that delivers events to C{target} without
+    loading external resources."""
+    return LxmlEtree().XMLParser(target=target, resolve_entities=False, no_network=True)
+
+class LxmlParser (xml.sax.xmlreader.IncrementalParser, xml.sax.xmlreader.Locator):
+    """A SAX driver that tokenizes documents using C{lxml}.
+
+    This is used when the L{pyxb.XMLStyle_lxml} style is selected.  Events
+    from an C{lxml.etree.XMLParser} target are passed to the content handler
+    in the same form as from L{DirectExpatParser}.  The target interface
+    provides no position information, so the locator reports a position only
+    for well-formedness errors.
+
+    The C{lxml} parser accepts only C{bytes} and text, so buffer objects such
+    as C{mmap.mmap} passed to L{feed} are copied, one block of C{bufsize}
+    bytes at a time.
+
+    Namespace declarations are delivered to targets only by lxml 4.4 and
+    later; L{make_parser} does not use this driver with earlier versions.
+    """
+
+    # The callable that creates the underlying parser given a target
+    __parserConstructor = None
+
+    # The underlying parser for the document being processed, or None
+    __parser = None
+
+    # The parser target that forwards events to the content handler
+    __target = None
+
+    # The handler for which __target was created
+    __targetHandler = None
+
+    # True between the first feed for a document and the call to close
+    __parsing = False
+
+    # The (line, column) of a well-formedness error, if one was detected
+    __position = None
+
+    # The system identifier of the document, if known
+    __systemId = None
+
+    def __init__ (self, bufsize=2**16, parser_constructor=None):
+        """Create the driver.
+
+        @keyword parser_constructor: A callable that takes a parser target
+        and returns an object with C{feed} and C{close} methods that invokes
+        the target, with names in Clark notation.  Defaults to one that
+        creates an C{lxml.etree.XMLParser}.
+        """
+        xml.sax.xmlreader.IncrementalParser.__init__(self, bufsize)
+        if parser_constructor is None:
+            parser_constructor = _CreateLxmlParser
+        self.__parserConstructor = parser_constructor
+
+    def reset (self):
+        handler = self._cont_handler
+        if handler is not self.__targetHandler:
+            self.__target = _TargetEvents(handler)
+            self.__targetHandler = handler
+        self.__parser = self.__parserConstructor(self.__target)
+        self.__parsing = False
+        self.__position = None
+
+    def parse (self, source):
+        # Always start a new document, even if processing of a previous one
+        # was abandoned due to an exception.
+        self.__parsing = False
+        xml.sax.xmlreader.IncrementalParser.parse(self, source)
+
+    def prepareParser (self, source):
+        self.__systemId = source.getSystemId()
+
+    def __fatalError (self, e):
+        self.__position = getattr(e, 'position', None)
+        exc = xml.sax.SAXParseException(getattr(e, 'msg', None) or str(e), e, self)
+        self._err_handler.fatalError(exc)
+
+    def feed (self, data):
+        if not self.__parsing:
+            self.reset()
+            self.__parsing = True
+            self._cont_handler.setDocumentLocator(self)
+            self._cont_handler.startDocument()
+        if isinstance(data, (bytearray, memoryview, mmap.mmap)):
+            # The lxml parser accepts only bytes and text, so a buffer must be
+            # copied.  It is passed in blocks so only one block is copied at
+            # a time.
+            if not isinstance(data, mmap.mmap):
+                data = memoryview(data)
+            for i in six.moves.range(0, len(data), self._bufsize):
+                self.__feed(bytes(data[i:i+self._bufsize]))
+            return
+        self.__feed(data)
+
+    def __feed (self, data):
+        try:
+            self.__parser.feed(data)
+        except SyntaxError as e:
+            # Both lxml.etree.XMLSyntaxError and
+            # xml.etree.ElementTree.ParseError derive from SyntaxError.
+            self.__fatalError(e)
+
+    def close (self):
+        if not self.__parsing:
+            return
+        try:
+            try:
+                self.__parser.close()
+            except SyntaxError as e:
+                self.__fatalError(e)
+            self._cont_handler.endDocument()
+        finally:
+            self.__parsing = False
+            self.__parser = None
+            self.__systemId = None
+
+    def getColumnNumber (self):
+        if self.__position is None:
+            return None
+        return self.__position[1]
+
+    def getLineNumber (self):
+        if self.__position is None:
+            return None
+        return self.__position[0]
+
+    def getPublicId (self):
+        return None
+
+    def getSystemId (self):
+        return self.__systemId
+
+def LxmlParserAvailable ():
+    """Return C{True} iff L{LxmlParser} can be used with the installed
+    C{lxml}, which must be version 4.4 or later."""
+    etree = LxmlEtree()
+    return (etree is not None) and ((4, 4) <= tuple(etree.LXML_VERSION[:2]))
+
 def make_parser (**kw):
     """Extend C{xml.sax.make_parser} to configure the parser the way we
     need it:
@@ -490,11 +948,38 @@ def make_parser (**kw):
     L{pyxb.namespace.ExpandedName}.  This keyword is not used by this
     function, but is passed to the C{content_handler_constructor}.
     @type fallback_namespace: L{pyxb.namespace.Namespace}
+
+    @keyword direct_expat: If C{True}, the parser is a L{DirectExpatParser}
+    rather than one provided by C{xml.sax.make_parser}.  Defaults to C{True}
+    iff the L{pyxb.XMLStyle_expat} style is selected.
+
+    @keyword lxml: If C{True}, and L{LxmlParserAvailable} is C{True}, the
+    parser is a L{LxmlParser}; otherwise this keyword has no effect.  Since
+    lxml does not provide positions, location capture defaults to
+    L{pyxb.LocationCapture_none} for such parsers.  Defaults to C{True} iff
+    the L{pyxb.XMLStyle_lxml} style is selected.
     """
     content_handler_constructor = kw.pop('content_handler_constructor', BaseSAXHandler)
     content_handler = kw.pop('content_handler', None)
+    direct_expat = kw.pop('direct_expat', None)
+    if direct_expat is None:
+        direct_expat = (pyxb.XMLStyle_expat == pyxb._XMLStyle)
+    use_lxml = kw.pop('lxml', None)
+    if use_lxml is None:
+        use_lxml = (pyxb.XMLStyle_lxml == pyxb._XMLStyle)
+    use_lxml = use_lxml and LxmlParserAvailable()
+    if use_lxml:
+        kw.setdefault('location_capture', pyxb.LocationCapture_none)
     if content_handler is None:
         content_handler = content_handler_constructor(**kw)
+    if use_lxml:
+        parser = LxmlParser()
+        parser.setContentHandler(content_handler)
+        return parser
+    if direct_expat:
+        parser = DirectExpatParser()
+        parser.setContentHandler(content_handler)
+        return parser
     parser = xml.sax.make_parser(_CreateParserModules)
     parser.setFeature(xml.sax.handler.feature_namespaces, True)
     parser.setFeature(xml.sax.handler.feature_namespace_prefixes, False)
@@ -506,6 +991,45 @@ def make_parser (**kw):
         pass
     return parser
 
+def IsPathLike (source):
+    """Return C{True} iff C{source} is a file system path object.
+
+    Only objects implementing C{__fspath__} (e.g. C{pathlib.Path}) qualify.
+    Strings are never treated as paths, since they are documents."""
+    return hasattr(source, '__fspath__')
+
+def ParseSource (parser, source):
+    """Parse a document provided in any of several forms, avoiding copies
+    of the document where possible.
+
+    @param parser: A SAX parser, e.g. as returned by L{make_parser}.
+
+    @param source: The document, which may be:
+      - text (Python 2 unicode or Python 3 str), which is encoded using
+        L{pyxb._InputEncoding}
+      - data (Python 2 str or Python 3 bytes)
+      - an object supporting the buffer protocol such as C{bytearray},
+        C{memoryview}, or C{mmap.mmap}.  If the parser is incremental the
+        buffer is passed directly to it, so the expat-based drivers parse it
+        without copying.  L{LxmlParser} copies it in blocks, since C{lxml}
+        accepts only C{bytes}.
+      - a path object (see L{IsPathLike}), which the parser opens and reads
+      - a binary file-like object supporting C{read}, which the parser reads
+        in blocks
+    """
+    if isinstance(source, six.text_type):
+        source = source.encode(pyxb._InputEncoding)
+    if isinstance(source, six.binary_type):
+        return parser.parse(io.BytesIO(source))
+    if isinstance(source, (bytearray, memoryview, mmap.mmap)) and isinstance(parser, xml.sax.xmlreader.IncrementalParser):
+        parser.feed(source)
+        return parser.close()
+    if IsPathLike(source):
+        source = source.__fspath__()
+    elif isinstance(source, (bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return parser.parse(source)
+
 if '__main__' == __name__:
     import xml.dom.pulldom
     import xml.dom.minidom
@@ -1241,6 +1241,20 @@ class Location (object):
                 pass
         return Location(self.__locationBase, line_number, column_number)
 
+    def newCompactLocation (self, locator):
+        """Record the position of the locator relative to this instance.
+
+        This avoids the cost of creating a L{Location} for positions that may
+        never be examined.  The result is converted to a L{Location} by
+        L{ExpandLocation}.
+
+        @return: A tuple, or C{None} if the locator cannot provide a
+        position."""
+        try:
+            return (self, locator.getLineNumber(), locator.getColumnNumber())
+        except:
+            return None
+
     locationBase = property(lambda _s: _s.__locationBase)
     lineNumber = property(lambda _s: _s.__lineNumber)
     columnNumber = property(lambda _s: _s.__columnNumber)
@@ -1311,7 +1325,21 @@ class Locatable_mixin (pyxb.cscRoot):
         self.__location = location
 
     def _location (self):
-        return self.__location
+        location = self.__location
+        if isinstance(location, tuple):
+            location = self.__location = ExpandLocation(location)
+        return location
+
+def ExpandLocation (location):
+    """Convert a location recorded by L{Location.newCompactLocation} into a
+    L{Location} instance.
+
+    Any other value, including C{None} and L{Location} instances, is
+    returned unchanged."""
+    if isinstance(location, tuple):
+        (template, line_number, column_number) = location
+        return template.newLocation(line_number=line_number, column_number=column_number)
+    return location
 
 def repr2to3 (v):
     """Filtered built-in repr for python 2/3 compatibility in
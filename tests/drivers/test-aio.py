@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.utils.domutils
+from pyxb.utils import six
+import sys
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="tRecord">
+    <xs:sequence>
+      <xs:element name="item" type="xs:string" maxOccurs="unbounded"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="record" type="tRecord"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+class _Writer (object):
+    def __init__ (self, loop):
+        self.loop = loop
+        self.chunks = []
+        self.drains = 0
+
+    def write (self, data):
+        self.chunks.append(data)
+
+    def drain (self):
+        self.drains += 1
+        f = self.loop.create_future()
+        f.set_result(None)
+        return f
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio coroutines require Python 3.5')
+class TestAsync (unittest.TestCase):
+
+    def setUp (self):
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown (self):
+        self.loop.close()
+
+    def testCreateFromStream (self):
+        import asyncio
+        items = [ 'i%d' % (_i,) for _i in six.moves.range(50) ]
+        xmlt = six.u('<record>%s</record>') % (''.join([ '<item>%s</item>' % (_i,) for _i in items ]),)
+        reader = asyncio.StreamReader(loop=self.loop)
+        reader.feed_data(xmlt.encode('utf-8'))
+        reader.feed_eof()
+        instance = self.loop.run_until_complete(CreateFromStreamAsync(reader))
+        self.assertTrue(isinstance(instance, tRecord))
+        self.assertEqual(items, instance.item)
+
+    def testToxmlAsync (self):
+        instance = record()
+        for i in six.moves.range(20):
+            instance.item.append('x%d' % (i,))
+        writer = _Writer(self.loop)
+        import pyxb.binding.aio
+        self.loop.run_until_complete(pyxb.binding.aio.WriteAsync(instance, writer, chunk_size=32))
+        self.assertEqual(instance.toxml('utf-8'), six.b('').join(writer.chunks))
+        self.assertEqual(len(writer.chunks), writer.drains)
+        self.assertTrue(1 < writer.drains)
+        writer = _Writer(self.loop)
+        self.loop.run_until_complete(instance.toxml_async(writer, root_only=True))
+        self.assertEqual(instance.toxml('utf-8', root_only=True), six.b('').join(writer.chunks))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.utils.domutils
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="tBounded">
+    <xs:sequence>
+      <xs:element name="head" type="xs:string" minOccurs="0"/>
+      <xs:element name="item" type="xs:int" minOccurs="2" maxOccurs="50"/>
+      <xs:element name="tail" type="xs:string" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="bounded" type="tBounded"/>
+  <xs:complexType name="tOpen">
+    <xs:sequence>
+      <xs:element name="item" type="xs:int" maxOccurs="unbounded"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="open" type="tOpen"/>
+  <xs:complexType name="tAmbiguous">
+    <xs:sequence>
+      <xs:element name="item" type="xs:int" minOccurs="0" maxOccurs="unbounded"/>
+      <xs:sequence minOccurs="0">
+        <xs:element name="item" type="xs:int"/>
+        <xs:element name="tail" type="xs:string"/>
+      </xs:sequence>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="ambiguous" type="tAmbiguous"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+class TestAppendRun (unittest.TestCase):
+
+    def testBounded (self):
+        item = tBounded._UseForTag('item')
+        instance = tBounded()
+        instance.appendRun(tBounded._UseForTag('head'), [ 'h' ])
+        instance.appendRun(item, six.moves.range(40))
+        instance.appendRun(item, [ '40', 41 ])
+        self.assertEqual(list(six.moves.range(42)), list(instance.item))
+        self.assertEqual(43, len(instance.orderedContent()))
+        self.assertTrue(instance.item[3]._element() is item.elementBinding())
+        self.assertEqual('h', instance.head)
+        instance.tail = 't'
+        xmlt = instance.toxml('utf-8', element_name='bounded')
+        self.assertEqual(list(six.moves.range(42)), list(CreateFromDocument(xmlt).item))
+
+    def testLimit (self):
+        item = tBounded._UseForTag('item')
+        instance = tBounded()
+        try:
+            instance.appendRun(item, six.moves.range(60))
+            self.fail('Run exceeding maxOccurs accepted')
+        except UnrecognizedContentError as e:
+            self.assertEqual(50, e.value)
+        # Values up to the limit were accepted
+        self.assertEqual(50, len(instance.item))
+        self.assertRaises(UnrecognizedContentError, instance.appendRun, item, [ 1 ])
+
+    def testInvalidValue (self):
+        item = tBounded._UseForTag('item')
+        instance = tBounded()
+        self.assertRaises(SimpleTypeValueError, instance.appendRun, item, [ 1, 'two', 3 ])
+
+    def testInvalidValueInRun (self):
+        item = tBounded._UseForTag('item')
+        instance = tBounded()
+        self.assertRaises(SimpleTypeValueError, instance.appendRun, item, [ 1, 2, 'abc', 4 ])
+        # As with append for each value, the preceding values are retained
+        self.assertEqual([1, 2], list(instance.item))
+        self.assertEqual(2, len(instance.orderedContent()))
+        instance.append(7, _element_decl=item)
+        self.assertEqual([1, 2, 7], list(instance.item))
+        # The automaton counted only the stored values
+        instance.appendRun(item, six.moves.range(47))
+        self.assertEqual(50, len(instance.item))
+        self.assertRaises(UnrecognizedContentError, instance.appendRun, item, [ 1 ])
+        self.assertTrue(instance.validateBinding())
+
+    def testInvalidValueNoValidation (self):
+        item = tOpen._UseForTag('item')
+        instance = tOpen()
+        instance._validationConfig_ = instance._validationConfig.copy()
+        instance._validationConfig_._setForBinding(False)
+        self.assertRaises(SimpleTypeValueError, instance.appendRun, item, [ 1, 2, 'abc', 4 ])
+        self.assertEqual([1, 2], list(instance.item))
+        self.assertEqual(2, len(instance.orderedContent()))
+
+    def testUnbounded (self):
+        item = tOpen._UseForTag('item')
+        instance = tOpen()
+        instance.appendRun(item, six.moves.range(1000))
+        instance.appendRun(item, six.moves.range(1000))
+        self.assertEqual(2000, len(instance.item))
+        self.assertEqual(2000, len(instance.orderedContent()))
+        self.assertTrue(instance.validateBinding())
+
+    def testAmbiguous (self):
+        item = tAmbiguous._UseForTag('item')
+        instance = tAmbiguous()
+        instance.appendRun(item, six.moves.range(5))
+        # Each value was matched separately
+        self.assertTrue(1 < instance._automatonConfiguration().nondeterminismCount())
+        instance.appendRun(tAmbiguous._UseForTag('tail'), [ 't' ])
+        self.assertEqual(1, instance._automatonConfiguration().nondeterminismCount())
+        self.assertEqual(list(six.moves.range(5)), list(instance.item))
+        self.assertEqual('t', instance.tail)
+        self.assertEqual(6, len(instance.orderedContent()))
+
+    def testNoValidation (self):
+        item = tOpen._UseForTag('item')
+        instance = tOpen()
+        instance._validationConfig_ = instance._validationConfig.copy()
+        instance._validationConfig_._setForBinding(False)
+        instance.appendRun(item, [ '1', 2 ])
+        self.assertEqual([1, 2], list(instance.item))
+        self.assertEqual(2, len(instance.orderedContent()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.bulk
+from pyxb.utils import six
+import operator
+import os
+import shutil
+import sys
+import tempfile
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns:tns="urn:test-bulk"
+           targetNamespace="urn:test-bulk">
+  <xs:complexType name="tRecord">
+    <xs:sequence>
+      <xs:element name="item" type="xs:string" maxOccurs="unbounded"/>
+    </xs:sequence>
+    <xs:attribute name="id" type="xs:int"/>
+  </xs:complexType>
+  <xs:element name="record" type="tns:tRecord"/>
+</xs:schema>
+'''
+
+import unittest
+
+@unittest.skipIf(sys.version_info < (3, 7), 'worker initializers require Python 3.7')
+class TestBulk (unittest.TestCase):
+
+    ModuleName = 'bulk_test_bindings'
+
+    @classmethod
+    def setUpClass (cls):
+        # Worker processes must be able to import the bindings by name.
+        cls.directory = tempfile.mkdtemp()
+        code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+        with open(os.path.join(cls.directory, cls.ModuleName + '.py'), 'w') as f:
+            f.write(code)
+        sys.path.insert(0, cls.directory)
+
+    @classmethod
+    def tearDownClass (cls):
+        sys.path.remove(cls.directory)
+        sys.modules.pop(cls.ModuleName, None)
+        shutil.rmtree(cls.directory)
+
+    def documents (self, count):
+        return [ six.u('<tns:record xmlns:tns="urn:test-bulk" id="%d"><item>v%d</item></tns:record>') % (_i, _i) for _i in six.moves.range(count) ]
+
+    def testInstances (self):
+        import importlib
+        bindings = importlib.import_module(self.ModuleName)
+        instances = pyxb.binding.bulk.ParseMany(bindings, self.documents(10), workers=2)
+        self.assertEqual(10, len(instances))
+        for (i, instance) in enumerate(instances):
+            self.assertTrue(isinstance(instance, bindings.tRecord))
+            self.assertEqual(i, instance.id)
+            self.assertEqual(['v%d' % (i,)], instance.item)
+
+    def testReducer (self):
+        docs = self.documents(25)
+        ids = pyxb.binding.bulk.ParseMany(self.ModuleName, docs, workers=3, chunksize=4, reducer=operator.attrgetter('id'))
+        self.assertEqual(list(six.moves.range(25)), ids)
+
+    def testFailure (self):
+        docs = self.documents(3)
+        docs[1] = six.u('<tns:record xmlns:tns="urn:test-bulk" id="1"/>')
+        self.assertRaises(pyxb.IncompleteElementContentError, pyxb.binding.bulk.ParseMany, self.ModuleName, docs, workers=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import xml.dom.minidom
+import xml.etree.ElementTree
+import pyxb.binding.generate
+import pyxb.utils.domutils
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:c14n" xmlns:tns="urn:c14n" elementFormDefault="qualified">
+  <xs:complexType name="tItem">
+    <xs:simpleContent>
+      <xs:extension base="xs:string">
+        <xs:attribute name="ref" type="xs:QName"/>
+        <xs:attribute name="n" type="xs:int"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:complexType name="tRoot" mixed="true">
+    <xs:sequence>
+      <xs:element name="item" type="tns:tItem" maxOccurs="unbounded"/>
+      <xs:element name="empty" type="xs:string" minOccurs="0" nillable="true"/>
+      <xs:any namespace="##other" processContents="lax" minOccurs="0" maxOccurs="unbounded"/>
+    </xs:sequence>
+    <xs:attribute name="label" type="xs:string"/>
+    <xs:anyAttribute namespace="##other" processContents="lax"/>
+  </xs:complexType>
+  <xs:element name="root" type="tns:tRoot"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+XSI_URI = 'http://www.w3.org/2001/XMLSchema-instance'
+
+xmlt = six.u('''<root xmlns="urn:c14n" xmlns:o="urn:other" o:extra="1" label="a&quot;b&lt;">text &amp; more<item ref="o:thing" n="3">x&gt;y</item><item/><empty xmlns:xsi="%s" xsi:nil="true"/><o:blob q="1"><o:inner>t</o:inner></o:blob><o:blob/></root>''' % (XSI_URI,))
+
+class TestC14N (unittest.TestCase):
+
+    def canonicalize (self, instance, **kw):
+        return six.b(xml.etree.ElementTree.canonicalize(instance.toxml('utf-8').decode('utf-8'), **kw))
+
+    def testExclusive (self):
+        instance = CreateFromDocument(xmlt)
+        text = instance.toc14n()
+        self.assertEqual(self.canonicalize(instance), text)
+        self.assertTrue(text.startswith(six.b('<ns1:root xmlns:ns1="urn:c14n" xmlns:ns2="urn:other" label=')))
+        # Namespaces used only by children are declared on each of them
+        self.assertTrue(six.b('<ns1:empty xmlns:xsi="%s" xsi:nil="true"></ns1:empty>' % (XSI_URI,)) in text)
+        bds = pyxb.utils.domutils.BindingDOMSupport(default_namespace=Namespace)
+        text = instance.toc14n(bds=bds)
+        self.assertTrue(text.startswith(six.b('<root xmlns="urn:c14n" xmlns:ns1="urn:other" label="a&quot;b&lt;" ns1:extra="1">text')))
+        self.assertTrue(six.b('<ns1:blob q="1"><ns1:inner>t</ns1:inner></ns1:blob><ns1:blob></ns1:blob></root>') in text)
+
+    def testSubtree (self):
+        instance = CreateFromDocument(xmlt)
+        # The prefix in the QName value is not visibly utilized
+        self.assertEqual(six.b('<ns1:item xmlns:ns1="urn:c14n" n="3" ref="ns2:thing">x&gt;y</ns1:item>'), instance.item[0].toc14n())
+        bds = pyxb.utils.domutils.BindingDOMSupport(namespace_prefix_map={ 'o': pyxb.namespace.NamespaceForURI('urn:other', create_if_missing=True) })
+        self.assertEqual(six.b('<ns1:item xmlns:ns1="urn:c14n" xmlns:o="urn:other" n="3" ref="o:thing">x&gt;y</ns1:item>'), instance.item[0].toc14n(inclusive_prefixes=['o'], bds=bds))
+
+    def testInclusivePrefixes (self):
+        instance = CreateFromDocument(xmlt)
+        text = instance.toc14n(inclusive_prefixes='xsi undeclared')
+        self.assertTrue(text.startswith(six.b('<ns1:root xmlns:ns1="urn:c14n" xmlns:ns2="urn:other" xmlns:xsi="%s" label=' % (XSI_URI,))))
+        self.assertTrue(six.b('<ns1:empty xsi:nil="true">') in text)
+        bds = pyxb.utils.domutils.BindingDOMSupport(default_namespace=Namespace)
+        text = instance.toc14n(inclusive_prefixes=['#default'], bds=bds)
+        # The default namespace is retained on elements in other namespaces
+        self.assertTrue(six.b('<ns1:blob q="1">') in text)
+        self.assertEqual(instance.toc14n(exclusive=False), instance.toc14n(inclusive_prefixes='ns1 ns2 xsi'))
+
+    def testInclusive (self):
+        instance = CreateFromDocument(xmlt)
+        text = instance.toc14n(exclusive=False)
+        self.assertTrue(text.startswith(six.b('<ns1:root xmlns:ns1="urn:c14n" xmlns:ns2="urn:other" xmlns:xsi="%s" label="a&quot;b&lt;" ns2:extra="1">' % (XSI_URI,))))
+        self.assertEqual(3, text.count(six.b('xmlns:')))
+
+    def testComments (self):
+        instance = CreateFromDocument(xmlt)
+        instance.append(xml.dom.minidom.parseString('<note xmlns="urn:other"><!--note--><inner/></note>').documentElement)
+        self.assertFalse(six.b('<!--') in instance.toc14n())
+        text = instance.toc14n(with_comments=True)
+        self.assertTrue(text.endswith(six.b('<ns2:note><!--note--><ns2:inner></ns2:inner></ns2:note></ns1:root>')))
+        self.assertEqual(instance.toc14n(), text.replace(six.b('<!--note-->'), six.b('')))
+        self.assertFalse(six.b('xmlns:xmlns') in instance.toc14n(exclusive=False))
+
+    def testNormalization (self):
+        instance = CreateFromDocument(six.u('<root xmlns="urn:c14n" label="a&#9;b&#10;c&#13;d é">1 &lt; 2 &#13;\n<item n="1">"q" &amp; &gt;</item></root>'))
+        self.assertEqual(six.u('<ns1:root xmlns:ns1="urn:c14n" label="a&#x9;b&#xA;c&#xD;d é">1 &lt; 2 &#xD;\n<ns1:item n="1">"q" &amp; &gt;</ns1:item></ns1:root>').encode('utf-8'), instance.toc14n())
+
+if __name__ == '__main__':
+    unittest.main()
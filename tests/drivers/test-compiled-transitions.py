@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.utils.domutils
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="tBounded">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int" maxOccurs="3"/>
+      <xs:element name="b" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="bounded" type="tBounded"/>
+  <xs:complexType name="tAmbiguous">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int" minOccurs="0" maxOccurs="unbounded"/>
+      <xs:sequence minOccurs="0">
+        <xs:element name="a" type="xs:int"/>
+        <xs:element name="b" type="xs:int"/>
+      </xs:sequence>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="ambiguous" type="tAmbiguous"/>
+  <xs:complexType name="tOpen">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int"/>
+      <xs:any processContents="lax" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="open" type="tOpen"/>
+  <xs:complexType name="tAll">
+    <xs:all>
+      <xs:element name="a" type="xs:int"/>
+      <xs:element name="b" type="xs:int"/>
+    </xs:all>
+  </xs:complexType>
+  <xs:element name="all" type="tAll"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+class TestCompiledTransitions (unittest.TestCase):
+
+    def testAvailability (self):
+        self.assertTrue(tBounded._Automaton.compiledTransitions() is not None)
+        self.assertTrue(tAmbiguous._Automaton.compiledTransitions() is not None)
+        self.assertTrue(tAll._Automaton.compiledTransitions() is None)
+        table = tOpen._Automaton.compiledTransitions()
+        self.assertTrue(table[None] is not None)
+        # The state reached on a has a wildcard transition, so cannot use
+        # the table.
+        (xit,) = table[None][tOpen._UseForTag('a')]
+        self.assertTrue(table[xit.destination] is None)
+
+    def testCounters (self):
+        instance = CreateFromDocument(six.u('<bounded><a>1</a><a>2</a><a>3</a><b>4</b></bounded>'))
+        self.assertEqual([1, 2, 3], instance.a)
+        self.assertEqual(4, instance.b)
+        self.assertRaises(UnrecognizedContentError, CreateFromDocument, six.u('<bounded><a>1</a><a>2</a><a>3</a><a>4</a></bounded>'))
+        self.assertRaises(UnrecognizedContentError, CreateFromDocument, six.u('<bounded><a>1</a><b>2</b><b>3</b></bounded>'))
+        self.assertRaises(UnrecognizedContentError, CreateFromDocument, six.u('<bounded><b>2</b></bounded>'))
+
+    def testNondeterministic (self):
+        instance = CreateFromDocument(six.u('<ambiguous><a>1</a><a>2</a><a>3</a><b>4</b></ambiguous>'))
+        self.assertEqual([1, 2, 3], instance.a)
+        self.assertEqual(4, instance.b)
+        instance = CreateFromDocument(six.u('<ambiguous><a>1</a><a>2</a></ambiguous>'))
+        self.assertEqual([1, 2], instance.a)
+        self.assertTrue(instance.b is None)
+
+    def testWildcard (self):
+        instance = CreateFromDocument(six.u('<open><a>1</a><other/></open>'))
+        self.assertEqual(1, instance.a)
+        self.assertEqual(1, len(instance.wildcardElements()))
+
+    def testAll (self):
+        instance = CreateFromDocument(six.u('<all><b>2</b><a>1</a></all>'))
+        self.assertEqual(1, instance.a)
+        self.assertEqual(2, instance.b)
+
+if __name__ == '__main__':
+    unittest.main()
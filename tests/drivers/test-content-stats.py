@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.content
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="tBounded">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int" maxOccurs="3"/>
+      <xs:element name="b" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="bounded" type="tBounded"/>
+  <xs:complexType name="tAmbiguous">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int" minOccurs="0" maxOccurs="unbounded"/>
+      <xs:sequence minOccurs="0">
+        <xs:element name="a" type="xs:int"/>
+        <xs:element name="b" type="xs:int"/>
+      </xs:sequence>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="ambiguous" type="tAmbiguous"/>
+  <xs:complexType name="tChoice">
+    <xs:choice>
+      <xs:element name="a" type="xs:int"/>
+      <xs:sequence>
+        <xs:element name="a" type="xs:int"/>
+        <xs:element name="b" type="xs:int" minOccurs="0"/>
+      </xs:sequence>
+    </xs:choice>
+  </xs:complexType>
+  <xs:element name="choice" type="tChoice"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+Stats = pyxb.binding.content.Stats
+
+class TestContentStats (unittest.TestCase):
+
+    def setUp (self):
+        Stats.Reset()
+        Stats.Enable()
+
+    def tearDown (self):
+        Stats.Enable(False)
+        Stats.Reset()
+
+    def testDisabled (self):
+        Stats.Enable(False)
+        self.assertFalse(Stats.IsEnabled())
+        CreateFromDocument(six.u('<bounded><a>1</a></bounded>'))
+        self.assertEqual({}, Stats.Snapshot())
+
+    def testDeterministic (self):
+        self.assertTrue(Stats.IsEnabled())
+        CreateFromDocument(six.u('<bounded><a>1</a><a>2</a><b>3</b></bounded>'))
+        counts = Stats.Snapshot()[tBounded]
+        self.assertEqual(3, counts['steps'])
+        self.assertEqual(3, counts['fastSteps'])
+        self.assertEqual(0, counts['nondeterministicSteps'])
+        self.assertEqual(0, counts['clones'])
+        self.assertEqual(0, counts['ambiguousResolutions'])
+        self.assertRaises(UnrecognizedContentError, CreateFromDocument, six.u('<bounded><b>3</b></bounded>'))
+        self.assertEqual(1, Stats.Snapshot()[tBounded]['rejections'])
+
+    def testNondeterministic (self):
+        CreateFromDocument(six.u('<ambiguous><a>1</a><a>2</a><a>3</a><b>4</b></ambiguous>'))
+        counts = Stats.Snapshot()[tAmbiguous]
+        self.assertEqual(4, counts['steps'])
+        self.assertEqual(3, counts['nondeterministicSteps'])
+        self.assertTrue(1 < counts['peakWidth'])
+        self.assertEqual(pyxb.binding.content.AutomatonConfiguration.PermittedNondeterminism, counts['permittedNondeterminism'])
+        self.assertTrue(0 < counts['clones'])
+        # The b element left a single configuration
+        self.assertEqual(0, counts['resolutions'])
+        CreateFromDocument(six.u('<ambiguous><a>1</a><a>2</a></ambiguous>'))
+        counts = Stats.Snapshot()[tAmbiguous]
+        self.assertEqual(1, counts['resolutions'])
+        # Only the path with all a elements in the first particle accepts
+        self.assertEqual(0, counts['ambiguousResolutions'])
+
+    def testAmbiguousResolution (self):
+        # A lone a element satisfies either branch of the choice
+        instance = CreateFromDocument(six.u('<choice><a>1</a></choice>'))
+        self.assertEqual(1, instance.a)
+        counts = Stats.Snapshot()[tChoice]
+        self.assertEqual(1, counts['resolutions'])
+        self.assertEqual(1, counts['ambiguousResolutions'])
+
+    def testReset (self):
+        CreateFromDocument(six.u('<bounded><a>1</a></bounded>'))
+        snapshot = Stats.Snapshot()
+        self.assertTrue(tBounded in snapshot)
+        Stats.Reset()
+        self.assertEqual({}, Stats.Snapshot())
+        # Snapshots are not affected by later collection
+        self.assertEqual(1, snapshot[tBounded]['steps'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.content
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="tBounded">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int" maxOccurs="3"/>
+      <xs:element name="b" type="xs:int" minOccurs="0" maxOccurs="unbounded"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="bounded" type="tBounded"/>
+  <xs:complexType name="tAmbiguous">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int" minOccurs="0" maxOccurs="unbounded"/>
+      <xs:sequence minOccurs="0">
+        <xs:element name="a" type="xs:int"/>
+        <xs:element name="b" type="xs:int"/>
+      </xs:sequence>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="ambiguous" type="tAmbiguous"/>
+  <xs:complexType name="tTrailing">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int"/>
+      <xs:any processContents="lax" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="trailing" type="tTrailing"/>
+  <xs:complexType name="tOverlap">
+    <xs:choice>
+      <xs:element name="a" type="xs:int"/>
+      <xs:any processContents="lax"/>
+    </xs:choice>
+  </xs:complexType>
+  <xs:element name="overlap" type="tOverlap"/>
+  <xs:complexType name="tAll">
+    <xs:all>
+      <xs:element name="a" type="xs:int"/>
+      <xs:element name="b" type="xs:int"/>
+    </xs:all>
+  </xs:complexType>
+  <xs:element name="all" type="tAll"/>
+  <xs:complexType name="tExtended">
+    <xs:complexContent>
+      <xs:extension base="tBounded">
+        <xs:sequence>
+          <xs:element name="b" type="xs:int" minOccurs="0"/>
+        </xs:sequence>
+      </xs:extension>
+    </xs:complexContent>
+  </xs:complexType>
+  <xs:element name="extended" type="tExtended"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+class TestDeterministicContent (unittest.TestCase):
+
+    def testFlags (self):
+        self.assertFalse(pyxb.binding.basis.complexTypeDefinition._AutomatonIsDeterministic)
+        self.assertTrue(tBounded._AutomatonIsDeterministic)
+        self.assertTrue(tTrailing._AutomatonIsDeterministic)
+        self.assertFalse(tAmbiguous._AutomatonIsDeterministic)
+        self.assertFalse(tOverlap._AutomatonIsDeterministic)
+        self.assertFalse(tAll._AutomatonIsDeterministic)
+        # The extension permits b in two places after a
+        self.assertFalse(tExtended._AutomatonIsDeterministic)
+
+    def testBounded (self):
+        instance = CreateFromDocument(six.u('<bounded><a>1</a><a>2</a><b>3</b><b>4</b></bounded>'))
+        self.assertEqual([1, 2], instance.a)
+        self.assertEqual([3, 4], instance.b)
+        self.assertRaises(UnrecognizedContentError, CreateFromDocument, six.u('<bounded><a>1</a><a>2</a><a>3</a><a>4</a></bounded>'))
+        self.assertRaises(UnrecognizedContentError, CreateFromDocument, six.u('<bounded><a>1</a><b>2</b><a>3</a></bounded>'))
+        self.assertRaises(UnrecognizedContentError, CreateFromDocument, six.u('<bounded><b>2</b></bounded>'))
+
+    def testWildcard (self):
+        instance = CreateFromDocument(six.u('<trailing><a>1</a><other/></trailing>'))
+        self.assertEqual(1, instance.a)
+        self.assertEqual(1, len(instance.wildcardElements()))
+        instance = CreateFromDocument(six.u('<overlap><other/></overlap>'))
+        self.assertEqual(1, len(instance.wildcardElements()))
+
+    def testExtended (self):
+        instance = CreateFromDocument(six.u('<extended><a>1</a><b>2</b></extended>'))
+        self.assertEqual(1, instance.a[0])
+
+    def testConstructed (self):
+        instance = tBounded()
+        instance.a.append(1)
+        instance.a.append(2)
+        instance.b.append(3)
+        xmlt = instance.toxml('utf-8', element_name='bounded')
+        instance = CreateFromDocument(xmlt)
+        self.assertEqual([1, 2], instance.a)
+        self.assertEqual([3], instance.b)
+
+if __name__ == '__main__':
+    unittest.main()
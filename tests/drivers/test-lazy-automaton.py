@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.content
+import pyxb.utils.fac
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="tSequence">
+    <xs:sequence>
+      <xs:element name="a" type="xs:int"/>
+      <xs:element name="b" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="sequence" type="tSequence"/>
+  <xs:complexType name="tAll">
+    <xs:all>
+      <xs:element name="a" type="xs:int"/>
+      <xs:element name="b" type="xs:int"/>
+    </xs:all>
+  </xs:complexType>
+  <xs:element name="all" type="tAll"/>
+  <xs:complexType name="tUnused">
+    <xs:sequence>
+      <xs:element name="c" type="xs:int"/>
+    </xs:sequence>
+  </xs:complexType>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+class TestLazyAutomaton (unittest.TestCase):
+
+    def testDeferred (self):
+        self.assertTrue(isinstance(tUnused.__dict__['_Automaton'], pyxb.binding.content.LazyAutomaton))
+        # The builder remains available until it is used
+        self.assertTrue([ _n for _n in globals() if _n.startswith('_BuildAutomaton') ])
+
+    def testBuilt (self):
+        instance = CreateFromDocument(six.u('<sequence><a>1</a><b>2</b></sequence>'))
+        self.assertEqual(2, instance.b)
+        au = tSequence.__dict__['_Automaton']
+        self.assertTrue(isinstance(au, pyxb.utils.fac.Automaton))
+        self.assertTrue(au is tSequence._Automaton)
+        instance = CreateFromDocument(six.u('<all><b>2</b><a>1</a></all>'))
+        self.assertEqual(1, instance.a)
+        self.assertTrue(isinstance(tAll.__dict__['_Automaton'], pyxb.utils.fac.Automaton))
+
+    def testInherited (self):
+        au = pyxb.utils.fac.Automaton([], [], True)
+        builds = []
+        def builder ():
+            builds.append(True)
+            return au
+        class Base (pyxb.binding.basis.complexTypeDefinition):
+            pass
+        Base._Automaton = pyxb.binding.content.LazyAutomaton(builder)
+        class Derived (Base):
+            pass
+        self.assertTrue(au is Derived._Automaton)
+        # The descriptor was replaced where it was defined
+        self.assertTrue(au is Base.__dict__['_Automaton'])
+        self.assertFalse('_Automaton' in Derived.__dict__)
+        self.assertTrue(au is Base._Automaton)
+        self.assertEqual(1, len(builds))
+
+    def testThreads (self):
+        import threading
+        builds = []
+        def builder ():
+            builds.append(True)
+            return pyxb.utils.fac.Automaton([], [], True)
+        lazy = pyxb.binding.content.LazyAutomaton(builder)
+        results = []
+        threads = [ threading.Thread(target=lambda: results.append(lazy.automaton())) for _i in six.moves.range(8) ]
+        [ _t.start() for _t in threads ]
+        [ _t.join() for _t in threads ]
+        self.assertEqual(1, len(builds))
+        self.assertEqual(1, len(set(map(id, results))))
+
+if __name__ == '__main__':
+    unittest.main()
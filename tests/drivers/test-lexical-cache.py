@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.datatypes as xs
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:simpleType name="tWhens">
+    <xs:list itemType="xs:dateTime"/>
+  </xs:simpleType>
+  <xs:complexType name="tRecord">
+    <xs:sequence>
+      <xs:element name="when" type="xs:dateTime"/>
+      <xs:element name="amount" type="xs:decimal"/>
+      <xs:element name="data" type="xs:base64Binary"/>
+      <xs:element name="whens" type="tWhens" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="record" type="tRecord"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+xmlt = six.u('<record><when>2020-01-02T03:04:05.5Z</when><amount>001.50</amount><data>AQID</data></record>')
+
+class TestLexicalCache (unittest.TestCase):
+
+    def setUp (self):
+        pyxb.binding.basis.simpleTypeDefinition._CacheLexicalForm = True
+
+    def tearDown (self):
+        pyxb.binding.basis.simpleTypeDefinition._CacheLexicalForm = False
+
+    def testDisabled (self):
+        pyxb.binding.basis.simpleTypeDefinition._CacheLexicalForm = False
+        instance = CreateFromDocument(xmlt)
+        self.assertTrue(instance.when._lexicalForm() is None)
+        self.assertEqual('2020-01-02T03:04:05.5Z', instance.when.xsdLiteral())
+        self.assertTrue(instance.when._lexicalForm() is None)
+
+    def testParsed (self):
+        instance = CreateFromDocument(xmlt)
+        self.assertEqual('2020-01-02T03:04:05.5Z', instance.when._lexicalForm())
+        self.assertEqual('AQID', instance.data._lexicalForm())
+        # Not canonical, so not retained until it is formatted
+        self.assertTrue(instance.amount._lexicalForm() is None)
+        self.assertEqual('1.5', instance.amount.xsdLiteral())
+        self.assertEqual('1.5', instance.amount._lexicalForm())
+        self.assertEqual(instance.toxml('utf-8'), CreateFromDocument(instance.toxml('utf-8')).toxml('utf-8'))
+
+    def testDecimalDigits (self):
+        # 28 significant digits are retained; 29 are rounded by XsdLiteral
+        for text in ('123456789012345678901234567.5', '1234567890123456789012345678.5'):
+            value = xs.decimal(text, _from_xml=True)
+            self.assertEqual(xs.decimal.XsdLiteral(value), value.xsdLiteral())
+        self.assertEqual('123456789012345678901234567.5', xs.decimal('123456789012345678901234567.5', _from_xml=True)._lexicalForm())
+        self.assertTrue(xs.decimal('1234567890123456789012345678.5', _from_xml=True)._lexicalForm() is None)
+
+    def testCanonical (self):
+        self.assertTrue(xs.decimal._IsCanonicalLexical('-1.5'))
+        self.assertFalse(xs.decimal._IsCanonicalLexical('1.50'))
+        self.assertFalse(xs.decimal._IsCanonicalLexical('15'))
+        self.assertTrue(xs.decimal._IsCanonicalLexical('-123456789012345678901234567.5'))
+        self.assertFalse(xs.decimal._IsCanonicalLexical('1234567890123456789012345678.5'))
+        self.assertTrue(xs.dateTime._IsCanonicalLexical('2020-01-02T03:04:05Z'))
+        self.assertFalse(xs.dateTime._IsCanonicalLexical('2020-01-02T03:04:05.50Z'))
+        self.assertFalse(xs.dateTime._IsCanonicalLexical('2020-01-02T03:04:05+01:00'))
+        self.assertFalse(xs.base64Binary._IsCanonicalLexical('AQI D'))
+        self.assertFalse(xs.base64Binary._IsCanonicalLexical('QR=='))
+        self.assertFalse(xs.string._IsCanonicalLexical('text'))
+        self.assertTrue(tWhens._IsCanonicalLexical('2020-01-02T03:04:05Z 2021-01-02T03:04:05Z'))
+        self.assertFalse(tWhens._IsCanonicalLexical('2020-01-02T03:04:05Z  2021-01-02T03:04:05Z'))
+
+    def testListChange (self):
+        instance = CreateFromDocument(xmlt)
+        instance.whens = tWhens()
+        whens = instance.whens
+        for text in ('2020-01-02T03:04:05Z', '2021-01-02T03:04:05Z'):
+            whens.append(xs.dateTime(text))
+        self.assertEqual('2020-01-02T03:04:05Z 2021-01-02T03:04:05Z', whens.xsdLiteral())
+        whens.append(xs.dateTime('2022-01-02T03:04:05Z'))
+        self.assertTrue(whens._lexicalForm() is None)
+        self.assertEqual('2020-01-02T03:04:05Z 2021-01-02T03:04:05Z 2022-01-02T03:04:05Z', whens.xsdLiteral())
+        for mutate in (lambda _l: _l.pop(), lambda _l: _l.reverse(), lambda _l: _l.__delitem__(0),
+                       lambda _l: _l.__setitem__(0, '2019-01-02T03:04:05Z'), lambda _l: _l.sort()):
+            self.assertFalse(whens._lexicalForm() is None)
+            mutate(whens)
+            self.assertTrue(whens._lexicalForm() is None)
+            self.assertEqual(' '.join([ _v.xsdLiteral() for _v in whens ]), whens.xsdLiteral())
+        self.assertTrue(six.b('<whens>2019-01-02T03:04:05Z</whens>') in instance.toxml('utf-8'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.saxer
+import pyxb.utils.utility
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="tRecord">
+    <xs:sequence>
+      <xs:element name="item" type="xs:string" maxOccurs="2"/>
+      <xs:element name="count" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="record" type="tRecord"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+xmlt = six.u('''<record>
+  <item>one</item>
+  <item>two</item>
+</record>''')
+
+badt = six.u('''<record>
+  <item>one</item>
+  <count>x</count>
+</record>''')
+
+def Parse (text, **kw):
+    saxer = pyxb.binding.saxer.make_parser(fallback_namespace=Namespace.fallbackNamespace(), location_base='doc.xml', **kw)
+    handler = saxer.getContentHandler()
+    pyxb.utils.saxutils.ParseSource(saxer, text)
+    return handler.rootObject()
+
+class TestLocationCapture (unittest.TestCase):
+
+    def tearDown (self):
+        pyxb._SetLocationCapture()
+
+    def checkFull (self, instance):
+        loc = instance.item[1]._location()
+        self.assertTrue(isinstance(loc, pyxb.utils.utility.Location))
+        self.assertEqual('doc.xml', loc.locationBase)
+        self.assertEqual(3, loc.lineNumber)
+        self.assertEqual(2, loc.columnNumber)
+
+    def testFull (self):
+        self.checkFull(Parse(xmlt))
+
+    def testCompact (self):
+        instance = Parse(xmlt, location_capture=pyxb.LocationCapture_compact)
+        self.assertTrue(isinstance(instance.item[1]._Locatable_mixin__location, tuple))
+        self.checkFull(instance)
+        self.assertTrue(instance.item[1]._location() is instance.item[1]._location())
+
+    def testNone (self):
+        instance = Parse(xmlt, location_capture=pyxb.LocationCapture_none)
+        self.assertEqual(['one', 'two'], instance.item)
+        self.assertTrue(instance._location() is None)
+        self.assertTrue(instance.item[1]._location() is None)
+
+    def testErrorLocation (self):
+        for capture in (pyxb.LocationCapture_full, pyxb.LocationCapture_compact):
+            try:
+                Parse(badt, location_capture=capture)
+                self.fail('Parse succeeded')
+            except SimpleTypeValueError as e:
+                self.assertTrue(isinstance(e.location, pyxb.utils.utility.Location))
+                self.assertEqual(3, e.location.lineNumber)
+        try:
+            Parse(badt, location_capture=pyxb.LocationCapture_none)
+            self.fail('Parse succeeded')
+        except SimpleTypeValueError as e:
+            self.assertTrue(e.location is None)
+
+    def testGlobal (self):
+        pyxb._SetLocationCapture(pyxb.LocationCapture_none)
+        instance = CreateFromDocument(xmlt)
+        self.assertTrue(instance.item[0]._location() is None)
+        pyxb._SetLocationCapture()
+        instance = CreateFromDocument(xmlt)
+        self.assertTrue(isinstance(instance.item[0]._location(), pyxb.utils.utility.Location))
+        self.assertRaises(pyxb.PyXBException, pyxb._SetLocationCapture, 7)
+        self.assertRaises(pyxb.UsageError, pyxb.binding.saxer.make_parser, location_capture=7)
+
+if __name__ == '__main__':
+    unittest.main()
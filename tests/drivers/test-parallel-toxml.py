@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.writer
+import pyxb.namespace
+import pyxb.utils.domutils
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:parallel" xmlns:tns="urn:parallel" elementFormDefault="qualified">
+  <xs:complexType name="tMember">
+    <xs:simpleContent>
+      <xs:extension base="xs:string">
+        <xs:attribute name="ref" type="xs:QName"/>
+        <xs:attribute name="n" type="xs:int"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:complexType name="tModel">
+    <xs:sequence>
+      <xs:element name="name" type="xs:string"/>
+      <xs:element name="member" type="tns:tMember" minOccurs="0" maxOccurs="unbounded"/>
+    </xs:sequence>
+    <xs:attribute name="label" type="xs:string"/>
+  </xs:complexType>
+  <xs:element name="model" type="tns:tModel"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+Other = pyxb.namespace.NamespaceForURI('urn:parallel-other', create_if_missing=True)
+
+class TestParallelToxml (unittest.TestCase):
+
+    def makeModel (self, count):
+        instance = model('city', label='a&b')
+        for i in six.moves.range(count):
+            instance.member.append(tMember(six.u('m%d é') % (i,), n=i))
+        return instance
+
+    def testSameAsToxml (self):
+        instance = self.makeModel(1200)
+        # A namespace referenced only near the end of the document
+        instance.member[-1].ref = pyxb.namespace.ExpandedName(Other, 'x')
+        text = instance.toxml('utf-8')
+        self.assertEqual(text, instance.toxml('utf-8', parallel=3))
+        self.assertTrue(six.b('xmlns:ns2="urn:parallel-other"') in text)
+        self.assertEqual(instance.toxml(None), instance.toxml(None, parallel=2))
+        self.assertEqual(instance.toxml('utf-8', root_only=True), instance.toxml('utf-8', root_only=True, parallel=2))
+        bds = pyxb.utils.domutils.BindingDOMSupport(default_namespace=Namespace)
+        text = instance.toxml('utf-8', bds=bds)
+        self.assertTrue(text.startswith(six.b('<?xml version="1.0" encoding="utf-8"?><model ')))
+        self.assertEqual(text, instance.toxml('utf-8', bds=pyxb.utils.domutils.BindingDOMSupport(default_namespace=Namespace), parallel=2))
+
+    def testEncodings (self):
+        instance = self.makeModel(600)
+        for encoding in ('ascii', 'utf-16'):
+            self.assertEqual(instance.toxml(encoding), instance.toxml(encoding, parallel=2))
+
+    def testBlocks (self):
+        instance = self.makeModel(10)
+        text = instance.toxml('utf-8')
+        # Too few children to divide
+        self.assertEqual(text, instance.toxml('utf-8', parallel=2))
+        self.assertEqual(text, pyxb.binding.writer.ParallelDocument(instance, 2, 'utf-8', block_size=2))
+        self.assertEqual(text, pyxb.binding.writer.ParallelDocument(instance, 8, 'utf-8', block_size=1))
+        self.assertEqual(text, instance.toxml('utf-8', parallel=1))
+
+if __name__ == '__main__':
+    unittest.main()
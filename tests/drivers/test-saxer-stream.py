@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.binding.saxer
+import pyxb.utils.saxutils
+import pyxb.utils.domutils
+from pyxb.utils import six
+import io
+import os
+import sys
+import tempfile
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns:tns="urn:test-saxer-stream"
+           targetNamespace="urn:test-saxer-stream"
+           elementFormDefault="qualified">
+  <xs:complexType name="tSchedule">
+    <xs:sequence>
+      <xs:element name="program" type="xs:string"/>
+      <xs:element name="slot" type="xs:int" maxOccurs="unbounded"/>
+    </xs:sequence>
+    <xs:attribute name="station" type="xs:string"/>
+  </xs:complexType>
+  <xs:element name="Schedule" type="tns:tSchedule"/>
+  <xs:complexType name="tListing">
+    <xs:sequence>
+      <xs:element name="title" type="xs:string"/>
+      <xs:element ref="tns:Schedule" maxOccurs="unbounded"/>
+      <xs:element name="trailer" type="xs:string"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="Listing" type="tns:tListing"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+def MakeDocument (count):
+    body = []
+    for i in six.moves.range(count):
+        body.append('<Schedule station="s%d"><program>p%d</program><slot>%d</slot><slot>%d</slot></Schedule>' % (i, i, i, i+1))
+    return six.u('<Listing xmlns="urn:test-saxer-stream"><title>guide</title>%s<trailer>end</trailer></Listing>' % (''.join(body),))
+
+class TestSaxerStream (unittest.TestCase):
+
+    def testIterate (self):
+        xmlt = MakeDocument(20)
+        instances = list(CreateIterFromDocument(io.BytesIO(xmlt.encode('utf-8')), Schedule))
+        self.assertEqual(20, len(instances))
+        for (i, s) in enumerate(instances):
+            self.assertTrue(isinstance(s, tSchedule))
+            self.assertEqual(Schedule.name(), s._element().name())
+            self.assertEqual('s%d' % (i,), s.station)
+            self.assertEqual('p%d' % (i,), s.program)
+            self.assertEqual([i, i+1], list(s.slot))
+
+    def testSmallChunks (self):
+        xmlt = MakeDocument(5)
+        instances = list(pyxb.binding.saxer.IterParse(io.StringIO(xmlt), Schedule, chunk_size=7))
+        self.assertEqual(['p%d' % (_i,) for _i in six.moves.range(5)], [ _s.program for _s in instances ])
+
+    def testIncremental (self):
+        # Instances become available before the document has been read
+        xmlt = MakeDocument(3)
+        source = io.BytesIO(xmlt.encode('utf-8'))
+        it = pyxb.binding.saxer.IterParse(source, Schedule, chunk_size=16)
+        first = next(it)
+        self.assertEqual('p0', first.program)
+        self.assertTrue(source.tell() < len(xmlt))
+        self.assertEqual(2, len(list(it)))
+
+    def testNotRetained (self):
+        xmlt = MakeDocument(4)
+        saxer = pyxb.binding.saxer.make_parser(stream_elements=Schedule.name())
+        handler = saxer.getContentHandler()
+        saxer.feed(xmlt.encode('utf-8'))
+        saxer.close()
+        self.assertEqual(4, len(handler.completedObjects()))
+        self.assertEqual([], handler.completedObjects())
+
+    def testLocalElement (self):
+        xmlt = MakeDocument(3)
+        instances = list(CreateIterFromDocument(xmlt, [ pyxb.namespace.ExpandedName(Namespace, 'program') ]))
+        self.assertEqual(['p0', 'p1', 'p2'], instances)
+
+    def testInvalid (self):
+        xmlt = six.u('<Listing xmlns="urn:test-saxer-stream"><title>guide</title><Schedule><slot>1</slot></Schedule></Listing>')
+        it = CreateIterFromDocument(xmlt, Schedule)
+        self.assertRaises(UnrecognizedContentError, list, it)
+
+class TestBindingPushParser (unittest.TestCase):
+
+    def testWholeDocument (self):
+        xmld = MakeDocument(3).encode('utf-8')
+        parser = pyxb.binding.saxer.BindingPushParser(sys.modules[__name__])
+        for i in six.moves.range(0, len(xmld), 10):
+            parser.feed(xmld[i:i+10])
+            self.assertEqual([], parser.completedObjects())
+        instance = parser.close()
+        self.assertTrue(isinstance(instance, tListing))
+        self.assertEqual(3, len(instance.Schedule))
+        self.assertEqual('end', instance.trailer)
+
+    def testCompleted (self):
+        xmlt = MakeDocument(4)
+        parser = pyxb.binding.saxer.BindingPushParser(stream_elements=Schedule)
+        split = xmlt.index('</Schedule>') + len('</Schedule>')
+        parser.feed(xmlt[:split-1])
+        self.assertEqual([], parser.completedObjects())
+        parser.feed(xmlt[split-1:split])
+        completed = parser.completedObjects()
+        self.assertEqual(1, len(completed))
+        self.assertEqual('p0', completed[0].program)
+        parser.feed(xmlt[split:])
+        self.assertTrue(parser.close() is None)
+        self.assertEqual(['p1', 'p2', 'p3'], [ _s.program for _s in parser.completedObjects() ])
+
+    def testReuse (self):
+        parser = pyxb.binding.saxer.BindingPushParser(sys.modules[__name__])
+        for n in (1, 2):
+            parser.feed(MakeDocument(n))
+            self.assertEqual(n, len(parser.close().Schedule))
+
+class TestDocumentSources (unittest.TestCase):
+
+    def setUp (self):
+        import tempfile
+        self.xmld = MakeDocument(3).encode('utf-8')
+        (fd, self.path) = tempfile.mkstemp(suffix='.xml')
+        os.write(fd, self.xmld)
+        os.close(fd)
+
+    def tearDown (self):
+        os.unlink(self.path)
+        pyxb._SetXMLStyle()
+
+    def checkInstance (self, instance):
+        self.assertTrue(isinstance(instance, tListing))
+        self.assertEqual(['p0', 'p1', 'p2'], [ _s.program for _s in instance.Schedule ])
+
+    def checkSources (self):
+        import mmap
+        self.checkInstance(CreateFromDocument(self.xmld))
+        self.checkInstance(CreateFromDocument(bytearray(self.xmld)))
+        self.checkInstance(CreateFromDocument(memoryview(self.xmld)))
+        with open(self.path, 'rb') as f:
+            self.checkInstance(CreateFromDocument(f))
+        with open(self.path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                self.checkInstance(CreateFromDocument(mm))
+            finally:
+                mm.close()
+        try:
+            import pathlib
+        except ImportError:
+            return
+        self.checkInstance(CreateFromDocument(pathlib.Path(self.path)))
+
+    def testSaxer (self):
+        pyxb._SetXMLStyle(pyxb.XMLStyle_saxer)
+        self.checkSources()
+
+    def testSaxDOM (self):
+        pyxb._SetXMLStyle(pyxb.XMLStyle_saxdom)
+        self.checkSources()
+
+    def testMinidom (self):
+        pyxb._SetXMLStyle(pyxb.XMLStyle_minidom)
+        self.checkSources()
+
+class TestProjection (unittest.TestCase):
+
+    def parse (self, xmlt, projection):
+        saxer = pyxb.binding.saxer.make_parser(projection=projection)
+        handler = saxer.getContentHandler()
+        pyxb.utils.saxutils.ParseSource(saxer, xmlt)
+        return handler.rootObject()
+
+    def testPaths (self):
+        xmlt = MakeDocument(3)
+        ns = Namespace
+        instance = self.parse(xmlt, [ ( Listing, Schedule, pyxb.namespace.ExpandedName(ns, 'program') ) ])
+        self.assertTrue(isinstance(instance, tListing))
+        self.assertTrue(instance.title is None)
+        self.assertTrue(instance.trailer is None)
+        self.assertEqual(['p0', 'p1', 'p2'], [ _s.program for _s in instance.Schedule ])
+        self.assertEqual([ [] ] * 3, [ list(_s.slot) for _s in instance.Schedule ])
+        # Attributes of retained elements are still processed
+        self.assertEqual(['s0', 's1', 's2'], [ _s.station for _s in instance.Schedule ])
+
+    def testSubtree (self):
+        xmlt = MakeDocument(2)
+        instance = self.parse(xmlt, [ ( Listing, Schedule ), ( Listing, Schedule, pyxb.namespace.ExpandedName(Namespace, 'slot') ) ])
+        self.assertTrue(instance.title is None)
+        self.assertEqual([ [0, 1], [1, 2] ], [ list(_s.slot) for _s in instance.Schedule ])
+        self.assertEqual(['p0', 'p1'], [ _s.program for _s in instance.Schedule ])
+
+    def testPredicate (self):
+        xmlt = MakeDocument(2)
+        seen = []
+        def predicate (en):
+            seen.append(en.localName())
+            return 'slot' != en.localName()
+        instance = self.parse(xmlt, predicate)
+        self.assertEqual('guide', instance.title)
+        self.assertEqual('end', instance.trailer)
+        self.assertEqual(['p0', 'p1'], [ _s.program for _s in instance.Schedule ])
+        self.assertEqual([ [], [] ], [ list(_s.slot) for _s in instance.Schedule ])
+        self.assertEqual(['Listing', 'title', 'Schedule', 'program', 'slot', 'slot', 'Schedule', 'program', 'slot', 'slot', 'trailer'], seen)
+
+    def testIgnoredContent (self):
+        # Text, namespace declarations, and unrecognized elements in
+        # ignored subtrees do not affect processing.
+        xmlt = six.u('<t:Listing xmlns:t="urn:test-saxer-stream"><t:title>guide</t:title><t:Schedule xmlns:t="urn:other"><t:unknown>text</t:unknown></t:Schedule><t:trailer>end</t:trailer></t:Listing>')
+        instance = self.parse(xmlt, lambda _en: 'Schedule' != _en.localName())
+        self.assertEqual('guide', instance.title)
+        self.assertEqual('end', instance.trailer)
+        self.assertEqual(0, len(instance.Schedule))
+
+    def testRootExcluded (self):
+        xmlt = MakeDocument(2)
+        # Paths must start with the document element
+        self.assertRaises(pyxb.UsageError, self.parse, xmlt, [ ( Schedule, pyxb.namespace.ExpandedName(Namespace, 'program') ) ])
+        self.assertRaises(pyxb.UsageError, self.parse, xmlt, lambda _en: 'Listing' != _en.localName())
+        saxer = pyxb.binding.saxer.make_parser(projection=lambda _en: 'Listing' != _en.localName())
+        handler = saxer.getContentHandler()
+        pyxb.utils.saxutils.ParseSource(saxer, xmlt)
+        try:
+            handler.rootObject()
+            self.fail('Excluded document element accepted')
+        except pyxb.UsageError as e:
+            self.assertTrue('Listing' in str(e))
+        # The condition does not persist to the next document
+        handler.setProjection(None)
+        pyxb.utils.saxutils.ParseSource(saxer, xmlt)
+        self.assertEqual(2, len(handler.rootObject().Schedule))
+
+def CheckNameCaches (test, parser, caches):
+    limit = pyxb.utils.saxutils.NameCacheLimit
+    pyxb.utils.saxutils.NameCacheLimit = 16
+    try:
+        handler = pyxb.utils.saxutils.BaseSAXHandler()
+        parser.setContentHandler(handler)
+        for i in six.moves.range(20):
+            # Every document has names not seen before
+            xmlt = six.u('<d xmlns="urn:names" a%d="1">%s</d>') % (i, ''.join([ '<e%d_%d/>' % (i, _j) for _j in six.moves.range(5) ]))
+            pyxb.utils.saxutils.ParseSource(parser, xmlt)
+            for cache in caches():
+                test.assertTrue(len(cache) <= 16)
+        test.assertTrue(0 < len(getattr(handler, '_BaseSAXHandler__expandedNames')))
+    finally:
+        pyxb.utils.saxutils.NameCacheLimit = limit
+
+class TestDirectExpat (unittest.TestCase):
+
+    def tearDown (self):
+        pyxb._SetXMLStyle()
+
+    def testStyle (self):
+        xmlt = MakeDocument(3)
+        pyxb._SetXMLStyle(pyxb.XMLStyle_expat)
+        saxer = pyxb.binding.saxer.make_parser()
+        self.assertTrue(isinstance(saxer, pyxb.utils.saxutils.DirectExpatParser))
+        instance = CreateFromDocument(xmlt)
+        pyxb._SetXMLStyle(pyxb.XMLStyle_saxer)
+        self.assertEqual(CreateFromDocument(xmlt).toxml('utf-8'), instance.toxml('utf-8'))
+
+    def testLocation (self):
+        xmlt = six.u('<Listing xmlns="urn:test-saxer-stream">\n <title>guide</title>\n <Schedule station="x">\n  <program>p</program><slot>1</slot></Schedule><trailer>end</trailer></Listing>')
+        saxer = pyxb.binding.saxer.make_parser(direct_expat=True, location_base='doc.xml')
+        pyxb.utils.saxutils.ParseSource(saxer, xmlt)
+        instance = saxer.getContentHandler().rootObject()
+        self.assertEqual('x', instance.Schedule[0].station)
+        loc = instance.Schedule[0].program._location()
+        self.assertEqual('doc.xml', loc.locationBase)
+        self.assertEqual(4, loc.lineNumber)
+        self.assertEqual(2, loc.columnNumber)
+
+    def testMalformed (self):
+        import xml.sax
+        saxer = pyxb.binding.saxer.make_parser(direct_expat=True)
+        self.assertRaises(xml.sax.SAXParseException, pyxb.utils.saxutils.ParseSource, saxer, six.u('<Listing xmlns="urn:test-saxer-stream"><title>'))
+        # The parser remains usable
+        pyxb.utils.saxutils.ParseSource(saxer, MakeDocument(1))
+        self.assertEqual(1, len(saxer.getContentHandler().rootObject().Schedule))
+
+    def testNameCache (self):
+        parser = pyxb.utils.saxutils.DirectExpatParser()
+        CheckNameCaches(self, parser, lambda: [ getattr(parser, '_DirectExpatParser__names'), getattr(parser.getContentHandler(), '_BaseSAXHandler__expandedNames') ])
+
+    def testPush (self):
+        xmld = MakeDocument(4).encode('utf-8')
+        parser = pyxb.binding.saxer.BindingPushParser(stream_elements=Schedule, direct_expat=True)
+        completed = []
+        for i in six.moves.range(0, len(xmld), 5):
+            parser.feed(xmld[i:i+5])
+            completed.extend(parser.completedObjects())
+        parser.close()
+        completed.extend(parser.completedObjects())
+        self.assertEqual(['p0', 'p1', 'p2', 'p3'], [ _s.program for _s in completed ])
+
+def ElementTreeParser (target):
+    import xml.etree.ElementTree
+    return xml.etree.ElementTree.XMLParser(target=target)
+
+class TestLxmlParser (unittest.TestCase):
+
+    def tearDown (self):
+        pyxb._SetXMLStyle()
+
+    def makeParser (self, **kw):
+        # The driver accepts any parser implementing the target interface;
+        # the standard library one is used so this runs without lxml.
+        parser = pyxb.utils.saxutils.LxmlParser(parser_constructor=ElementTreeParser)
+        handler = pyxb.binding.saxer.PyXBSAXHandler(location_capture=pyxb.LocationCapture_none, **kw)
+        parser.setContentHandler(handler)
+        return parser
+
+    def testEvents (self):
+        xmlt = MakeDocument(5)
+        parser = self.makeParser()
+        pyxb.utils.saxutils.ParseSource(parser, xmlt)
+        instance = parser.getContentHandler().rootObject()
+        self.assertEqual(CreateFromDocument(xmlt).toxml('utf-8'), instance.toxml('utf-8'))
+        self.assertTrue(instance._location() is None)
+
+    def testPrefixes (self):
+        xmlt = six.u('<t:Listing xmlns:t="urn:test-saxer-stream"><t:title>guide</t:title><t:Schedule station="x"><t:program>p</t:program><t:slot>1</t:slot></t:Schedule><t:trailer>end</t:trailer></t:Listing>')
+        parser = self.makeParser()
+        pyxb.utils.saxutils.ParseSource(parser, xmlt)
+        instance = parser.getContentHandler().rootObject()
+        self.assertEqual('x', instance.Schedule[0].station)
+        self.assertEqual([1], instance.Schedule[0].slot)
+
+    def testStreaming (self):
+        parser = self.makeParser(stream_elements=[Schedule])
+        xmld = MakeDocument(4).encode('utf-8')
+        completed = []
+        for i in six.moves.range(0, len(xmld), 7):
+            parser.feed(xmld[i:i+7])
+            completed.extend(parser.getContentHandler().completedObjects())
+        parser.close()
+        self.assertEqual(['p0', 'p1', 'p2', 'p3'], [ _s.program for _s in completed ])
+
+    def testBufferBlocks (self):
+        import mmap
+        fed = []
+        def parser_constructor (target):
+            parser = ElementTreeParser(target)
+            class Recorder (object):
+                def feed (self, data):
+                    fed.append(data)
+                    parser.feed(data)
+                def close (self):
+                    return parser.close()
+            return Recorder()
+        xmld = MakeDocument(3).encode('utf-8')
+        with tempfile.TemporaryFile() as f:
+            f.write(xmld)
+            f.flush()
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for source in (bytearray(xmld), memoryview(xmld), mm):
+                    del fed[:]
+                    parser = pyxb.utils.saxutils.LxmlParser(bufsize=64, parser_constructor=parser_constructor)
+                    parser.setContentHandler(pyxb.binding.saxer.PyXBSAXHandler())
+                    pyxb.utils.saxutils.ParseSource(parser, source)
+                    self.assertEqual(3, len(parser.getContentHandler().rootObject().Schedule))
+                    self.assertTrue(all([ isinstance(_d, six.binary_type) and (64 >= len(_d)) for _d in fed ]))
+                    self.assertEqual(xmld, six.b('').join(fed))
+            finally:
+                mm.close()
+
+    def testMalformed (self):
+        import xml.sax
+        parser = self.makeParser()
+        try:
+            pyxb.utils.saxutils.ParseSource(parser, six.u('<Listing xmlns="urn:test-saxer-stream">\n<title></Listing>'))
+            self.fail('Parse succeeded')
+        except xml.sax.SAXParseException as e:
+            self.assertEqual(2, e.getLineNumber())
+        pyxb.utils.saxutils.ParseSource(parser, MakeDocument(1))
+        self.assertEqual(1, len(parser.getContentHandler().rootObject().Schedule))
+
+    def testNameCache (self):
+        parser = pyxb.utils.saxutils.LxmlParser(parser_constructor=ElementTreeParser)
+        CheckNameCaches(self, parser, lambda: [ getattr(getattr(parser, '_LxmlParser__target'), '_TargetEvents__names') ])
+
+    def testStyle (self):
+        pyxb._SetXMLStyle(pyxb.XMLStyle_lxml)
+        saxer = pyxb.binding.saxer.make_parser()
+        if pyxb.utils.saxutils.LxmlParserAvailable():
+            self.assertTrue(isinstance(saxer, pyxb.utils.saxutils.LxmlParser))
+            self.assertEqual(pyxb.LocationCapture_none, saxer.getContentHandler().locationCapture())
+        else:
+            self.assertFalse(isinstance(saxer, pyxb.utils.saxutils.LxmlParser))
+        xmlt = MakeDocument(3)
+        self.assertEqual(3, len(CreateFromDocument(xmlt).Schedule))
+
+class TestParserPool (unittest.TestCase):
+
+    def setUp (self):
+        getattr(pyxb.binding.saxer, '__ParserPool').clear()
+
+    def idleParsers (self):
+        pool = getattr(pyxb.binding.saxer, '__ParserPool')
+        return pool.get(pyxb.binding.saxer._ParserPoolKey(Namespace.fallbackNamespace()), [])
+
+    def testReuse (self):
+        CreateFromDocument(MakeDocument(1))
+        idle = self.idleParsers()
+        self.assertEqual(1, len(idle))
+        saxer = idle[-1]
+        # The handler does not retain the bindings of the last document
+        self.assertTrue(saxer.getContentHandler()._PyXBSAXHandler__rootObject is None)
+        i2 = CreateFromDocument(MakeDocument(2), location_base='two.xml')
+        self.assertEqual([saxer], self.idleParsers())
+        i3 = CreateFromDocument(MakeDocument(3), location_base='three.xml')
+        self.assertEqual(2, len(i2.Schedule))
+        self.assertEqual(3, len(i3.Schedule))
+        self.assertEqual('two.xml', i2.Schedule[0]._location().locationBase)
+        self.assertEqual('three.xml', i3.Schedule[0]._location().locationBase)
+
+    def testFailure (self):
+        CreateFromDocument(MakeDocument(1))
+        saxer = self.idleParsers()[-1]
+        self.assertRaises(IncompleteElementContentError, CreateFromDocument, six.u('<Listing xmlns="urn:test-saxer-stream"><title>guide</title></Listing>'))
+        # The parser used for the failed document is discarded
+        self.assertFalse(saxer in self.idleParsers())
+        self.assertEqual(1, len(CreateFromDocument(MakeDocument(1)).Schedule))
+
+    def testThreads (self):
+        import threading
+        results = {}
+        def work (n):
+            results[n] = [ len(CreateFromDocument(MakeDocument(n)).Schedule) for _i in six.moves.range(20) ]
+        threads = [ threading.Thread(target=work, args=(_n,)) for _n in six.moves.range(1, 5) ]
+        [ _t.start() for _t in threads ]
+        [ _t.join() for _t in threads ]
+        for n in six.moves.range(1, 5):
+            self.assertEqual([n] * 20, results[n])
+        self.assertTrue(len(self.idleParsers()) <= pyxb.binding.saxer.ParserPoolLimit)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import pyxb.binding.generate
+import pyxb.utils.domutils
+import pickle
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns:tns="urn:test-validated-children"
+           targetNamespace="urn:test-validated-children">
+  <xs:complexType name="tRecord">
+    <xs:sequence>
+      <xs:element name="name" type="xs:string"/>
+      <xs:element name="item" type="xs:int" maxOccurs="3"/>
+      <xs:any namespace="##other" processContents="lax" minOccurs="0" maxOccurs="unbounded"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="record" type="tns:tRecord"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+xmlt = six.u('<tns:record xmlns:tns="urn:test-validated-children"><name>n</name><item>1</item><item>2</item></tns:record>')
+
+class TestValidatedChildren (unittest.TestCase):
+
+    def checkCached (self, instance, expected):
+        order = instance._validatedChildren()
+        self.assertEqual(expected, len(order))
+        again = instance._validatedChildren()
+        self.assertFalse(order is again)
+        for (first, second) in zip(order, again):
+            self.assertTrue(first is second)
+        return order
+
+    def testCached (self):
+        instance = CreateFromDocument(xmlt)
+        self.checkCached(instance, 3)
+        xmld = instance.toxml('utf-8')
+        self.assertEqual(xmld, instance.toxml('utf-8'))
+
+    def testModifiedThroughInstance (self):
+        instance = CreateFromDocument(xmlt)
+        order = self.checkCached(instance, 3)
+        instance.name = 'other'
+        norder = self.checkCached(instance, 3)
+        self.assertFalse(order[0] is norder[0])
+        self.assertEqual('other', norder[0].value)
+        instance.item = None
+        self.assertRaises(IncompleteElementContentError, instance._validatedChildren)
+
+    def testModifiedPlural (self):
+        instance = CreateFromDocument(xmlt)
+        self.checkCached(instance, 3)
+        instance.item.append(3)
+        self.checkCached(instance, 4)
+        instance.item.append(4)
+        self.assertRaises(UnprocessedElementContentError, instance._validatedChildren)
+        del instance.item[0]
+        order = self.checkCached(instance, 4)
+        self.assertEqual([2, 3, 4], [ _c.value for _c in order[1:] ])
+
+    def testModifiedWildcards (self):
+        instance = CreateFromDocument(xmlt)
+        self.checkCached(instance, 3)
+        wc = pyxb.utils.domutils.StringToDOM('<other xmlns="urn:other"/>').documentElement
+        instance.wildcardElements().append(wc)
+        order = self.checkCached(instance, 4)
+        self.assertTrue(order[3].value is wc)
+
+    def testPickled (self):
+        instance = CreateFromDocument(xmlt)
+        xmld = instance.toxml('utf-8')
+        instance = pickle.loads(pickle.dumps(instance))
+        self.assertEqual(xmld, instance.toxml('utf-8'))
+        instance.item.append(3)
+        self.checkCached(instance, 4)
+
+if __name__ == '__main__':
+    unittest.main()
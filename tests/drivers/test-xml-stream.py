@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import logging
+if __name__ == '__main__':
+    logging.basicConfig()
+_log = logging.getLogger(__name__)
+import io
+import xml.sax.saxutils
+import pyxb.binding.generate
+import pyxb.utils.domutils
+from pyxb.utils import six
+
+xst = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:stream" xmlns:tns="urn:stream" elementFormDefault="qualified">
+  <xs:complexType name="tItem">
+    <xs:simpleContent>
+      <xs:extension base="xs:string">
+        <xs:attribute name="ref" type="xs:QName"/>
+        <xs:attribute name="n" type="xs:int"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:complexType name="tRoot" mixed="true">
+    <xs:sequence>
+      <xs:element name="item" type="tns:tItem" maxOccurs="unbounded"/>
+      <xs:element name="when" type="xs:dateTime" minOccurs="0"/>
+      <xs:element name="empty" type="xs:string" minOccurs="0" nillable="true"/>
+      <xs:any namespace="##other" processContents="lax" minOccurs="0" maxOccurs="unbounded"/>
+    </xs:sequence>
+    <xs:attribute name="label" type="xs:string"/>
+    <xs:anyAttribute namespace="##other" processContents="lax"/>
+  </xs:complexType>
+  <xs:element name="root" type="tns:tRoot"/>
+</xs:schema>
+'''
+
+code = pyxb.binding.generate.GeneratePython(schema_text=xst)
+rv = compile(code, 'test', 'exec')
+eval(rv)
+
+from pyxb.exceptions_ import *
+
+import unittest
+
+xmlt = six.u('''<root xmlns="urn:stream" xmlns:o="urn:other" label="a&quot;b&lt;" o:extra="1">text &amp; more<item ref="o:thing" n="3">x&gt;y</item><item/><when>2020-01-02T03:04:05Z</when><empty xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:nil="true"/><o:blob q="1"><o:inner>t</o:inner></o:blob></root>''')
+
+class TestXMLStream (unittest.TestCase):
+
+    def stream (self, instance, encoding='utf-8', **kw):
+        if encoding is None:
+            out = io.StringIO()
+        else:
+            out = io.BytesIO()
+        instance.toxml_stream(out, encoding, **kw)
+        return out.getvalue()
+
+    def testSameAsToxml (self):
+        instance = CreateFromDocument(xmlt)
+        self.assertEqual(instance.toxml('utf-8'), self.stream(instance))
+        self.assertEqual(instance.toxml(None), self.stream(instance, None))
+        self.assertEqual(instance.toxml('utf-8', root_only=True), self.stream(instance, root_only=True))
+
+    def testDefaultNamespace (self):
+        instance = CreateFromDocument(xmlt)
+        bds = pyxb.utils.domutils.BindingDOMSupport(default_namespace=Namespace)
+        text = self.stream(instance, bds=bds)
+        self.assertEqual(instance.toxml('utf-8', bds=pyxb.utils.domutils.BindingDOMSupport(default_namespace=Namespace)), text)
+        self.assertTrue(text.startswith(six.b('<?xml version="1.0" encoding="utf-8"?><root ')))
+
+    def testElementName (self):
+        instance = tItem('v', n=2)
+        self.assertRaises(pyxb.UnboundElementError, self.stream, instance)
+        self.assertEqual(instance.toxml('utf-8', element_name='x'), self.stream(instance, element_name='x'))
+
+    def testRoundTrip (self):
+        instance = root()
+        instance.item.append(tItem(six.u('é'), n=1))
+        text = self.stream(instance, 'ascii')
+        self.assertTrue(six.b('&#233;') in text)
+        self.assertEqual(six.u('é'), CreateFromDocument(text).item[0].value())
+
+    def testIterxml (self):
+        instance = CreateFromDocument(xmlt)
+        chunks = list(instance.iterxml(chunk_size=64))
+        self.assertTrue(2 < len(chunks))
+        self.assertTrue(all([ isinstance(_c, six.binary_type) for _c in chunks ]))
+        self.assertTrue(all([ 64 <= len(_c) for _c in chunks[:-1] ]))
+        self.assertEqual(instance.toxml('utf-8'), six.b('').join(chunks))
+        chunks = list(instance.iterxml(None, root_only=True))
+        self.assertEqual(1, len(chunks))
+        self.assertEqual(instance.toxml(None, root_only=True), chunks[0])
+
+    def testIterxmlIncremental (self):
+        instance = root()
+        for i in six.moves.range(1000):
+            instance.item.append(tItem('v%d' % (i,), n=i))
+        chunks = instance.iterxml(chunk_size=256)
+        first = next(chunks)
+        self.assertTrue(first.startswith(six.b('<?xml')))
+        self.assertTrue(len(first) < 1024)
+        self.assertEqual(instance.toxml('utf-8'), first + six.b('').join(chunks))
+
+    def testWriteTo (self):
+        instance = CreateFromDocument(xmlt)
+        out = io.StringIO()
+        instance.writeTo(xml.sax.saxutils.XMLGenerator(out, 'utf-8'))
+        copy = CreateFromDocument(out.getvalue())
+        self.assertEqual(instance.toxml('utf-8'), copy.toxml('utf-8'))
+
+if __name__ == '__main__':
+    unittest.main()
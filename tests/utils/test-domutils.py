@@ -8,6 +8,7 @@ from pyxb.utils.domutils import *
 from xml.dom import Node
 import xml.dom
 import pyxb.namespace
+from pyxb.utils import six
 
 def NonTextSibling (n):
     while n.TEXT_NODE == n.nodeType:
@@ -120,5 +121,67 @@ class TestNamespaceURIs (unittest.TestCase):
         self.assertEqual(xml.dom.XMLNS_NAMESPACE, pyxb.namespace.XMLNamespaces.uri())
         self.assertEqual(xml.dom.XHTML_NAMESPACE, pyxb.namespace.XHTML.uri())
 
+class TestPrefixPlan (unittest.TestCase):
+
+    def setUp (self):
+        self.planned = pyxb.namespace.NamespaceForURI('urn:test:planned', create_if_missing=True)
+        self.dynamic = pyxb.namespace.NamespaceForURI('urn:test:dynamic', create_if_missing=True)
+        self.other = pyxb.namespace.NamespaceForURI('urn:test:other', create_if_missing=True)
+
+    def newSupport (self):
+        return BindingDOMSupport(namespace_prefix_map={ 'p': self.planned })
+
+    def testNames (self):
+        bds = self.newSupport()
+        en = self.planned.createExpandedName('e')
+        self.assertEqual('p:e', bds.qnameAsText(en))
+        self.assertTrue(bds.qnameAsText(en) is bds.qnameAsText(en))
+        self.assertEqual('ns1:e', bds.qnameAsText(self.dynamic.createExpandedName('e')))
+        self.assertEqual('e', bds.qnameAsText(pyxb.namespace.ExpandedName(None, 'e')))
+        self.assertEqual(set([ (self.planned, 'p'), (self.dynamic, 'ns1') ]), set(bds.namespaceDeclarations()))
+
+    def testShared (self):
+        en = self.planned.createExpandedName('shared')
+        first = self.newSupport().qnameAsText(en, component_name=True)
+        bds = self.newSupport()
+        # The name is reused, and the declaration it requires is recorded
+        self.assertTrue(first is bds.qnameAsText(en, component_name=True))
+        self.assertEqual([ (self.planned, 'p') ], bds.namespaceDeclarations())
+
+    def planSize (self):
+        return sum([ len(_p[0]) + len(_p[1]) for _p in six.itervalues(getattr(BindingDOMSupport, '_BindingDOMSupport__PrefixPlans')) ])
+
+    def testValuesNotPlanned (self):
+        # QName values differ among documents, so are not retained
+        bds = self.newSupport()
+        bds.qnameAsText(self.planned.createExpandedName('component'), component_name=True)
+        size = self.planSize()
+        for i in six.moves.range(100):
+            bds = self.newSupport()
+            en = self.planned.createExpandedName('v%d' % (i,))
+            self.assertEqual('p:v%d' % (i,), bds.valueAsText(en))
+            self.assertEqual('p:v%d' % (i,), bds.qnameAsText(en))
+            self.assertEqual([ (self.planned, 'p') ], bds.namespaceDeclarations())
+        self.assertEqual(size, self.planSize())
+
+    def testDocumentOrder (self):
+        # Generated prefixes depend on the document, so are not shared
+        bds = self.newSupport()
+        self.assertEqual('ns1:e', bds.qnameAsText(self.dynamic.createExpandedName('e')))
+        bds = self.newSupport()
+        self.assertEqual('ns1:e', bds.qnameAsText(self.other.createExpandedName('e')))
+        self.assertEqual('ns2:e', bds.qnameAsText(self.dynamic.createExpandedName('e')))
+        bds.reset()
+        self.assertEqual('ns1:e', bds.qnameAsText(self.dynamic.createExpandedName('e')))
+
+    def testModified (self):
+        en = self.planned.createExpandedName('m')
+        self.newSupport().qnameAsText(en)
+        bds = self.newSupport()
+        bds.setDefaultNamespace(self.planned)
+        self.assertEqual('m', bds.qnameAsText(en))
+        self.assertEqual('p:m', bds.qnameAsText(en, enable_default_namespace=False))
+        self.assertEqual('p:m', self.newSupport().qnameAsText(en))
+
 if '__main__' == __name__:
     unittest.main()
@@ -427,5 +427,129 @@ class TestFAC (unittest.TestCase):
         cfg = cfg.step('s')
         self.assertEqual(1, len(cfg.candidateTransitions('s')))
 
+    def testCompiledTransitions (self):
+        au = self.ex.buildAutomaton()
+        table = au.compiledTransitions()
+        self.assertTrue(table is au.compiledTransitions())
+        self.assertEqual(frozenset(au.states).union([None]), frozenset(table.keys()))
+        self.assertEqual(frozenset(['a', 'b']), frozenset(table[None].keys()))
+        self.assertEqual(au.initialTransitions, list(table[None]['a']) + list(table[None]['b']))
+        for st in au.states:
+            by_key = table[st]
+            self.assertEqual(len(st.transitionSet), sum(map(len, six.itervalues(by_key))))
+            for (key, xits) in six.iteritems(by_key):
+                for xit in xits:
+                    self.assertEqual(key, xit.destination.symbol)
+        # Neither automata with sub-automata nor the sub-automata themselves
+        # can be compiled
+        au = Sequence(Symbol('c'), All(Symbol('a'), Symbol('b'))).buildAutomaton()
+        self.assertTrue(au.compiledTransitions() is None)
+        for st in au.states:
+            for sa in (st.subAutomata or ()):
+                self.assertTrue(sa.compiledTransitions() is None)
+
+    def testCompiledCustomMatch (self):
+        class MatchState (State):
+            def match (self, symbol):
+                return self.symbol == symbol.lower()
+        au = Sequence(Symbol('a'), Symbol('b')).buildAutomaton(state_ctor=MatchState)
+        table = au.compiledTransitions()
+        self.assertTrue(table[None] is None)
+
+    def testCloneSharing (self):
+        au = self.ex.buildAutomaton()
+        cfg = Configuration(au)
+        for c in 'aa':
+            cfg = cfg.step(c)
+        ccfg = cfg.clone()
+        self.assertTrue(ccfg._get_counterValues() is cfg._get_counterValues())
+        counters = list(cfg._get_counterValues())
+        ccfg = ccfg.step('b')
+        self.assertFalse(ccfg._get_counterValues() is cfg._get_counterValues())
+        self.assertEqual(counters, cfg._get_counterValues())
+        self.assertNotEqual(counters, ccfg._get_counterValues())
+        # The original is unaffected by the clone's transition
+        cfg = cfg.step('b')
+        self.assertEqual(ccfg._get_counterValues(), cfg._get_counterValues())
+
+    def testCounterIndex (self):
+        # Two constraints with identical bounds and no metadata
+        ex = Sequence(NumericalConstraint(Symbol('a'), 1, 2), NumericalConstraint(Symbol('b'), 1, 2))
+        au = ex.buildAutomaton()
+        self.assertEqual(2, au.counterCount())
+        indices = set()
+        for st in au.states:
+            for xit in st.transitionSet:
+                for ui in xit.updateInstructions:
+                    indices.add(ui.counterCondition.index)
+        self.assertEqual(set([0, 1]), indices)
+        cfg = Configuration(au)
+        self.assertEqual([1, 1], cfg._get_counterValues())
+        for c in 'aa':
+            cfg = cfg.step(c)
+        self.assertEqual([1, 2], sorted(cfg._get_counterValues()))
+        self.assertRaises(UnrecognizedSymbolError, cfg.step, 'a')
+        for c in 'bb':
+            cfg = cfg.step(c)
+        self.assertEqual([1, 2], sorted(cfg._get_counterValues()))
+        self.assertTrue(cfg.isAccepting())
+        self.assertRaises(UnrecognizedSymbolError, cfg.step, 'b')
+
+    def testCandidateCache (self):
+        au = NumericalConstraint(Symbol('a'), 1, 3).buildAutomaton()
+        (st,) = au.states
+        cfg = Configuration(au)
+        cfg = cfg.step('a')
+        first = cfg.candidateTransitions('a')
+        self.assertEqual(1, len(first))
+        ccfg = Configuration(au).step('a')
+        self.assertTrue(first[0] is ccfg.candidateTransitions('a')[0])
+        cfg = cfg.step('a')
+        self.assertTrue(first[0] is cfg.candidateTransitions('a')[0])
+        cfg = cfg.step('a')
+        # The counter has reached its maximum
+        self.assertEqual([], cfg.candidateTransitions('a'))
+        self.assertEqual([], cfg.candidateTransitions())
+        self.assertEqual(1, len(ccfg.candidateTransitions()))
+
+    def testEnterTransitionCache (self):
+        ex = Sequence(Symbol('x'), All(Symbol('a'), Symbol('b')))
+        au = ex.buildAutomaton()
+        cfg = Configuration(au).step('x')
+        ccfg = Configuration(au).step('x')
+        xits = cfg.candidateTransitions()
+        self.assertEqual(2, len(xits))
+        for (xit, cxit) in zip(xits, ccfg.candidateTransitions()):
+            self.assertTrue(xit is cxit)
+        (xit,) = cfg.candidateTransitions('a')
+        # A chain into the sub-automaton for a
+        enter = xit.nextTransition
+        self.assertTrue(enter.layerLink is enter.destination.automaton)
+        self.assertTrue(enter is enter.destination.automaton.initialTransitions[0].makeEnterAutomatonTransition())
+        for c in 'ba':
+            cfg = cfg.step(c)
+        self.assertTrue(cfg.isAccepting())
+        for c in 'ab':
+            ccfg = ccfg.step(c)
+        self.assertTrue(ccfg.isAccepting())
+
+    def testCloneSubAutomata (self):
+        ex = Sequence(Symbol('x'), All(Symbol('a'), Symbol('b'), Symbol('c')))
+        cfg = Configuration(ex.buildAutomaton())
+        cfg = cfg.step('x')
+        cfg = cfg.step('a')
+        clone_map = {}
+        ccfg = cfg.clone(clone_map)
+        self.assertFalse(ccfg is cfg)
+        self.assertTrue(ccfg.superConfiguration is clone_map[cfg.superConfiguration])
+        for c in 'bc':
+            ccfg = ccfg.step(c)
+        self.assertTrue(ccfg.isAccepting())
+        # The original still requires both remaining terms
+        self.assertEqual(2, len(cfg.superConfiguration.subAutomata))
+        for c in 'cb':
+            cfg = cfg.step(c)
+        self.assertTrue(cfg.isAccepting())
+
 if __name__ == '__main__':
     unittest.main()